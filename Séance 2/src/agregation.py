@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from chargement import COLONNES_DECOMPTE
+
+# -----------------------------
+# Agrégation par département en une seule passe
+# -----------------------------
+
+# Parts calculées sur chaque ligne agrégée : (nom, numérateur, dénominateur)
+PARTS = [
+    ("Taux de participation", "Votants", "Inscrits"),
+    ("Part des abstentions", "Abstentions", "Inscrits"),
+    ("Part des blancs", "Blancs", "Votants"),
+    ("Part des nuls", "Nuls", "Votants"),
+    ("Part des exprimés", "Exprimés", "Votants"),
+]
+
+def agreger_departements(territoires, candidats, voix, cle="Libellé du département"):
+    """
+    Calcule en une passe les totaux par département (décompte et voix des
+    candidats, à partir de la table longue), puis les parts correspondantes.
+    Renvoie la table des départements (dans l'ordre d'apparition) et la ligne
+    des totaux nationaux, avec les mêmes colonnes.
+    """
+    departements = territoires[cle].cat.categories
+    codes = territoires[cle].cat.codes.to_numpy()
+    decompte = territoires[COLONNES_DECOMPTE].groupby(codes, sort=True).sum()
+    decompte = decompte.reindex(range(len(departements)), fill_value=0)
+
+    # Voix par (département, candidat) : un seul bincount sur la table longue
+    nb_candidats = len(candidats)
+    indices = voix[cle].cat.codes.to_numpy().astype(np.int64) * nb_candidats + voix["candidat"].to_numpy()
+    sommes = np.bincount(indices, weights=voix["Voix"].to_numpy(), minlength=len(departements) * nb_candidats)
+    libelles = candidats["Libellé"].tolist()
+    voix_candidats = pd.DataFrame(sommes.reshape(len(departements), nb_candidats), columns=libelles)
+
+    table = pd.concat([decompte, voix_candidats], axis=1)
+    table.index = pd.Index(departements, name=cle)
+    return completer_table(table, libelles)
+
+def completer_table(table, libelles):
+    """
+    Ajoute les parts à une table de totaux par département (décomptes puis
+    voix des candidats) et calcule la ligne des totaux nationaux.
+    """
+    france = table.sum()
+
+    _ajouter_parts(table, libelles)
+    france = _ajouter_parts(france.to_frame().T, libelles).iloc[0]
+    france.name = "France entière"
+    return table, france
+
+def _ajouter_parts(table, colonnes_candidats):
+    for nom, numerateur, denominateur in PARTS:
+        table[nom] = _diviser(table[numerateur].to_numpy(float), table[denominateur].to_numpy(float))
+
+    voix = table[list(colonnes_candidats)].to_numpy(float)
+    total_voix = voix.sum(axis=1, keepdims=True)
+    parts = _diviser(voix, total_voix)
+    for j, col in enumerate(colonnes_candidats):
+        table[f"Part {col}"] = parts[:, j]
+    table["Total des voix"] = total_voix[:, 0]
+    return table
+
+def _diviser(numerateur, denominateur):
+    # Division sans avertissement : 0 / 0 donne 0
+    resultat = np.zeros(np.broadcast(numerateur, denominateur).shape)
+    np.divide(numerateur, denominateur, out=resultat, where=denominateur != 0)
+    return resultat
@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # sans pyarrow, les fichiers sont simplement relus à chaque exécution
+    pa = None
+
+# -----------------------------
+# Cache colonnaire des fichiers sources
+# -----------------------------
+# Le tableau typé et nettoyé est enregistré au format Arrow (non compressé)
+# dans `.cache/` à côté du fichier source. Les exécutions suivantes le relisent
+# par projection mémoire, sans analyse du texte ni inférence des types.
+# La clé est la date de modification du fichier source, puis son empreinte
+# SHA-256 si la date a changé (copie, changement de branche…).
+
+DOSSIER_CACHE = ".cache"
+
+def empreinte_fichier(chemin, taille_bloc=1 << 20):
+    h = hashlib.sha256()
+    with open(chemin, "rb") as fichier:
+        for bloc in iter(lambda: fichier.read(taille_bloc), b""):
+            h.update(bloc)
+    return h.hexdigest()
+
+def charger_en_cache(chemin, lecteur, nom="tableau", version=1):
+    """
+    Renvoie `lecteur(chemin)` en passant par le cache colonnaire.
+    `lecteur` renvoie un DataFrame ou un tuple de DataFrames ; `version` est à
+    incrémenter quand le lecteur change, pour invalider les anciens caches.
+    """
+    if pa is None:
+        return lecteur(chemin)
+
+    base = os.path.join(os.path.dirname(chemin), DOSSIER_CACHE, f"{os.path.basename(chemin)}.{nom}")
+    etat = os.stat(chemin)
+    meta = _lire_meta(base + ".json")
+
+    if meta is not None and meta["version"] == version and meta["taille"] == etat.st_size:
+        meme_date = meta["mtime"] == etat.st_mtime_ns
+        if meme_date or meta["sha256"] == empreinte_fichier(chemin):
+            try:
+                resultat = _lire_parties(base, meta["parties"])
+            except (OSError, pa.ArrowInvalid):
+                pass  # cache incomplet ou abîmé : le fichier source est relu
+            else:
+                if not meme_date:
+                    meta["mtime"] = etat.st_mtime_ns
+                    _ecrire_meta(base + ".json", meta)
+                return resultat
+
+    resultat = lecteur(chemin)
+    meta = {
+        "version": version,
+        "taille": etat.st_size,
+        "mtime": etat.st_mtime_ns,
+        "sha256": empreinte_fichier(chemin),
+        "parties": len(resultat) if isinstance(resultat, tuple) else None,
+    }
+    try:
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        parties = resultat if isinstance(resultat, tuple) else (resultat,)
+        for i, partie in enumerate(parties):
+            _ecrire_arrow(f"{base}.{i}.arrow", partie)
+        _ecrire_meta(base + ".json", meta)
+    except (OSError, pa.ArrowException) as erreur:
+        # Disque plein, droits… ou tableau non convertible en Arrow (colonne
+        # objet de types mêlés, noms de colonnes non textuels) : le résultat,
+        # déjà lu, est renvoyé sans cache
+        print(f"Cache colonnaire non écrit pour {chemin} : {erreur}")
+    return resultat
+
+def _lire_parties(base, parties):
+    if parties is None:
+        return _lire_arrow(f"{base}.0.arrow")
+    return tuple(_lire_arrow(f"{base}.{i}.arrow") for i in range(parties))
+
+def _lire_arrow(chemin):
+    # Projection mémoire : les colonnes numériques sans valeur manquante
+    # sont exposées à pandas sans copie (split_blocks)
+    source = pa.memory_map(chemin, "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+def _ecrire_arrow(chemin, tableau):
+    # Arrow convertirait en texte les noms non textuels : le tableau relu différerait
+    if not all(isinstance(nom, str) for nom in tableau.columns):
+        raise pa.ArrowTypeError("noms de colonnes non textuels")
+    table = pa.Table.from_pandas(tableau)
+    temporaire = chemin + ".tmp"
+    with pa.OSFile(temporaire, "wb") as sortie:
+        with pa.ipc.new_file(sortie, table.schema) as ecrivain:
+            ecrivain.write_table(table)
+    os.replace(temporaire, chemin)
+
+def _lire_meta(chemin):
+    if not os.path.exists(chemin):
+        return None
+    with open(chemin, "r", encoding="utf-8") as fichier:
+        return json.load(fichier)
+
+def _ecrire_meta(chemin, meta):
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(meta, fichier)
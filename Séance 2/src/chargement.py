@@ -0,0 +1,313 @@
+import csv
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Lecture typée des résultats électoraux
+# -----------------------------
+# Le fichier répète le bloc Sexe, Nom, Prénom, Voix pour chaque candidat.
+# L'en-tête est analysé une seule fois, puis les blocs sont empilés en une
+# table longue (territoire, candidat, voix) avec une table des candidats à part.
+
+BLOC_CANDIDAT = ["Sexe", "Nom", "Prénom", "Voix"]
+COLONNES_DECOMPTE = ["Inscrits", "Abstentions", "Votants", "Blancs", "Nuls", "Exprimés"]
+
+def lire_entete(chemin):
+    """
+    Renvoie les colonnes fixes (avant le premier bloc candidat) et le nombre
+    de blocs candidats de l'en-tête.
+    """
+    with open(chemin, "r", encoding="utf-8", newline="") as fichier:
+        entete = next(csv.reader(fichier))
+
+    debut = entete.index(BLOC_CANDIDAT[0])
+    blocs = entete[debut:]
+    taille = len(BLOC_CANDIDAT)
+    if len(blocs) % taille or any(blocs[i:i + taille] != BLOC_CANDIDAT for i in range(0, len(blocs), taille)):
+        raise ValueError(f"En-tête inattendu : blocs {BLOC_CANDIDAT} attendus après {entete[:debut]}")
+    return entete[:debut], len(blocs) // taille
+
+def noms_colonnes(fixes, nb_blocs):
+    """
+    Noms uniques des colonnes : « Voix 0 », « Nom 0 », … pour chaque bloc.
+    """
+    return fixes + [f"{champ} {k}" for k in range(nb_blocs) for champ in BLOC_CANDIDAT]
+
+def types_colonnes(fixes, nb_blocs):
+    types = {col: ("float64" if col in COLONNES_DECOMPTE else "str") for col in fixes}
+    for k in range(nb_blocs):
+        types.update({f"Sexe {k}": "str", f"Nom {k}": "str", f"Prénom {k}": "str", f"Voix {k}": "float64"})
+    return types
+
+def charger_resultats(chemin, cle="Libellé du département"):
+    """
+    Lit le fichier des résultats et renvoie trois tables :
+    - territoires : une ligne par ligne du fichier, colonnes fixes typées
+      (identifiants catégoriels, décomptes en int32) ;
+    - candidats : table des candidats indexée par identifiant ;
+    - voix : table longue (ligne, territoire, candidat, Voix).
+    """
+    fixes, nb_blocs = lire_entete(chemin)
+    brut = pd.read_csv(
+        chemin, header=0, names=noms_colonnes(fixes, nb_blocs),
+        dtype=types_colonnes(fixes, nb_blocs), encoding="utf-8"
+    )
+    return depuis_tableau(brut, fixes, nb_blocs, cle)
+
+def depuis_tableau(brut, fixes, nb_blocs, cle="Libellé du département"):
+    territoires = typer_territoires(brut[fixes])
+    candidats, identifiants = dimension_candidats(brut, nb_blocs)
+
+    nb_lignes = len(brut)
+    lignes = np.tile(np.arange(nb_lignes, dtype=np.int32), nb_blocs)
+    voix = np.concatenate([brut[f"Voix {k}"].to_numpy(dtype=float) for k in range(nb_blocs)])
+
+    # Blocs vides (moins de candidats sur certaines lignes)
+    presents = identifiants >= 0
+    lignes, identifiants, voix = lignes[presents], identifiants[presents], voix[presents]
+
+    codes_territoires = territoires[cle].cat.codes.to_numpy()[lignes]
+    table_voix = pd.DataFrame({
+        "ligne": lignes,
+        cle: pd.Categorical.from_codes(codes_territoires, territoires[cle].cat.categories),
+        "candidat": identifiants.astype(np.int16),
+        "Voix": _entiers_compacts(voix),
+    })
+    return territoires, candidats, table_voix
+
+def typer_territoires(fixes):
+    territoires = {}
+    for col in fixes.columns:
+        if col in COLONNES_DECOMPTE:
+            territoires[col] = _entiers_compacts(fixes[col].to_numpy(dtype=float))
+        else:
+            # Catégories dans l'ordre d'apparition des modalités
+            codes, modalites = pd.factorize(fixes[col])
+            territoires[col] = pd.Categorical.from_codes(codes, modalites)
+    return pd.DataFrame(territoires)
+
+def dimension_candidats(brut, nb_blocs):
+    """
+    Identifie les candidats (Sexe, Nom, Prénom) de tous les blocs.
+    Renvoie la table des candidats et l'identifiant de chaque cellule de voix,
+    blocs empilés les uns après les autres (-1 pour un bloc vide).
+    """
+    champs = {
+        champ: np.concatenate([brut[f"{champ} {k}"].to_numpy(dtype=object) for k in range(nb_blocs)])
+        for champ in BLOC_CANDIDAT[:3]
+    }
+    cles = pd.Series(champs["Sexe"]) + "\x1f" + pd.Series(champs["Nom"]) + "\x1f" + pd.Series(champs["Prénom"])
+    identifiants, _ = pd.factorize(cles)
+
+    _, premieres = np.unique(identifiants[identifiants >= 0], return_index=True)
+    premieres = np.flatnonzero(identifiants >= 0)[premieres]
+    candidats = pd.DataFrame({
+        "Sexe": pd.Categorical(champs["Sexe"][premieres]),
+        "Nom": champs["Nom"][premieres],
+        "Prénom": champs["Prénom"][premieres],
+    })
+    candidats["Libellé"] = candidats["Prénom"] + " " + candidats["Nom"]
+    candidats.index.name = "candidat"
+    return candidats, identifiants
+
+def tableau_voix(territoires, candidats, voix):
+    """
+    Remet la table longue en tableau large : une ligne par territoire,
+    une colonne par candidat (libellé « Prénom NOM »).
+    """
+    tableau = np.zeros((len(territoires), len(candidats)), dtype=voix["Voix"].dtype)
+    tableau[voix["ligne"].to_numpy(), voix["candidat"].to_numpy()] = voix["Voix"].to_numpy()
+    return pd.DataFrame(tableau, index=territoires.index, columns=candidats["Libellé"].tolist())
+
+def _entiers_compacts(valeurs):
+    # int32 si toutes les valeurs sont entières et présentes, sinon float64
+    if np.isfinite(valeurs).all() and (valeurs == np.round(valeurs)).all() \
+            and np.abs(valeurs).max(initial=0) < 2**31:
+        return valeurs.astype(np.int32)
+    return valeurs
+
+# -----------------------------
+# Lecture par blocs et accumulateurs fusionnables
+# -----------------------------
+# Pour les fichiers communaux ou par bureau de vote, le fichier est lu par
+# blocs de taille bornée. Chaque bloc est replié dans un accumulateur ; la
+# mémoire utilisée ne dépend que du nombre de départements et de candidats.
+
+def charger_par_blocs(chemin, taille_bloc=100000, cle="Libellé du département"):
+    """
+    Lit le fichier des résultats par blocs de `taille_bloc` lignes et renvoie,
+    pour chaque bloc, les trois tables de `charger_resultats`.
+    """
+    fixes, nb_blocs = lire_entete(chemin)
+    lecteur = pd.read_csv(
+        chemin, header=0, names=noms_colonnes(fixes, nb_blocs),
+        dtype=types_colonnes(fixes, nb_blocs), encoding="utf-8", chunksize=taille_bloc
+    )
+    with lecteur:
+        for brut in lecteur:
+            yield depuis_tableau(brut.reset_index(drop=True), fixes, nb_blocs, cle)
+
+def accumuler_resultats(chemin, taille_bloc=100000, cle="Libellé du département"):
+    """
+    Replie tout le fichier, bloc par bloc, dans un `AccumulateurResultats`.
+    """
+    accumulateur = AccumulateurResultats(cle)
+    for territoires, candidats, voix in charger_par_blocs(chemin, taille_bloc, cle):
+        accumulateur.ajouter(territoires, candidats, voix)
+    return accumulateur
+
+def histogramme_par_blocs(chemin, colonne, bornes, taille_bloc=100000):
+    """
+    Effectifs d'une colonne dans les classes définies par `bornes`, lus par blocs.
+    """
+    effectifs = np.zeros(len(bornes) - 1)
+    lecteur = pd.read_csv(
+        chemin, usecols=[colonne], dtype={colonne: "float64"}, encoding="utf-8", chunksize=taille_bloc
+    )
+    with lecteur:
+        for bloc in lecteur:
+            effectifs += np.histogram(bloc[colonne].dropna(), bins=bornes)[0]
+    return effectifs
+
+
+class AccumulateurResultats:
+    """
+    Totaux par département et moments par colonne (décomptes puis voix de
+    chaque candidat), calculés bloc par bloc.
+    Deux accumulateurs se fusionnent avec `fusionner` (méthode de Chan pour
+    la moyenne et la variance), par exemple entre processus.
+    """
+
+    def __init__(self, cle="Libellé du département"):
+        self.cle = cle
+        self.effectif = 0
+        self.departements = {}   # libellé -> indice
+        self.candidats = {}      # (Sexe, Nom, Prénom) -> indice
+        self.totaux = np.zeros((0, len(COLONNES_DECOMPTE)))
+        self.voix = np.zeros((0, 0))
+        # Sommes et moments par colonne : décomptes puis candidats
+        self.sommes = np.zeros(len(COLONNES_DECOMPTE))
+        self.moyennes = np.zeros(len(COLONNES_DECOMPTE))
+        self.m2 = np.zeros(len(COLONNES_DECOMPTE))
+        self.minimums = np.full(len(COLONNES_DECOMPTE), np.inf)
+        self.maximums = np.full(len(COLONNES_DECOMPTE), -np.inf)
+
+    def ajouter(self, territoires, candidats, voix):
+        """
+        Replie un bloc (tables de `charger_resultats`) dans l'accumulateur.
+        """
+        categories = territoires[self.cle].cat.categories
+        vers_departement = self._indexer(self.departements, list(categories))
+        cles_candidats = list(zip(candidats["Sexe"].astype(str), candidats["Nom"], candidats["Prénom"]))
+        vers_candidat = self._indexer(self.candidats, cles_candidats)
+        self._agrandir()
+
+        nb_departements, nb_candidats = self.voix.shape
+        codes = vers_departement[territoires[self.cle].cat.codes.to_numpy()]
+        decompte = np.nan_to_num(territoires[COLONNES_DECOMPTE].to_numpy(dtype=float))
+        for j in range(decompte.shape[1]):
+            self.totaux[:, j] += np.bincount(codes, weights=decompte[:, j], minlength=nb_departements)
+
+        lignes = voix["ligne"].to_numpy()
+        colonnes = vers_candidat[voix["candidat"].to_numpy()]
+        valeurs_voix = np.nan_to_num(voix["Voix"].to_numpy(dtype=float))
+        indices = codes[lignes].astype(np.int64) * nb_candidats + colonnes
+        self.voix += np.bincount(
+            indices, weights=valeurs_voix, minlength=nb_departements * nb_candidats
+        ).reshape(nb_departements, nb_candidats)
+
+        # Moments du bloc sur le tableau large (une colonne par candidat connu)
+        large = np.zeros((len(territoires), nb_candidats))
+        large[lignes, colonnes] = valeurs_voix
+        bloc = np.hstack([decompte, large])
+        if len(bloc):
+            moyennes = bloc.mean(axis=0)
+            self._fusionner_moments(
+                len(bloc), bloc.sum(axis=0), moyennes, ((bloc - moyennes) ** 2).sum(axis=0),
+                bloc.min(axis=0), bloc.max(axis=0)
+            )
+
+    def fusionner(self, autre):
+        """
+        Ajoute les totaux et les moments d'un autre accumulateur.
+        """
+        vers_departement = self._indexer(self.departements, list(autre.departements))
+        vers_candidat = self._indexer(self.candidats, list(autre.candidats))
+        self._agrandir()
+
+        self.totaux[vers_departement] += autre.totaux
+        self.voix[np.ix_(vers_departement, vers_candidat)] += autre.voix
+
+        # Colonnes de l'autre accumulateur replacées dans l'ordre de celui-ci
+        nb_decompte = len(COLONNES_DECOMPTE)
+        ordre = np.concatenate([np.arange(nb_decompte), nb_decompte + vers_candidat])
+        sommes, moyennes, m2 = (np.zeros(len(self.moyennes)) for _ in range(3))
+        minimums, maximums = np.zeros(len(self.moyennes)), np.zeros(len(self.moyennes))
+        sommes[ordre], moyennes[ordre], m2[ordre] = autre.sommes, autre.moyennes, autre.m2
+        minimums[ordre], maximums[ordre] = autre.minimums, autre.maximums
+        if autre.effectif:
+            self._fusionner_moments(autre.effectif, sommes, moyennes, m2, minimums, maximums)
+
+    def libelles_candidats(self):
+        return [f"{prenom} {nom}" for _, nom, prenom in self.candidats]
+
+    def table_departements(self):
+        """
+        Totaux par département, dans l'ordre de première apparition.
+        """
+        table = pd.DataFrame(
+            np.hstack([self.totaux, self.voix]),
+            index=pd.Index(list(self.departements), name=self.cle),
+            columns=COLONNES_DECOMPTE + self.libelles_candidats(),
+        )
+        return table
+
+    def statistiques(self):
+        """
+        Effectif, somme, moyenne, écart-type, minimum, maximum et étendue de
+        chaque colonne quantitative.
+        """
+        n = self.effectif
+        ecarts_types = np.sqrt(self.m2 / (n - 1)) if n > 1 else np.full(len(self.m2), np.nan)
+        return pd.DataFrame({
+            "Effectif": n,
+            "Somme": self.sommes,
+            "Moyenne": self.moyennes,
+            "Écart-type": ecarts_types,
+            "Minimum": self.minimums,
+            "Maximum": self.maximums,
+            "Étendue": self.maximums - self.minimums,
+        }, index=COLONNES_DECOMPTE + self.libelles_candidats())
+
+    def _indexer(self, index, cles):
+        # Indices globaux des clés, en ajoutant les nouvelles à la fin
+        for cle in cles:
+            if cle not in index:
+                index[cle] = len(index)
+        return np.array([index[cle] for cle in cles], dtype=np.int64)
+
+    def _agrandir(self):
+        nb_departements, nb_candidats = len(self.departements), len(self.candidats)
+        ajout_departements = nb_departements - self.totaux.shape[0]
+        ajout_candidats = nb_candidats - self.voix.shape[1]
+        if ajout_departements or ajout_candidats:
+            self.totaux = np.pad(self.totaux, ((0, ajout_departements), (0, 0)))
+            self.voix = np.pad(self.voix, ((0, ajout_departements), (0, ajout_candidats)))
+        if ajout_candidats:
+            # Un nouveau candidat a implicitement 0 voix sur les lignes déjà vues
+            deja_vues = 0.0 if self.effectif else np.inf
+            self.sommes = np.pad(self.sommes, (0, ajout_candidats))
+            self.moyennes = np.pad(self.moyennes, (0, ajout_candidats))
+            self.m2 = np.pad(self.m2, (0, ajout_candidats))
+            self.minimums = np.pad(self.minimums, (0, ajout_candidats), constant_values=deja_vues)
+            self.maximums = np.pad(self.maximums, (0, ajout_candidats), constant_values=-deja_vues)
+
+    def _fusionner_moments(self, effectif, sommes, moyennes, m2, minimums, maximums):
+        total = self.effectif + effectif
+        self.sommes = self.sommes + sommes
+        delta = moyennes - self.moyennes
+        self.moyennes = self.moyennes + delta * effectif / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.effectif * effectif / total
+        self.minimums = np.minimum(self.minimums, minimums)
+        self.maximums = np.maximum(self.maximums, maximums)
+        self.effectif = total
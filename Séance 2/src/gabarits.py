@@ -0,0 +1,154 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # même moteur de rendu en série et dans les processus : images identiques
+import matplotlib.pyplot as plt
+
+# -----------------------------
+# Gabarits de graphiques réutilisables
+# -----------------------------
+# Chaque gabarit construit sa figure et ses axes une seule fois. Pour chaque
+# département, seules les données des artistes et le titre changent ; la mise
+# en page n'est recalculée que lorsque les textes qui la déterminent l'exigent.
+
+def _marges(figure):
+    parametres = figure.subplotpars
+    return dict(left=parametres.left, right=parametres.right, bottom=parametres.bottom, top=parametres.top)
+
+class GabaritBarres:
+    """
+    Diagramme en barres dont seules les hauteurs et le titre changent.
+    Les marges dépendent des graduations de l'axe des ordonnées et du titre :
+    la mise en page n'est calculée qu'une fois par combinaison du plus long
+    libellé, du facteur d'échelle (« 1e6 ») et de la hauteur du titre.
+    """
+
+    def __init__(self, categories, xlabel, ylabel, titre_reference):
+        self.figure = plt.figure()
+        self.axe = self.figure.add_subplot()
+        self.marges_par_defaut = _marges(self.figure)
+        self.barres = self.axe.bar(categories, [0] * len(categories))
+        self.axe.set_xlabel(xlabel)
+        self.axe.set_ylabel(ylabel)
+        self.axe.set_title(titre_reference)
+        # Marges calculées, par encombrement des textes
+        self.mises_en_page = {}
+
+    def _encombrement(self):
+        # Largeur du plus long libellé de graduation (tel qu'il sera tracé),
+        # facteur d'échelle et hauteur du titre : ce sont eux qui fixent les marges
+        rendu = self.figure.canvas.get_renderer()
+        bas, haut = self.axe.get_ylim()
+        positions = [p for p in self.axe.yaxis.get_major_locator()() if bas <= p <= haut]
+        formateur = self.axe.yaxis.get_major_formatter()
+        police = self.axe.yaxis.get_major_ticks()[0].label1.get_fontproperties()
+        largeur = max(rendu.get_text_width_height_descent(libelle, police, False)[0]
+                      for libelle in formateur.format_ticks(positions))
+        return largeur, formateur.get_offset(), self.axe.title.get_window_extent(rendu).height
+
+    def tracer(self, titre, hauteurs, chemin):
+        for barre, hauteur in zip(self.barres, hauteurs):
+            barre.set_height(hauteur)
+        # Même marge haute (5 %) que l'échelle automatique de matplotlib
+        self.axe.set_ylim(0, max(max(hauteurs), 1) * 1.05)
+        self.axe.set_title(titre)
+        encombrement = self._encombrement()
+        if encombrement not in self.mises_en_page:
+            self.figure.subplots_adjust(**self.marges_par_defaut)
+            self.figure.tight_layout()
+            self.mises_en_page[encombrement] = _marges(self.figure)
+        else:
+            self.figure.subplots_adjust(**self.mises_en_page[encombrement])
+        self.figure.savefig(chemin)
+
+
+class GabaritCamembert:
+    """
+    Diagramme circulaire dont seuls les angles des parts, la position des
+    étiquettes, les pourcentages et le titre changent.
+    Les marges sont fixes : calculées sur la première figure, elles ne sont
+    recalculées que si une étiquette sort de l'image.
+    """
+
+    def __init__(self, libelles, titre_reference, taille=None, autopct="%1.1f%%",
+                 angle_depart=0, axe_egal=False):
+        self.autopct = autopct
+        self.angle_depart = angle_depart
+        self.figure = plt.figure(figsize=(taille, taille) if taille else None)
+        self.axe = self.figure.add_subplot()
+        self.marges_par_defaut = _marges(self.figure)
+        self.mise_en_page = False
+        self.parts, self.etiquettes, self.pourcentages = self.axe.pie(
+            [1] * len(libelles), labels=list(libelles), autopct=autopct, startangle=angle_depart
+        )
+        if axe_egal:
+            self.axe.axis("equal")
+        self.axe.set_title(titre_reference)
+
+    def tracer(self, titre, valeurs, chemin):
+        valeurs = np.asarray(valeurs, dtype=float)
+        fractions = valeurs / valeurs.sum()
+        # Bornes des parts en fraction de tour, comme dans Axes.pie
+        bornes = self.angle_depart / 360 + np.concatenate(([0.0], np.cumsum(fractions)))
+        milieux = np.pi * (bornes[:-1] + bornes[1:])
+        cosinus, sinus = np.cos(milieux), np.sin(milieux)
+
+        for i, part in enumerate(self.parts):
+            part.set_theta1(360 * bornes[i])
+            part.set_theta2(360 * bornes[i + 1])
+
+            x, y = 1.1 * cosinus[i], 1.1 * sinus[i]
+            self.etiquettes[i].set_position((x, y))
+            self.etiquettes[i].set_horizontalalignment("left" if x > 0 else "right")
+
+            self.pourcentages[i].set_position((0.6 * cosinus[i], 0.6 * sinus[i]))
+            self.pourcentages[i].set_text(self.autopct % (100 * fractions[i]))
+
+        self.axe.set_title(titre)
+        if not self.mise_en_page or self._deborde():
+            self.figure.subplots_adjust(**self.marges_par_defaut)
+            self.figure.tight_layout()
+            self.mise_en_page = True
+        self.figure.savefig(chemin)
+
+    def _deborde(self):
+        # Une étiquette dépasse-t-elle de l'image avec les marges actuelles ?
+        rendu = self.figure.canvas.get_renderer()
+        cadre = self.figure.bbox
+        for etiquette in self.etiquettes:
+            e = etiquette.get_window_extent(rendu)
+            if e.x0 < cadre.x0 or e.x1 > cadre.x1 or e.y0 < cadre.y0 or e.y1 > cadre.y1:
+                return True
+        return False
+
+# -----------------------------
+# Gabarits par type de graphique (un jeu par processus)
+# -----------------------------
+
+_GABARITS = {}
+
+def obtenir_gabarit(genre, *parametres):
+    """
+    Renvoie le gabarit d'un type de graphique, construit au premier appel.
+    """
+    cle = (genre,) + parametres
+    if cle not in _GABARITS:
+        if genre == "barres":
+            gabarit = GabaritBarres(
+                ["Inscrits", "Votants"], "Catégorie", "Nombre",
+                "Inscrits / Votants — Département"
+            )
+        elif genre == "camemberts":
+            gabarit = GabaritCamembert(
+                ["Blancs", "Nuls", "Exprimés", "Abstentions"],
+                "Répartition des votes — Département"
+            )
+        elif genre == "voix_candidats":
+            candidats, taille = parametres
+            gabarit = GabaritCamembert(
+                candidats, "Voix par candidat — Département",
+                taille=taille, angle_depart=90, axe_egal=True
+            )
+        else:
+            raise ValueError(f"Type de graphique inconnu : {genre}")
+        _GABARITS[cle] = gabarit
+    return _GABARITS[cle]
@@ -1,172 +1,189 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
 
-with open("data/resultats-elections-presidentielles-2022-1er-tour.csv", "r", encoding="utf-8") as fichier:
-	contenu = pd.read_csv(fichier, sep=",")
+from rendu import rendre_figures
+from agregation import agreger_departements, completer_table
+from chargement import charger_resultats, accumuler_resultats, histogramme_par_blocs
+from cache_images import ManifesteImages
+from cache_colonnes import charger_en_cache
 
-# 5. Affichage du DataFrame
-print("\n===== Contenu du fichier =====")
-print(contenu)
+# Mode de rendu des graphiques par département : "serie" ou "parallele"
+MODE_RENDU = os.environ.get("MODE_RENDU", "serie")
+NB_PROCESSUS = int(os.environ.get("NB_PROCESSUS", os.cpu_count() or 1))
+# Mettre CACHE_IMAGES=0 pour forcer le retraçage de toutes les images
+CACHE_IMAGES = os.environ.get("CACHE_IMAGES", "1") != "0"
 
-# 6. Nombre de lignes et colonnes
-nb_lignes = len(contenu)
-nb_colonnes = len(contenu.columns)
+# Lecture par blocs de TAILLE_BLOC lignes (fichiers communaux, bureaux de vote) ; 0 : lecture complète
+TAILLE_BLOC = int(os.environ.get("TAILLE_BLOC", 0))
 
-print("\n===== Dimensions =====")
-print("Nombre de lignes :", nb_lignes)
-print("Nombre de colonnes :", nb_colonnes)
+FICHIER_RESULTATS = "data/resultats-elections-presidentielles-2022-1er-tour.csv"
 
+if __name__ == "__main__":
+    if TAILLE_BLOC:
+        # Lecture par blocs : mémoire bornée quelle que soit la taille du fichier
+        accumulateur = accumuler_resultats(FICHIER_RESULTATS, TAILLE_BLOC)
+        statistiques = accumulateur.statistiques()
 
-# 7. Nature statistique des variables
-print("\n===== Types des colonnes =====")
-types = {col: str(contenu[col].dtype) for col in contenu.columns}
-for col, t in types.items():
-    print(f"{col} : {t}")
+        print("\n===== Dimensions (lecture par blocs) =====")
+        print("Nombre de lignes :", accumulateur.effectif)
 
-# 8. Afficher noms des colonnes avec head()
-print("\n===== Noms des colonnes =====")
-print(contenu.head(1))
+        print("\n===== Sommes des colonnes quantitatives =====")
+        for nom, valeur in statistiques["Somme"].items():
+            print(f"{nom} : {valeur}")
 
-# 9. Sélection du nombre des inscrits
-print("\n===== Colonne Inscrits =====")
-print(contenu["Inscrits"])
+        colonnes_candidates = accumulateur.libelles_candidats()
+        table_departements, total_france = completer_table(
+            accumulateur.table_departements(), colonnes_candidates
+        )
+    else:
+        # Tableau brut mis en cache au format colonnaire (relu sans analyse du CSV)
+        contenu = charger_en_cache(FICHIER_RESULTATS, pd.read_csv, "brut")
 
-# 10. Somme des colonnes quantitatives uniquement
-print("\n===== Sommes des colonnes quantitatives =====")
-somme_quantitatives = []
+        # 5. Affichage du DataFrame
+        print("\n===== Contenu du fichier =====")
+        print(contenu)
 
-for col in contenu.columns:
-    if contenu[col].dtype in ("int64", "float64"):
-        somme_quantitatives.append((col, contenu[col].sum()))
+        # 6. Nombre de lignes et colonnes
+        nb_lignes = len(contenu)
+        nb_colonnes = len(contenu.columns)
 
-for nom, valeur in somme_quantitatives:
-    print(f"{nom} : {valeur}")
+        print("\n===== Dimensions =====")
+        print("Nombre de lignes :", nb_lignes)
+        print("Nombre de colonnes :", nb_colonnes)
 
-# 11. Diagrammes en barres (Inscrits / Votants)
-os.makedirs("images/barres", exist_ok=True)
 
-print("\n===== Génération des diagrammes en barres =====")
+        # 7. Nature statistique des variables
+        print("\n===== Types des colonnes =====")
+        types = {col: str(contenu[col].dtype) for col in contenu.columns}
+        for col, t in types.items():
+            print(f"{col} : {t}")
 
-for i in range(len(contenu)):
-    dept = contenu.iloc[i]["Libellé du département"]
+        # 8. Afficher noms des colonnes avec head()
+        print("\n===== Noms des colonnes =====")
+        print(contenu.head(1))
 
-    plt.figure()
-    plt.bar(["Inscrits", "Votants"], [
-        contenu.iloc[i]["Inscrits"],
-        contenu.iloc[i]["Votants"]
-    ])
-    plt.title(f"Inscrits / Votants — {dept}")
-    plt.xlabel("Catégorie")
-    plt.ylabel("Nombre")
-    plt.tight_layout()
-    plt.savefig(f"images/barres/{dept}.png")
-    plt.close()
+        # 9. Sélection du nombre des inscrits
+        print("\n===== Colonne Inscrits =====")
+        print(contenu["Inscrits"])
+
+        # 10. Somme des colonnes quantitatives uniquement
+        print("\n===== Sommes des colonnes quantitatives =====")
+        somme_quantitatives = []
+
+        for col in contenu.columns:
+            if contenu[col].dtype in ("int64", "float64"):
+                somme_quantitatives.append((col, contenu[col].sum()))
+
+        for nom, valeur in somme_quantitatives:
+            print(f"{nom} : {valeur}")
+
+        # Lecture typée : territoires, candidats et table longue des voix
+        territoires, candidats, voix_longues = charger_en_cache(FICHIER_RESULTATS, charger_resultats, "long")
+        colonnes_candidates = candidats["Libellé"].tolist()
 
-print("→ Diagrammes en barres créés dans images/barres/")
+        # Totaux, parts et voix des candidats par département et pour la France, en une passe
+        table_departements, total_france = agreger_departements(territoires, candidats, voix_longues)
 
-# 12. Diagrammes circulaires (blancs, nuls, exprimés, abstentions)
-os.makedirs("images/camemberts", exist_ok=True)
+    departements = table_departements.index.tolist()
 
-print("\n===== Génération des diagrammes circulaires =====")
+    # Manifeste des images déjà produites (retraçage incrémental)
+    manifeste = ManifesteImages("images") if CACHE_IMAGES else None
 
-for i in range(len(contenu)):
-    dept = contenu.iloc[i]["Libellé du département"]
+    # 11. Diagrammes en barres (Inscrits / Votants)
+    os.makedirs("images/barres", exist_ok=True)
 
-    valeurs = [
-        contenu.iloc[i]["Blancs"],
-        contenu.iloc[i]["Nuls"],
-        contenu.iloc[i]["Exprimés"],
-        contenu.iloc[i]["Abstentions"],
+    print("\n===== Génération des diagrammes en barres =====")
+
+    taches_barres = [
+        ("barres", (dept, inscrits, votants, f"images/barres/{dept}.png"))
+        for dept, inscrits, votants in zip(
+            departements,
+            table_departements["Inscrits"].tolist(),
+            table_departements["Votants"].tolist(),
+        )
     ]
-    labels = ["Blancs", "Nuls", "Exprimés", "Abstentions"]
+
+    rendre_figures(taches_barres, MODE_RENDU, NB_PROCESSUS, manifeste)
+
+    print("→ Diagrammes en barres créés dans images/barres/")
+
+    # 12. Diagrammes circulaires (blancs, nuls, exprimés, abstentions)
+    os.makedirs("images/camemberts", exist_ok=True)
+
+    print("\n===== Génération des diagrammes circulaires =====")
+
+    repartition = table_departements[["Blancs", "Nuls", "Exprimés", "Abstentions"]].to_numpy().tolist()
+    taches_camemberts = [
+        ("camemberts", (dept, valeurs, f"images/camemberts/{dept}.png"))
+        for dept, valeurs in zip(departements, repartition)
+    ]
+
+    rendre_figures(taches_camemberts, MODE_RENDU, NB_PROCESSUS, manifeste)
+
+    print("→ Diagrammes circulaires créés dans images/camemberts/")
+
+    # 13. Histogramme de la distribution des inscrits
+    os.makedirs("images", exist_ok=True)
+
+    print("\n===== Génération de l'histogramme =====")
 
     plt.figure()
-    plt.pie(valeurs, labels=labels, autopct="%1.1f%%")
-    plt.title(f"Répartition des votes — {dept}")
+    if TAILLE_BLOC:
+        # Mêmes 10 classes que plt.hist, effectifs cumulés sur les blocs
+        bornes = np.linspace(statistiques.loc["Inscrits", "Minimum"], statistiques.loc["Inscrits", "Maximum"], 11)
+        effectifs = histogramme_par_blocs(FICHIER_RESULTATS, "Inscrits", bornes, TAILLE_BLOC)
+        plt.hist(bornes[:-1], bins=bornes, weights=effectifs, density=True)
+    else:
+        plt.hist(contenu["Inscrits"], bins=10, density=True)
+    plt.title("Distribution des inscrits")
+    plt.xlabel("Inscrits")
+    plt.ylabel("Densité")
     plt.tight_layout()
-    plt.savefig(f"images/camemberts/{dept}.png")
+    plt.savefig("images/histogramme_inscrits.png")
     plt.close()
 
-print("→ Diagrammes circulaires créés dans images/camemberts/")
-
-# 13. Histogramme de la distribution des inscrits
-os.makedirs("images", exist_ok=True)
-
-print("\n===== Génération de l'histogramme =====")
-
-plt.figure()
-plt.hist(contenu["Inscrits"], bins=10, density=True)
-plt.title("Distribution des inscrits")
-plt.xlabel("Inscrits")
-plt.ylabel("Densité")
-plt.tight_layout()
-plt.savefig("images/histogramme_inscrits.png")
-plt.close()
-
-print("→ Histogramme créé : images/histogramme_inscrits.png")
-
-# 14. Diagrammes circulaires : voix par candidat
-os.makedirs("images/voix_candidats", exist_ok=True)
-
-print("\n===== Génération des diagrammes circulaires par candidat =====")
-
-# Récupération des colonnes correspondant aux candidats (tout sauf les colonnes déjà utilisées)
-colonnes_candidates = [col for col in contenu.columns if col not in [
-    "Département", "Libellé du département", "Inscrits", "Votants",
-    "Blancs", "Nuls", "Exprimés", "Abstentions", "Nom de la commune", "Code commune"
-]]
-
-# 14. Diagrammes circulaires : voix par candidat
-os.makedirs("images/voix_candidats", exist_ok=True)
-
-print("\n===== Génération des diagrammes circulaires par candidat =====")
-
-# Colonnes candidates : toutes les colonnes numériques sauf celles déjà utilisées
-colonnes_non_candidates = [
-    "Département", "Libellé du département", "Inscrits", "Votants",
-    "Blancs", "Nuls", "Exprimés", "Abstentions", "Nom de la commune", "Code commune"
-]
-
-colonnes_candidates = [
-    col for col in contenu.columns 
-    if col not in colonnes_non_candidates and pd.api.types.is_numeric_dtype(contenu[col])
-]
-
-# --- Par département ---
-departements = contenu["Libellé du département"].unique()
-
-for dept in departements:
-    df_dept = contenu[contenu["Libellé du département"] == dept]
-    
-    # Somme des voix par candidat dans le département, conversion en float
-    voix_par_candidat = df_dept[colonnes_candidates].apply(pd.to_numeric, errors='coerce').sum().fillna(0)
-    
-    if voix_par_candidat.sum() == 0:
-        continue  # Ignorer les départements sans votes numériques valides
-    
-    plt.figure(figsize=(6,6))
-    plt.pie(voix_par_candidat, labels=voix_par_candidat.index, autopct="%1.1f%%", startangle=90)
-    plt.title(f"Voix par candidat — Département {dept}")
-    plt.axis("equal")
-    plt.tight_layout()
-    plt.savefig(f"images/voix_candidats/{dept}.png")
-    plt.close()
+    print("→ Histogramme créé : images/histogramme_inscrits.png")
+
+    # 14. Diagrammes circulaires : voix par candidat
+    os.makedirs("images/voix_candidats", exist_ok=True)
+
+    print("\n===== Génération des diagrammes circulaires par candidat =====")
+
+    # --- Par département ---
+    voix = table_departements[colonnes_candidates]
+    # Ignorer les départements sans votes numériques valides
+    avec_voix = (table_departements["Total des voix"] != 0).to_numpy()
+
+    taches_voix = [
+        ("voix_candidats", (
+            f"Voix par candidat — Département {dept}",
+            colonnes_candidates,
+            voix_dept,
+            6,
+            f"images/voix_candidats/{dept}.png",
+        ))
+        for dept, voix_dept in zip(voix.index[avec_voix], voix.to_numpy()[avec_voix].tolist())
+    ]
 
-# --- Pour la France entière ---
-voix_france = contenu[colonnes_candidates].apply(pd.to_numeric, errors='coerce').sum().fillna(0)
+    # --- Pour la France entière ---
+    taches_voix.append(("voix_candidats", (
+        "Voix par candidat — France entière",
+        colonnes_candidates,
+        total_france[colonnes_candidates].tolist(),
+        8,
+        "images/voix_candidats/france_entière.png",
+    )))
 
-plt.figure(figsize=(8,8))
-plt.pie(voix_france, labels=voix_france.index, autopct="%1.1f%%", startangle=90)
-plt.title("Voix par candidat — France entière")
-plt.axis("equal")
-plt.tight_layout()
-plt.savefig("images/voix_candidats/france_entière.png")
-plt.close()
+    rendre_figures(taches_voix, MODE_RENDU, NB_PROCESSUS, manifeste)
 
-print("→ Diagrammes circulaires des voix par candidat créés dans images/voix_candidats/")
+    print("→ Diagrammes circulaires des voix par candidat créés dans images/voix_candidats/")
 
+    if manifeste is not None:
+        manifeste.sauvegarder()
+        manifeste.rapport()
 
 
-print("\n===== Travail terminé ! =====")
 
+    print("\n===== Travail terminé ! =====")
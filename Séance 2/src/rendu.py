@@ -0,0 +1,82 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from gabarits import obtenir_gabarit
+from cache_images import empreinte
+
+# Version du tracé, prise en compte dans l'empreinte des images :
+# à incrémenter quand l'apparence des graphiques change.
+VERSION_GRAPHIQUES = 3
+
+# -----------------------------
+# Fonctions de tracé (mise à jour d'un gabarit par tâche)
+# -----------------------------
+
+def tracer_barres(dept, inscrits, votants, chemin):
+    obtenir_gabarit("barres").tracer(f"Inscrits / Votants — {dept}", [inscrits, votants], chemin)
+
+def tracer_camembert(dept, valeurs, chemin):
+    obtenir_gabarit("camemberts").tracer(f"Répartition des votes — {dept}", valeurs, chemin)
+
+def tracer_voix_candidats(titre, candidats, voix, taille, chemin):
+    obtenir_gabarit("voix_candidats", tuple(candidats), taille).tracer(titre, voix, chemin)
+
+TRACEURS = {
+    "barres": tracer_barres,
+    "camemberts": tracer_camembert,
+    "voix_candidats": tracer_voix_candidats,
+}
+
+# -----------------------------
+# Exécution des tâches de rendu
+# -----------------------------
+
+def executer_tache(tache):
+    """
+    Trace une figure à partir d'une tâche (type de graphique, arguments).
+    Le dernier argument est toujours le chemin de l'image produite.
+    """
+    genre, arguments = tache
+    TRACEURS[genre](*arguments)
+    return arguments[-1]
+
+MODES_RENDU = ("serie", "parallele")
+
+def rendre_figures(taches, mode="serie", nb_processus=None, manifeste=None):
+    """
+    Produit toutes les images décrites par `taches`.
+    En mode "parallele", les tâches sont réparties sur un pool de processus ;
+    chaque tâche ne transporte que les quelques valeurs de son graphique.
+    Avec un `manifeste`, seules les images dont l'empreinte a changé sont retracées.
+    """
+    if mode not in MODES_RENDU:
+        raise ValueError(f"Mode de rendu inconnu : {mode} (au choix : {', '.join(MODES_RENDU)})")
+    taches = list(taches)
+    empreintes = {}
+    if manifeste is not None:
+        a_rendre = []
+        for tache in taches:
+            chemin = tache[1][-1]
+            cle = empreinte(VERSION_GRAPHIQUES, *tache)
+            if not manifeste.est_a_jour(chemin, cle):
+                empreintes[chemin] = cle
+                a_rendre.append(tache)
+        taches = a_rendre
+
+    images = _executer_taches(taches, mode, nb_processus)
+
+    if manifeste is not None:
+        for image in images:
+            manifeste.marquer(image, empreintes[image])
+    return images
+
+def _executer_taches(taches, mode, nb_processus):
+    if nb_processus is None:
+        nb_processus = os.cpu_count() or 1
+
+    if mode == "serie" or nb_processus <= 1 or len(taches) <= 1:
+        return [executer_tache(tache) for tache in taches]
+
+    taille_lot = max(1, len(taches) // (nb_processus * 4))
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        return list(pool.map(executer_tache, taches, chunksize=taille_lot))
@@ -0,0 +1,138 @@
+import os
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from cache_images import empreinte
+from statistiques import trier_colonnes, quantiles_tries
+
+# =============================
+# Boîtes à moustaches par lots
+# =============================
+# Les statistiques des boîtes (quartiles, moustaches, valeurs extrêmes) de
+# toutes les colonnes sont calculées en un seul tri, puis dessinées avec
+# `Axes.bxp` : soit en grilles de plusieurs panneaux, soit une image par
+# colonne sur une figure unique réutilisée.
+
+PANNEAUX_PAR_GRILLE = 12
+PANNEAUX_PAR_LIGNE = 4
+
+def statistiques_boites(tableau, coefficient=1.5):
+    """
+    Statistiques de boîte à moustaches de chaque colonne, au format attendu
+    par `Axes.bxp` (mêmes règles que `plt.boxplot` : moustaches à la valeur
+    la plus éloignée dans coefficient × IQR, valeurs extrêmes au-delà).
+    """
+    tri, effectifs = trier_colonnes(tableau)
+    q1, mediane, q3 = quantiles_tries(tri, effectifs, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    presentes = ~np.isnan(tri)
+
+    with np.errstate(invalid="ignore"):
+        sous_haut = presentes & (tri <= q3 + coefficient * iqr)
+        sur_bas = presentes & (tri >= q1 - coefficient * iqr)
+    moustaches_hautes = np.maximum(np.where(sous_haut, tri, -np.inf).max(axis=0), q3)
+    moustaches_basses = np.minimum(np.where(sur_bas, tri, np.inf).min(axis=0), q1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        moyennes = np.where(presentes, tri, 0).sum(axis=0) / effectifs
+
+    # Valeurs extrêmes dans l'ordre des données, comme `plt.boxplot`
+    valeurs = np.asarray(tableau, dtype=float)
+    with np.errstate(invalid="ignore"):
+        extremes = (valeurs < moustaches_basses) | (valeurs > moustaches_hautes)
+
+    statistiques = []
+    for j in range(tri.shape[1]):
+        statistiques.append({
+            "label": str(tableau.columns[j]) if hasattr(tableau, "columns") else str(j + 1),
+            "mean": moyennes[j],
+            "med": mediane[j],
+            "q1": q1[j],
+            "q3": q3[j],
+            "whislo": moustaches_basses[j],
+            "whishi": moustaches_hautes[j],
+            "fliers": valeurs[extremes[:, j], j],
+        })
+    return statistiques
+
+def tracer_grille(statistiques, chemin, par_ligne=PANNEAUX_PAR_LIGNE):
+    """
+    Une figure de plusieurs panneaux, un par colonne (échelles indépendantes).
+    """
+    lignes = -(-len(statistiques) // par_ligne)
+    figure, axes = plt.subplots(lignes, par_ligne, figsize=(3 * par_ligne, 3 * lignes), squeeze=False)
+    for axe, stats in zip(axes.flat, statistiques):
+        axe.bxp([stats])
+        axe.set_title(stats["label"], fontsize="small")
+        axe.set_xticks([])
+        axe.tick_params(axis="y", labelsize="small")
+        axe.grid(True)
+    for axe in axes.flat[len(statistiques):]:
+        axe.set_visible(False)
+    figure.suptitle("Boîtes à moustaches")
+    figure.tight_layout()
+    figure.savefig(chemin)
+    plt.close(figure)
+
+class GabaritBoite:
+    """
+    Figure unique réutilisée pour les images individuelles.
+    """
+
+    def __init__(self):
+        self.figure = plt.figure()
+        self.axe = self.figure.add_subplot()
+
+    def tracer(self, stats, chemin):
+        self.axe.clear()
+        self.axe.bxp([dict(stats, label="1")])
+        self.axe.set_title(f"Boîte à moustaches – {stats['label']}")
+        self.axe.set_ylabel(stats["label"])
+        self.axe.grid(True)
+        self.figure.tight_layout()
+        self.figure.savefig(chemin)
+
+def exporter_boites(tableau, dossier, mode="grille", manifeste=None, panneaux=PANNEAUX_PAR_GRILLE):
+    """
+    Trace les boîtes à moustaches de toutes les colonnes de `tableau`.
+    `mode` : "grille" (boxplots_<i>.png), "individuelles" (boxplot_<colonne>.png)
+    ou "toutes". Avec un manifeste, seules les images dont les valeurs ont
+    changé sont retracées ; leurs statistiques sont calculées en un seul passage.
+    """
+    colonnes = list(tableau.columns)
+    valeurs = {col: tableau[col].dropna().to_numpy() for col in colonnes}
+    taches = []  # (genre, colonnes, chemin, clé)
+
+    if mode in ("grille", "toutes"):
+        for i, debut in enumerate(range(0, len(colonnes), panneaux)):
+            groupe = colonnes[debut:debut + panneaux]
+            chemin = os.path.join(dossier, f"boxplots_{i + 1}.png")
+            cle = empreinte("boxplots", groupe, *[valeurs[col] for col in groupe])
+            taches.append(("grille", groupe, chemin, cle))
+    if mode in ("individuelles", "toutes"):
+        for col in colonnes:
+            chemin = os.path.join(dossier, f"boxplot_{col}.png")
+            taches.append(("individuelle", [col], chemin, empreinte("boxplot", col, valeurs[col])))
+    elif mode != "grille":
+        raise ValueError(f"Mode de boîtes à moustaches inconnu : {mode}")
+
+    if manifeste is not None:
+        taches = [tache for tache in taches if not manifeste.est_a_jour(tache[2], tache[3])]
+    if not taches:
+        return
+
+    a_tracer = [col for col in colonnes if any(col in tache[1] for tache in taches)]
+    statistiques = dict(zip(a_tracer, statistiques_boites(tableau[a_tracer])))
+
+    gabarit = None
+    for genre, groupe, chemin, cle in taches:
+        if genre == "grille":
+            tracer_grille([statistiques[col] for col in groupe], chemin)
+        else:
+            gabarit = gabarit or GabaritBoite()
+            gabarit.tracer(statistiques[groupe[0]], chemin)
+        if manifeste is not None:
+            manifeste.marquer(chemin, cle)
+    if gabarit is not None:
+        plt.close(gabarit.figure)
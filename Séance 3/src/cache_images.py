@@ -0,0 +1,103 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# -----------------------------
+# Cache incrémental des images produites
+# -----------------------------
+# Le manifeste associe chaque image à l'empreinte (SHA-256) des valeurs et des
+# paramètres qui l'ont produite. Une image n'est retracée que si son empreinte
+# a changé ou si le fichier a disparu.
+
+NOM_MANIFESTE = ".manifeste.json"
+
+def empreinte(*parametres):
+    """
+    Calcule l'empreinte SHA-256 des paramètres d'une image.
+    Les tableaux NumPy sont hachés sur leurs octets, le reste via JSON.
+    Les nombres sont hachés en float64 : la lecture complète (entiers) et la
+    lecture par blocs (réels) donnent la même empreinte pour les mêmes valeurs.
+    Les entiers au-delà de 2^53 (empreintes de pandas…), que float64 ne
+    représente pas exactement, sont hachés tels quels.
+    """
+    h = hashlib.sha256()
+    for parametre in parametres:
+        if isinstance(parametre, np.ndarray):
+            if parametre.dtype.kind == "f" or (parametre.dtype.kind in "biu" and _exact_en_reel(parametre)):
+                parametre = parametre.astype(np.float64)
+            h.update(str(parametre.dtype).encode())
+            h.update(str(parametre.shape).encode())
+            h.update(np.ascontiguousarray(parametre).tobytes())
+        else:
+            h.update(json.dumps(_en_reels(parametre), default=_en_json, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def _en_reels(objet):
+    # Entiers et réels (Python ou NumPy) convertis en float, listes comprises
+    if isinstance(objet, (list, tuple)):
+        return [_en_reels(element) for element in objet]
+    if isinstance(objet, (bool, np.bool_)):
+        return objet
+    if isinstance(objet, (float, np.floating)) or (isinstance(objet, (int, np.integer)) and _exact_en_reel(objet)):
+        return float(objet)
+    return objet
+
+def _exact_en_reel(entiers):
+    # Entiers (tableau ou scalaire) représentés exactement en float64
+    entiers = np.asarray(entiers)
+    return entiers.size == 0 or bool(entiers.min() >= -2 ** 53 and entiers.max() <= 2 ** 53)
+
+def _en_json(objet):
+    # Scalaires NumPy (np.int64, np.float64…) et autres objets
+    if hasattr(objet, "item"):
+        return objet.item()
+    return str(objet)
+
+
+class ManifesteImages:
+    """
+    Manifeste des images d'un dossier, stocké dans `<dossier>/.manifeste.json`.
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.chemin = os.path.join(dossier, NOM_MANIFESTE)
+        self.empreintes = {}
+        if os.path.exists(self.chemin):
+            with open(self.chemin, "r", encoding="utf-8") as fichier:
+                self.empreintes = json.load(fichier)
+        self.reconstruites = []
+        self.inchangees = []
+
+    def _cle(self, image):
+        return os.path.relpath(image, self.dossier)
+
+    def est_a_jour(self, image, cle):
+        """
+        Indique si l'image existe et a été produite avec la même empreinte.
+        """
+        a_jour = self.empreintes.get(self._cle(image)) == cle and os.path.exists(image)
+        if a_jour:
+            self.inchangees.append(image)
+        return a_jour
+
+    def marquer(self, image, cle):
+        """
+        Enregistre l'empreinte d'une image qui vient d'être tracée.
+        """
+        self.empreintes[self._cle(image)] = cle
+        self.reconstruites.append(image)
+
+    def sauvegarder(self):
+        os.makedirs(self.dossier, exist_ok=True)
+        with open(self.chemin, "w", encoding="utf-8") as fichier:
+            json.dump(self.empreintes, fichier, ensure_ascii=False, indent=1, sort_keys=True)
+
+    def rapport(self):
+        print(f"→ Cache des images : {len(self.reconstruites)} reconstruite(s), "
+              f"{len(self.inchangees)} inchangée(s)")
+        for image in self.reconstruites:
+            print(f"   reconstruite : {image}")
+        return self.reconstruites
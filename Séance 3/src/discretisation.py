@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# =============================
+# Discrétisation en classes d'effectifs
+# =============================
+# Les classes sont fermées à droite, ]a, b], comme `pd.cut(..., right=True)`.
+# Chaque bloc de valeurs est classé en un passage (`searchsorted` puis
+# `bincount`) : seuls les effectifs sont conservés, les blocs peuvent donc
+# venir d'une lecture par morceaux et les histogrammes partiels se fusionnent.
+
+def libelle_borne(borne):
+    if np.isinf(borne):
+        return "+∞" if borne > 0 else "-∞"
+    if borne == int(borne):
+        return str(int(borne))
+    return f"{borne:.3g}"
+
+def libelles_intervalles(bornes):
+    """
+    Libellés « ]a,b] » des classes (« ]a,+∞[ » pour la dernière si elle est ouverte).
+    """
+    libelles = []
+    for bas, haut in zip(bornes[:-1], bornes[1:]):
+        fermeture = "[" if np.isinf(haut) else "]"
+        libelles.append(f"]{libelle_borne(bas)},{libelle_borne(haut)}{fermeture}")
+    return libelles
+
+def tableau_effectifs(effectifs, libelles):
+    """
+    Effectifs, fréquences et leurs cumuls croissants, une ligne par classe.
+    """
+    effectifs = np.asarray(effectifs, dtype=np.int64)
+    total = effectifs.sum()
+    cumules = np.cumsum(effectifs)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "Effectif": effectifs,
+            "Fréquence": effectifs / total,
+            "Effectif cumulé": cumules,
+            "Fréquence cumulée": cumules / total,
+        }, index=pd.Index(libelles, name="Classe"))
+
+
+class HistogrammeClasses:
+    """
+    Effectifs par classes de bornes fixées.
+    Les valeurs manquantes ou hors des bornes sont comptées à part.
+    """
+
+    def __init__(self, bornes):
+        self.bornes = np.asarray(bornes, dtype=float)
+        self.effectifs = np.zeros(len(self.bornes) - 1, dtype=np.int64)
+        self.hors_classes = 0
+
+    def ajouter(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float).ravel()
+        # Indice i tel que bornes[i] < x <= bornes[i + 1]
+        indices = np.searchsorted(self.bornes, valeurs, side="left") - 1
+        dans = (indices >= 0) & (indices < len(self.effectifs)) & ~np.isnan(valeurs)
+        self.effectifs += np.bincount(indices[dans], minlength=len(self.effectifs))
+        self.hors_classes += int(valeurs.size - dans.sum())
+
+    def fusionner(self, autre):
+        if not np.array_equal(self.bornes, autre.bornes):
+            raise ValueError("Les histogrammes à fusionner n'ont pas les mêmes bornes")
+        self.effectifs += autre.effectifs
+        self.hors_classes += autre.hors_classes
+
+    def libelles(self):
+        return libelles_intervalles(self.bornes)
+
+    def tableau(self):
+        return tableau_effectifs(self.effectifs, self.libelles())
+
+
+class HistogrammeLogarithmique:
+    """
+    Effectifs par classes logarithmiques ]10^((j-1)/k), 10^(j/k)], avec k
+    classes par décade. L'étendue n'a pas à être connue à l'avance : le
+    tableau des effectifs s'agrandit au fil des blocs. Les valeurs nulles,
+    négatives, infinies ou manquantes sont comptées à part.
+    """
+
+    def __init__(self, par_decade=1):
+        self.par_decade = par_decade
+        self.premiere = 0          # exposant j de la première classe
+        self.effectifs = np.zeros(0, dtype=np.int64)
+        self.hors_classes = 0
+
+    def ajouter(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float).ravel()
+        with np.errstate(invalid="ignore"):
+            positives = valeurs[np.isfinite(valeurs) & (valeurs > 0)]
+        self.hors_classes += int(valeurs.size - positives.size)
+        if not positives.size:
+            return
+
+        k = self.par_decade
+        exposants = np.ceil(k * np.log10(positives)).astype(np.int64)
+        # Corrige les arrondis de log10 pour respecter exactement les bornes générées
+        exposants += positives > 10.0 ** (exposants / k)
+        exposants -= positives <= 10.0 ** ((exposants - 1) / k)
+
+        self._etendre(exposants.min(), exposants.max())
+        self.effectifs += np.bincount(exposants - self.premiere, minlength=len(self.effectifs))
+
+    def fusionner(self, autre):
+        if self.par_decade != autre.par_decade:
+            raise ValueError("Les histogrammes à fusionner n'ont pas le même nombre de classes par décade")
+        if len(autre.effectifs):
+            self._etendre(autre.premiere, autre.premiere + len(autre.effectifs) - 1)
+            debut = autre.premiere - self.premiere
+            self.effectifs[debut:debut + len(autre.effectifs)] += autre.effectifs
+        self.hors_classes += autre.hors_classes
+
+    def bornes(self):
+        exposants = np.arange(self.premiere - 1, self.premiere + len(self.effectifs))
+        return 10.0 ** (exposants / self.par_decade)
+
+    def libelles(self):
+        return libelles_intervalles(self.bornes())
+
+    def tableau(self):
+        return tableau_effectifs(self.effectifs, self.libelles())
+
+    def _etendre(self, premiere, derniere):
+        if not len(self.effectifs):
+            self.premiere = premiere
+            self.effectifs = np.zeros(derniere - premiere + 1, dtype=np.int64)
+            return
+        debut = min(self.premiere, premiere)
+        fin = max(self.premiere + len(self.effectifs) - 1, derniere)
+        if debut == self.premiere and fin == self.premiere + len(self.effectifs) - 1:
+            return
+        effectifs = np.zeros(fin - debut + 1, dtype=np.int64)
+        effectifs[self.premiere - debut:self.premiere - debut + len(self.effectifs)] = self.effectifs
+        self.premiere, self.effectifs = debut, effectifs
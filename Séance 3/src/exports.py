@@ -0,0 +1,85 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from openpyxl import Workbook
+
+from cache_images import empreinte
+
+# =============================
+# Exports des tableaux de résultats
+# =============================
+# Un écrivain par format, choisi par son extension. Chaque fichier est écrit
+# sous un nom temporaire puis renommé : un export interrompu ne laisse pas de
+# fichier tronqué. Avec un manifeste, un format n'est réécrit que si le
+# contenu du tableau a changé depuis le dernier export.
+
+VERSION_EXPORTS = 1
+
+def ecrire_csv(tableau, chemin):
+    tableau.to_csv(chemin)
+
+def ecrire_parquet(tableau, chemin):
+    # Nécessite pyarrow (voir requirements.txt)
+    tableau.to_parquet(chemin)
+
+def ecrire_excel(tableau, chemin):
+    """
+    Classeur en écriture seule : les lignes sont écrites au fil de l'eau,
+    sans construire les cellules du classeur en mémoire ni les mettre en forme.
+    """
+    classeur = Workbook(write_only=True)
+    feuille = classeur.create_sheet("Sheet1")
+    feuille.append([tableau.index.name] + [str(col) for col in tableau.columns])
+    valeurs = tableau.astype(object).where(tableau.notna(), None)
+    for ligne in valeurs.itertuples(name=None):
+        feuille.append(ligne)
+    classeur.save(chemin)
+
+EXPORTEURS = {
+    "csv": ecrire_csv,
+    "parquet": ecrire_parquet,
+    "xlsx": ecrire_excel,
+}
+
+def empreinte_tableau(tableau):
+    return empreinte(
+        [str(col) for col in tableau.columns],
+        tableau.index.name,
+        pd.util.hash_pandas_object(tableau, index=True).to_numpy(),
+    )
+
+def exporter(tableau, base, formats=("csv", "xlsx"), manifeste=None):
+    """
+    Écrit `tableau` dans `<base>.<format>` pour chaque format demandé.
+    Renvoie la liste des fichiers (ré)écrits.
+    """
+    contenu = empreinte_tableau(tableau)
+    ecrits = []
+    for extension in formats:
+        if extension not in EXPORTEURS:
+            raise ValueError(f"Format d'export inconnu : {extension}")
+        chemin = f"{base}.{extension}"
+        cle = empreinte("export", VERSION_EXPORTS, extension, contenu)
+        if manifeste is not None and manifeste.est_a_jour(chemin, cle):
+            continue
+
+        temporaire = f"{base}.tmp.{extension}"
+        EXPORTEURS[extension](tableau, temporaire)
+        os.replace(temporaire, chemin)
+        ecrits.append(chemin)
+        if manifeste is not None:
+            manifeste.marquer(chemin, cle)
+    return ecrits
+
+def exporter_en_arriere_plan(tableau, base, formats=("csv", "xlsx"), manifeste=None):
+    """
+    Lance `exporter` dans un fil d'exécution séparé et renvoie son `Future` :
+    `.result()` attend la fin des écritures (et relance une éventuelle erreur).
+    Le tableau est copié, il peut donc être modifié pendant l'export.
+    Le manifeste ne doit pas être utilisé ailleurs avant la fin de l'export.
+    """
+    executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exports")
+    futur = executeur.submit(exporter, tableau.copy(), base, formats, manifeste)
+    executeur.shutdown(wait=False)
+    return futur
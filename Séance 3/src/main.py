@@ -1,7 +1,15 @@
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from cache_images import ManifesteImages
+from chargement import COLONNES_DECOMPTE, charger_resultats, charger_par_blocs, tableau_voix
+from cache_colonnes import charger_en_cache
+from statistiques import statistiques_descriptives
+from boites import exporter_boites
+from exports import exporter_en_arriere_plan
+from discretisation import HistogrammeClasses, HistogrammeLogarithmique
+from quantiles_flux import StatistiquesFlux, statistiques_en_parallele
 
 # =============================
 # Configuration des dossiers
@@ -12,122 +20,133 @@ IMG_DIR = os.path.join(BASE_DIR, "img")
 
 os.makedirs(IMG_DIR, exist_ok=True)
 
-# =============================
-# 1. Lecture du fichier CSV (élections)
-# =============================
-file_elections = os.path.join(DATA_DIR, "resultats-elections-presidentielles-2022-1er-tour.csv")
-
-with open(file_elections, "r", encoding="utf-8") as f:
-    df = pd.read_csv(f, low_memory=False)
-
-# Conversion propre des colonnes numériques
-for col in df.columns:
-    df[col] = pd.to_numeric(df[col], errors="ignore")
-
-# =============================
-# 2. Sélection des colonnes quantitatives
-# =============================
-quantitative_cols = df.select_dtypes(include=[np.number])
-
-# =============================
-# 3. Calcul des paramètres statistiques
-# =============================
-means = quantitative_cols.mean().round(2)
-medians = quantitative_cols.median().round(2)
-modes = quantitative_cols.mode().iloc[0].round(2)
-stds = quantitative_cols.std().round(2)
-
-abs_dev_mean = quantitative_cols.sub(means).abs().mean().round(2)
-
-ranges = (quantitative_cols.max() - quantitative_cols.min()).round(2)
-
-# =============================
-# 4. Affichage des résultats
-# =============================
-print("Moyennes :", means.tolist())
-print("Médianes :", medians.tolist())
-print("Modes :", modes.tolist())
-print("Écarts-types :", stds.tolist())
-print("Écart absolu moyen :", abs_dev_mean.tolist())
-print("Étendues :", ranges.tolist())
-
-# =============================
-# 5. Distance interquartile et interdécile
-# =============================
-q1 = quantitative_cols.quantile(0.25)
-q3 = quantitative_cols.quantile(0.75)
-interquartile = (q3 - q1).round(2)
-
-d1 = quantitative_cols.quantile(0.1)
-d9 = quantitative_cols.quantile(0.9)
-interdecile = (d9 - d1).round(2)
-
-print("Distance interquartile :", interquartile.tolist())
-print("Distance interdécile :", interdecile.tolist())
-
-# =============================
-# 6. Boîtes à moustaches
-# =============================
-for col in quantitative_cols.columns:
-    plt.figure()
-    plt.boxplot(quantitative_cols[col].dropna())
-    plt.title(f"Boîte à moustaches – {col}")
-    plt.ylabel(col)
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(os.path.join(IMG_DIR, f"boxplot_{col}.png"))
-    plt.close()
-
-# =============================
-# 7. Lecture du fichier island-index.csv
-# =============================
-file_islands = os.path.join(DATA_DIR, "island-index.csv")
-
-with open(file_islands, "r", encoding="utf-8") as f:
-    df_islands = pd.read_csv(f)
-
-# Nettoyage des noms de colonnes
-df_islands.columns = df_islands.columns.str.strip()
-
-# =============================
-# 8. Catégorisation des surfaces
-# =============================
-# Adapter ici si le nom exact diffère
-surface = df_islands["Surface (km²)"]
-
-bins = [0, 10, 25, 50, 100, 2500, 5000, 10000, np.inf]
-labels = [
-    "]0,10]",
-    "]10,25]",
-    "]25,50]",
-    "]50,100]",
-    "]100,2500]",
-    "]2500,5000]",
-    "]5000,10000]",
-    "]10000,+∞["
-]
-
-categories = pd.cut(surface, bins=bins, labels=labels, right=True)
-counts = categories.value_counts().sort_index()
-
-print("Répartition des îles par surface :")
-print(counts)
-
-# =============================
-# 9. Bonus : export CSV et Excel
-# =============================
-results_df = pd.DataFrame({
-    "Moyenne": means,
-    "Médiane": medians,
-    "Mode": modes,
-    "Écart-type": stds,
-    "Écart absolu moyen": abs_dev_mean,
-    "Étendue": ranges,
-    "Interquartile": interquartile,
-    "Interdécile": interdecile
-})
-
-results_df.to_csv(os.path.join(BASE_DIR, "statistiques_elections.csv"))
-results_df.to_excel(os.path.join(BASE_DIR, "statistiques_elections.xlsx"))
-
-
+# Lecture par blocs de TAILLE_BLOC lignes (fichiers communaux, bureaux de vote) ; 0 : lecture complète.
+# Par blocs, médianes et quantiles sont estimés par esquisses (voir quantiles_flux.py).
+TAILLE_BLOC = int(os.environ.get("TAILLE_BLOC", 0))
+NB_PROCESSUS = int(os.environ.get("NB_PROCESSUS", 1))
+# Boîtes à moustaches : "grille" (boxplots_<i>.png), "individuelles" (boxplot_<colonne>.png) ou "toutes"
+BOITES = os.environ.get("BOITES", "grille")
+# Formats d'export du tableau des paramètres, parmi csv, parquet et xlsx
+EXPORTS = os.environ.get("EXPORTS", "csv,xlsx").split(",")
+
+def colonnes_quantitatives(territoires, candidats, voix):
+    """
+    Décomptes puis voix de chaque candidat (une colonne par candidat).
+    """
+    return pd.concat(
+        [territoires[COLONNES_DECOMPTE], tableau_voix(territoires, candidats, voix)],
+        axis=1
+    )
+
+if __name__ == "__main__":
+    # =============================
+    # 1. Lecture du fichier CSV (élections)
+    # =============================
+    file_elections = os.path.join(DATA_DIR, "resultats-elections-presidentielles-2022-1er-tour.csv")
+
+    if not TAILLE_BLOC:
+        # Lecture typée : l'en-tête (blocs Sexe, Nom, Prénom, Voix) est analysé une fois,
+        # puis le résultat est relu depuis le cache colonnaire tant que le fichier ne change pas
+        territoires, candidats, voix = charger_en_cache(file_elections, charger_resultats, "long")
+
+    # =============================
+    # 2. Sélection des colonnes quantitatives
+    # =============================
+    if TAILLE_BLOC:
+        # Les colonnes sont sélectionnées bloc par bloc ; les valeurs ne sont pas
+        # conservées, les boîtes à moustaches ne sont donc pas tracées
+        blocs = (colonnes_quantitatives(*bloc) for bloc in charger_par_blocs(file_elections, TAILLE_BLOC))
+        quantitative_cols = pd.DataFrame()
+    else:
+        quantitative_cols = colonnes_quantitatives(territoires, candidats, voix)
+
+    # =============================
+    # 3. Calcul des paramètres statistiques
+    # =============================
+    if TAILLE_BLOC:
+        # Chaque bloc est résumé (moments exacts, esquisses de quantiles), puis les
+        # résumés sont fusionnés, éventuellement entre processus (voir quantiles_flux.py)
+        if NB_PROCESSUS > 1:
+            flux = statistiques_en_parallele(blocs, NB_PROCESSUS)
+        else:
+            flux = StatistiquesFlux()
+            for bloc in blocs:
+                flux.ajouter(bloc)
+        results_df = flux.resultats()
+    else:
+        # Un seul tri par colonne pour tous les paramètres (voir statistiques.py)
+        results_df = statistiques_descriptives(quantitative_cols)
+
+    # Les exports (section 9) s'écrivent en arrière-plan pendant la suite des calculs ;
+    # seuls les formats dont le tableau a changé sont réécrits
+    manifeste_exports = ManifesteImages(BASE_DIR)
+    exports = exporter_en_arriere_plan(
+        results_df, os.path.join(BASE_DIR, "statistiques_elections"), EXPORTS, manifeste_exports
+    )
+
+    # =============================
+    # 4. Affichage des résultats
+    # =============================
+    print("Moyennes :", results_df["Moyenne"].tolist())
+    print("Médianes :", results_df["Médiane"].tolist())
+    print("Modes :", results_df["Mode"].tolist())
+    print("Écarts-types :", results_df["Écart-type"].tolist())
+    print("Écart absolu moyen :", results_df["Écart absolu moyen"].tolist())
+    print("Étendues :", results_df["Étendue"].tolist())
+
+    # =============================
+    # 5. Distance interquartile et interdécile
+    # =============================
+    print("Distance interquartile :", results_df["Interquartile"].tolist())
+    print("Distance interdécile :", results_df["Interdécile"].tolist())
+
+    # =============================
+    # 6. Boîtes à moustaches
+    # =============================
+    # Statistiques de toutes les boîtes en un seul passage, tracées en grilles
+    # (et/ou une image par colonne) ; seules les images dont les valeurs ont changé
+    # sont retracées
+    manifeste = ManifesteImages(IMG_DIR)
+    exporter_boites(quantitative_cols, IMG_DIR, BOITES, manifeste)
+
+    manifeste.sauvegarder()
+    manifeste.rapport()
+
+    # Les exports en cours sont attendus et enregistrés même si la suite échoue
+    # (fichier des îles absent…) : sinon tout serait réexporté au prochain lancement
+    try:
+        # =============================
+        # 7. Lecture du fichier island-index.csv
+        # =============================
+        file_islands = os.path.join(DATA_DIR, "island-index.csv")
+
+        # Par blocs de TAILLE_BLOC lignes si demandé : seuls les effectifs par classe sont conservés
+        with open(file_islands, "r", encoding="utf-8") as f:
+            blocs_islands = pd.read_csv(f, chunksize=TAILLE_BLOC) if TAILLE_BLOC else [pd.read_csv(f)]
+
+            # =============================
+            # 8. Catégorisation des surfaces
+            # =============================
+            classes_surface = HistogrammeClasses([0, 10, 25, 50, 100, 2500, 5000, 10000, np.inf])
+            classes_surface_log = HistogrammeLogarithmique(par_decade=1)
+
+            for df_islands in blocs_islands:
+                # Nettoyage des noms de colonnes
+                df_islands.columns = df_islands.columns.str.strip()
+                # Adapter ici si le nom exact diffère
+                surface = df_islands["Surface (km²)"].to_numpy()
+                classes_surface.ajouter(surface)
+                classes_surface_log.ajouter(surface)
+
+        print("Répartition des îles par surface :")
+        print(classes_surface.tableau())
+
+        print("Répartition des îles par surface (classes logarithmiques) :")
+        print(classes_surface_log.tableau())
+    finally:
+        # =============================
+        # 9. Bonus : exports (CSV, Excel…)
+        # =============================
+        for chemin in exports.result():
+            print("Export écrit :", chemin)
+        manifeste_exports.sauvegarder()
@@ -0,0 +1,304 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from statistiques import statistiques_descriptives
+
+# =============================
+# Quantiles approchés en flux (t-digest)
+# =============================
+# Une esquisse résume une colonne par des centroïdes (moyenne, poids) dont la
+# taille est bornée par la fonction d'échelle k1 du t-digest :
+#   k(q) = δ / (2π) · arcsin(2q − 1)
+# Un centroïde couvre au plus une unité de k, donc une fraction de rang
+# d'au plus 2π·√(q(1 − q)) / δ : l'erreur est très faible vers les extrêmes.
+# Les esquisses se fusionnent (blocs, processus) ; tant que l'effectif reste
+# sous `seuil_exact`, les valeurs sont conservées et les quantiles sont exacts.
+
+COMPRESSION = 500
+SEUIL_EXACT = 10000
+
+class EsquisseQuantiles:
+    """
+    Esquisse fusionnable des quantiles d'une série numérique.
+    """
+
+    def __init__(self, compression=COMPRESSION, seuil_exact=SEUIL_EXACT):
+        self.compression = compression
+        self.seuil_exact = seuil_exact
+        self.effectif = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.valeurs = []          # mode exact : blocs de valeurs conservés
+        self.centres = None        # mode approché : moyennes des centroïdes
+        self.poids = None          # mode approché : poids des centroïdes
+
+    @property
+    def exacte(self):
+        return self.centres is None
+
+    def ajouter(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float).ravel()
+        valeurs = valeurs[~np.isnan(valeurs)]
+        if not valeurs.size:
+            return
+        self.effectif += valeurs.size
+        self.minimum = min(self.minimum, valeurs.min())
+        self.maximum = max(self.maximum, valeurs.max())
+        if self.exacte:
+            self.valeurs.append(valeurs)
+            if self.effectif > self.seuil_exact:
+                self._passer_en_approche()
+        else:
+            self._compresser(valeurs, np.ones(valeurs.size))
+
+    def ajouter_constante(self, valeur, nombre):
+        """
+        Ajoute `nombre` fois la même valeur sans construire le tableau
+        (par exemple les 0 voix d'un candidat absent d'un bloc).
+        """
+        if nombre <= 0:
+            return
+        if self.exacte and self.effectif + nombre <= self.seuil_exact:
+            self.ajouter(np.full(nombre, valeur, dtype=float))
+            return
+        self.effectif += nombre
+        self.minimum = min(self.minimum, valeur)
+        self.maximum = max(self.maximum, valeur)
+        if self.exacte:
+            self._passer_en_approche()
+        self._compresser(np.array([float(valeur)]), np.array([float(nombre)]))
+
+    def fusionner(self, autre):
+        if not autre.effectif:
+            return
+        self.effectif += autre.effectif
+        self.minimum = min(self.minimum, autre.minimum)
+        self.maximum = max(self.maximum, autre.maximum)
+        if self.exacte and autre.exacte:
+            self.valeurs.extend(autre.valeurs)
+            if self.effectif > self.seuil_exact:
+                self._passer_en_approche()
+            return
+        if self.exacte:
+            self._passer_en_approche()
+        if autre.exacte:
+            centres, poids = np.concatenate(autre.valeurs), np.ones(autre.effectif)
+        else:
+            centres, poids = autre.centres, autre.poids
+        self._compresser(centres, poids)
+
+    def donnees(self):
+        """
+        Valeurs conservées (mode exact uniquement).
+        """
+        valeurs = np.concatenate(self.valeurs) if self.valeurs else np.empty(0)
+        self.valeurs = [valeurs]
+        return valeurs
+
+    def quantiles(self, probabilites):
+        """
+        Quantiles par interpolation linéaire (même convention que pandas).
+        """
+        probabilites = np.asarray(probabilites, dtype=float)
+        if not self.effectif:
+            return np.full(probabilites.shape, np.nan)
+        if self.exacte:
+            return np.quantile(self.donnees(), probabilites)
+        # Rang (0-indexé, au centre de chaque valeur) porté par chaque centroïde
+        rangs = np.cumsum(self.poids) - self.poids / 2
+        rangs = np.concatenate(([0.5], rangs, [self.effectif - 0.5]))
+        centres = np.concatenate(([self.minimum], self.centres, [self.maximum]))
+        return np.interp(probabilites * (self.effectif - 1) + 0.5, rangs, centres)
+
+    def erreur_rang(self, probabilites):
+        """
+        Borne de l'erreur sur le rang relatif du quantile (0 en mode exact).
+        """
+        probabilites = np.asarray(probabilites, dtype=float)
+        if self.exacte:
+            return np.zeros(probabilites.shape)
+        return 2 * np.pi * np.sqrt(probabilites * (1 - probabilites)) / self.compression
+
+    def ecart_absolu_moyen(self, moyenne):
+        if not self.effectif:
+            return np.nan
+        if self.exacte:
+            return np.abs(self.donnees() - moyenne).mean()
+        return (self.poids * np.abs(self.centres - moyenne)).sum() / self.effectif
+
+    def _passer_en_approche(self):
+        valeurs = self.donnees()
+        self.valeurs = []
+        self.centres, self.poids = np.empty(0), np.empty(0)
+        self._compresser(valeurs, np.ones(valeurs.size))
+
+    def _compresser(self, centres, poids):
+        centres = np.concatenate((self.centres, centres))
+        poids = np.concatenate((self.poids, poids))
+        if not centres.size:
+            self.centres, self.poids = centres, poids
+            return
+        ordre = np.argsort(centres, kind="stable")
+        centres, poids = centres[ordre], poids[ordre]
+
+        # Chaque point rejoint la case entière de k qui contient son rang médian
+        cumul = np.cumsum(poids)
+        q = np.clip((cumul - poids / 2) / cumul[-1], 0, 1)
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cases = np.floor(k - k[0]).astype(np.int64)
+
+        nouveaux_poids = np.bincount(cases, weights=poids)
+        garder = nouveaux_poids > 0
+        self.poids = nouveaux_poids[garder]
+        self.centres = np.bincount(cases, weights=poids * centres)[garder] / self.poids
+
+
+class StatistiquesFlux:
+    """
+    Paramètres statistiques de chaque colonne calculés bloc par bloc :
+    moments exacts (méthode de Chan) et quantiles par esquisses.
+    Deux instances se fusionnent, par exemple entre processus.
+    """
+
+    def __init__(self, compression=COMPRESSION, seuil_exact=SEUIL_EXACT):
+        self.compression = compression
+        self.seuil_exact = seuil_exact
+        self.lignes = 0
+        self.colonnes = []
+        self.indices = {}
+        self.effectifs = np.zeros(0)
+        self.moyennes = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.minimums = np.zeros(0)
+        self.maximums = np.zeros(0)
+        self.esquisses = []
+
+    def ajouter(self, tableau):
+        self._etendre(tableau.columns)
+        # Un candidat absent du bloc a 0 voix sur chacune de ses lignes, comme dans tableau_voix
+        valeurs = tableau.reindex(columns=self.colonnes, fill_value=0).to_numpy(dtype=float)
+        self.lignes += len(valeurs)
+
+        presentes = ~np.isnan(valeurs)
+        effectifs = presentes.sum(axis=0)
+        with np.errstate(invalid="ignore"):
+            sommes = np.where(presentes, valeurs, 0).sum(axis=0)
+            moyennes = np.where(effectifs > 0, sommes / np.maximum(effectifs, 1), 0)
+            m2 = (np.where(presentes, valeurs - moyennes, 0) ** 2).sum(axis=0)
+            minimums = np.nanmin(np.where(presentes, valeurs, np.inf), axis=0)
+            maximums = np.nanmax(np.where(presentes, valeurs, -np.inf), axis=0)
+        self._fusionner_moments(effectifs, moyennes, m2, minimums, maximums)
+
+        for j, esquisse in enumerate(self.esquisses):
+            esquisse.ajouter(valeurs[:, j])
+
+    def fusionner(self, autre):
+        """
+        Ajoute les statistiques d'une autre instance, colonne par colonne
+        (union des colonnes des deux instances). `autre` est complétée avec
+        les colonnes qui lui manquent.
+        """
+        self._etendre(autre.colonnes)
+        autre._etendre(self.colonnes)
+        ordre = [autre.indices[col] for col in self.colonnes]
+        self._fusionner_moments(
+            autre.effectifs[ordre], autre.moyennes[ordre], autre.m2[ordre],
+            autre.minimums[ordre], autre.maximums[ordre]
+        )
+        for esquisse, j in zip(self.esquisses, ordre):
+            esquisse.fusionner(autre.esquisses[j])
+        self.lignes += autre.lignes
+
+    def resultats(self, quantiles=(), arrondi=2):
+        """
+        Même table que `statistiques_descriptives`. Les colonnes restées en
+        mode exact sont calculées exactement ; pour les autres, médiane et
+        quantiles viennent des esquisses et le mode n'est pas disponible (NaN).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ecarts_types = np.where(self.effectifs < 2, np.nan, np.sqrt(self.m2 / (self.effectifs - 1)))
+        probabilites = [0.5, 0.25, 0.75, 0.1, 0.9] + list(quantiles)
+        q = np.array([esquisse.quantiles(probabilites) for esquisse in self.esquisses]).T
+
+        resultats = pd.DataFrame({
+            "Moyenne": self.moyennes,
+            "Médiane": q[0],
+            "Mode": np.nan,
+            "Écart-type": ecarts_types,
+            "Écart absolu moyen": [e.ecart_absolu_moyen(m) for e, m in zip(self.esquisses, self.moyennes)],
+            "Étendue": self.maximums - self.minimums,
+            "Interquartile": q[2] - q[1],
+            "Interdécile": q[4] - q[3],
+        }, index=self.colonnes)
+        for i, p in enumerate(quantiles):
+            resultats[f"Quantile {p}"] = q[5 + i]
+        resultats = resultats.round(arrondi)
+
+        exactes = [col for col, e in zip(self.colonnes, self.esquisses) if e.exacte]
+        if exactes:
+            series = {col: pd.Series(e.donnees()) for col, e in zip(self.colonnes, self.esquisses) if e.exacte}
+            resultats.loc[exactes] = statistiques_descriptives(pd.DataFrame(series), quantiles, arrondi)
+        return resultats
+
+    def _etendre(self, colonnes):
+        """
+        Ajoute les colonnes encore inconnues. Les lignes déjà vues y comptent
+        pour 0 (candidat sans voix), comme dans le chargement complet.
+        """
+        nouvelles = [col for col in colonnes if col not in self.indices]
+        if not nouvelles:
+            return
+        for col in nouvelles:
+            self.indices[col] = len(self.colonnes)
+            self.colonnes.append(col)
+            esquisse = EsquisseQuantiles(self.compression, self.seuil_exact)
+            esquisse.ajouter_constante(0.0, self.lignes)
+            self.esquisses.append(esquisse)
+        nombre = len(nouvelles)
+        self.effectifs = np.concatenate((self.effectifs, np.full(nombre, float(self.lignes))))
+        self.moyennes = np.concatenate((self.moyennes, np.zeros(nombre)))
+        self.m2 = np.concatenate((self.m2, np.zeros(nombre)))
+        self.minimums = np.concatenate((self.minimums, np.full(nombre, 0.0 if self.lignes else np.inf)))
+        self.maximums = np.concatenate((self.maximums, np.full(nombre, 0.0 if self.lignes else -np.inf)))
+
+    def _fusionner_moments(self, effectifs, moyennes, m2, minimums, maximums):
+        total = self.effectifs + effectifs
+        delta = moyennes - self.moyennes
+        with np.errstate(invalid="ignore", divide="ignore"):
+            part = np.where(total > 0, effectifs / np.maximum(total, 1), 0)
+        self.moyennes = self.moyennes + delta * part
+        self.m2 = self.m2 + m2 + delta ** 2 * self.effectifs * part
+        self.minimums = np.minimum(self.minimums, minimums)
+        self.maximums = np.maximum(self.maximums, maximums)
+        self.effectifs = total
+
+# =============================
+# Répartition des blocs sur plusieurs processus
+# =============================
+
+def resumer_bloc(tableau, compression=COMPRESSION, seuil_exact=SEUIL_EXACT):
+    flux = StatistiquesFlux(compression, seuil_exact)
+    flux.ajouter(tableau)
+    return flux
+
+def statistiques_en_parallele(blocs, nb_processus=None, compression=COMPRESSION, seuil_exact=SEUIL_EXACT):
+    """
+    Résume chaque bloc dans un processus et fusionne les résumés partiels
+    dans l'ordre des blocs. Au plus deux blocs par processus sont en attente,
+    la mémoire reste donc bornée.
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    resultat = StatistiquesFlux(compression, seuil_exact)
+    en_cours = deque()
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        for bloc in blocs:
+            en_cours.append(pool.submit(resumer_bloc, bloc, compression, seuil_exact))
+            if len(en_cours) >= 2 * nb_processus:
+                resultat.fusionner(en_cours.popleft().result())
+        while en_cours:
+            resultat.fusionner(en_cours.popleft().result())
+    return resultat
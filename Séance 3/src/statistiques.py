@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# =============================
+# Statistiques descriptives en un seul tri
+# =============================
+# Chaque colonne est triée une fois ; médiane, quartiles, déciles, mode et
+# étendue sont lus dans le tableau trié, les moments sont calculés sur les
+# mêmes valeurs. Les valeurs manquantes (NaN) sont rangées en fin de tri
+# et ignorées.
+
+QUANTILES_USUELS = {"Q1": 0.25, "Q3": 0.75, "D1": 0.1, "D9": 0.9}
+
+def trier_colonnes(tableau):
+    """
+    Trie chaque colonne d'un tableau numérique (NaN en fin de colonne).
+    Renvoie le tableau trié et le nombre de valeurs présentes par colonne.
+    """
+    valeurs = np.asarray(tableau, dtype=float)
+    tri = np.sort(valeurs, axis=0)
+    effectifs = np.count_nonzero(~np.isnan(valeurs), axis=0)
+    return tri, effectifs
+
+def quantiles_tries(tri, effectifs, probabilites):
+    """
+    Quantiles (interpolation linéaire, comme pandas) lus dans des colonnes
+    déjà triées. Renvoie un tableau (nombre de probabilités, nombre de colonnes).
+    """
+    probabilites = np.asarray(probabilites, dtype=float).reshape(-1, 1)
+    if tri.shape[0] == 0:
+        # Tableau vide : aucun quantile, comme pandas
+        return np.full((len(probabilites), tri.shape[1]), np.nan)
+    colonnes = np.arange(tri.shape[1])
+    positions = probabilites * (effectifs - 1)
+    bas = np.clip(np.floor(positions).astype(int), 0, max(tri.shape[0] - 1, 0))
+    haut = np.clip(bas + 1, 0, np.maximum(effectifs - 1, 0))
+    poids = positions - bas
+    resultat = tri[bas, colonnes] + poids * (tri[haut, colonnes] - tri[bas, colonnes])
+    resultat[:, effectifs == 0] = np.nan
+    return resultat
+
+def modes_tries(tri, effectifs):
+    """
+    Valeur la plus fréquente de chaque colonne triée (la plus petite en cas
+    d'égalité, comme `DataFrame.mode().iloc[0]`).
+    """
+    modes = np.full(tri.shape[1], np.nan)
+    for j, n in enumerate(effectifs):
+        if n == 0:
+            continue
+        colonne = tri[:n, j]
+        debuts = np.flatnonzero(np.r_[True, colonne[1:] != colonne[:-1]])
+        longueurs = np.diff(np.r_[debuts, n])
+        modes[j] = colonne[debuts[np.argmax(longueurs)]]
+    return modes
+
+def statistiques_descriptives(tableau, quantiles=(), arrondi=2):
+    """
+    Calcule la table des paramètres statistiques de chaque colonne (moyenne,
+    médiane, mode, écart-type, écart absolu moyen, étendue, distances
+    interquartile et interdécile) à partir d'un seul tri par colonne.
+    `quantiles` ajoute des colonnes « Quantile p » pour d'autres probabilités.
+    """
+    tri, effectifs = trier_colonnes(tableau)
+    presentes = ~np.isnan(tri)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        moyennes = np.where(presentes, tri, 0).sum(axis=0) / effectifs
+        ecarts = np.where(presentes, tri - moyennes, 0)
+        # Écart-type non défini pour moins de deux valeurs (NaN, comme pandas)
+        ecarts_types = np.where(effectifs < 2, np.nan, np.sqrt((ecarts ** 2).sum(axis=0) / (effectifs - 1)))
+        ecarts_absolus = np.abs(ecarts).sum(axis=0) / effectifs
+
+    probabilites = [0.5] + list(QUANTILES_USUELS.values()) + list(quantiles)
+    q = dict(zip(["Médiane"] + list(QUANTILES_USUELS) + [f"Quantile {p}" for p in quantiles],
+                 quantiles_tries(tri, effectifs, probabilites)))
+
+    if tri.shape[0] == 0:
+        etendues = np.full(tri.shape[1], np.nan)
+    else:
+        dernieres = np.maximum(effectifs - 1, 0)
+        etendues = tri[dernieres, np.arange(tri.shape[1])] - tri[0]
+
+    resultats = pd.DataFrame({
+        "Moyenne": moyennes,
+        "Médiane": q["Médiane"],
+        "Mode": modes_tries(tri, effectifs),
+        "Écart-type": ecarts_types,
+        "Écart absolu moyen": ecarts_absolus,
+        "Étendue": etendues,
+        "Interquartile": q["Q3"] - q["Q1"],
+        "Interdécile": q["D9"] - q["D1"],
+    }, index=getattr(tableau, "columns", None))
+    for p in quantiles:
+        resultats[f"Quantile {p}"] = q[f"Quantile {p}"]
+    return resultats.round(arrondi)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from discretisation import HistogrammeLogarithmique
+
+def test_valeurs_infinies_hors_classes():
+    histogramme = HistogrammeLogarithmique(par_decade=2)
+    histogramme.ajouter([1.0, 5.0, np.inf, -np.inf, np.nan, 0.0, 150.0])
+    histogramme.ajouter([np.inf])
+    assert histogramme.hors_classes == 5
+    assert histogramme.effectifs.sum() == 3
+    assert np.isclose(histogramme.bornes()[-1], 10.0 ** 2.5)
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from statistiques import statistiques_descriptives
+from quantiles_flux import SEUIL_EXACT, EsquisseQuantiles, StatistiquesFlux, statistiques_en_parallele
+
+# Blocs dont les candidats diffèrent : B n'apparaît qu'au deuxième bloc,
+# C est absent du deuxième bloc
+def blocs_candidats_differents():
+    rng = np.random.default_rng(0)
+    return [
+        pd.DataFrame({"Inscrits": rng.integers(100, 200, 5), "A": rng.integers(0, 50, 5), "C": rng.integers(0, 50, 5)}),
+        pd.DataFrame({"Inscrits": rng.integers(100, 200, 4), "B": rng.integers(0, 50, 4), "A": rng.integers(0, 50, 4)}),
+        pd.DataFrame({"Inscrits": rng.integers(100, 200, 6), "C": rng.integers(0, 50, 6), "B": rng.integers(0, 50, 6)}),
+    ]
+
+def tableau_complet(blocs):
+    # Chargement complet : un candidat absent d'un territoire a 0 voix
+    return pd.concat(blocs, ignore_index=True, sort=False).fillna(0)
+
+def test_candidats_differents_par_bloc():
+    blocs = blocs_candidats_differents()
+    attendu = statistiques_descriptives(tableau_complet(blocs))
+
+    flux = StatistiquesFlux()
+    for bloc in blocs:
+        flux.ajouter(bloc)
+    pd.testing.assert_frame_equal(flux.resultats().loc[attendu.index], attendu, check_dtype=False)
+
+def test_fusion_dans_les_deux_sens():
+    blocs = blocs_candidats_differents()
+    attendu = statistiques_descriptives(tableau_complet(blocs))
+
+    for ordre in (blocs, blocs[::-1]):
+        resultat = StatistiquesFlux()
+        for bloc in ordre:
+            partiel = StatistiquesFlux()
+            partiel.ajouter(bloc)
+            resultat.fusionner(partiel)
+        pd.testing.assert_frame_equal(resultat.resultats().loc[attendu.index], attendu, check_dtype=False)
+
+def test_fusion_entre_processus():
+    blocs = blocs_candidats_differents()
+    attendu = statistiques_descriptives(tableau_complet(blocs))
+    resultat = statistiques_en_parallele(iter(blocs), 2).resultats()
+    pd.testing.assert_frame_equal(resultat.loc[attendu.index], attendu, check_dtype=False)
+
+def test_candidats_differents_en_mode_approche():
+    # Au-delà du seuil exact, moyennes, écarts-types et étendues restent exacts
+    blocs = blocs_candidats_differents()
+    attendu = statistiques_descriptives(tableau_complet(blocs))
+    flux = StatistiquesFlux(seuil_exact=3)
+    for bloc in blocs:
+        flux.ajouter(bloc)
+    resultat = flux.resultats().loc[attendu.index]
+    for colonne in ("Moyenne", "Écart-type", "Étendue"):
+        pd.testing.assert_series_equal(resultat[colonne], attendu[colonne], check_dtype=False)
+
+def erreurs_rang(esquisse, valeurs, probabilites):
+    # Distance entre p et l'intervalle des rangs relatifs du quantile estimé
+    triees = np.sort(valeurs)
+    estimes = esquisse.quantiles(probabilites)
+    bas = np.searchsorted(triees, estimes, side="left") / len(triees)
+    haut = np.searchsorted(triees, estimes, side="right") / len(triees)
+    return np.maximum(0, np.maximum(bas - probabilites, probabilites - haut))
+
+def test_quantiles_approches_dans_la_borne():
+    rng = np.random.default_rng(0)
+    probabilites = np.linspace(0, 1, 201)
+    n = 5 * SEUIL_EXACT
+    for valeurs in (rng.normal(size=n), rng.lognormal(0, 2, size=n)):
+        blocs = np.array_split(valeurs, 37)
+        # Par blocs successifs, et par fusion de deux esquisses
+        esquisse = EsquisseQuantiles()
+        for bloc in blocs:
+            esquisse.ajouter(bloc)
+        premiere, seconde = EsquisseQuantiles(), EsquisseQuantiles()
+        for bloc in blocs[:20]:
+            premiere.ajouter(bloc)
+        for bloc in blocs[20:]:
+            seconde.ajouter(bloc)
+        premiere.fusionner(seconde)
+
+        for resultat in (esquisse, premiere):
+            assert not resultat.exacte
+            erreurs = erreurs_rang(resultat, valeurs, probabilites)
+            # Borne documentée, à un rang près (valeurs discrètes de l'échantillon)
+            assert (erreurs <= resultat.erreur_rang(probabilites) + 1 / n).all()
+            assert erreurs.max() < 2e-3
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from statistiques import statistiques_descriptives
+
+def test_moins_de_deux_valeurs():
+    tableau = pd.DataFrame({"Vide": [np.nan, np.nan], "Une": [1.0, np.nan], "Deux": [1.0, 3.0]})
+    resultats = statistiques_descriptives(tableau)
+    pd.testing.assert_series_equal(resultats["Écart-type"], tableau.std().round(2), check_names=False)
+    assert resultats.loc["Vide"].isna().all()
+
+def test_tableau_vide():
+    tableau = pd.DataFrame({"A": [], "B": []}, dtype=float)
+    resultats = statistiques_descriptives(tableau, quantiles=(0.05,))
+    assert list(resultats.index) == ["A", "B"]
+    assert resultats.isna().all().all()
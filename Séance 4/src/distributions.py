@@ -0,0 +1,213 @@
+import os
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import scipy
+from scipy.stats import uniform, randint, binom, poisson, zipf, norm, lognorm, chi2, pareto
+
+# -----------------------------
+# Évaluation des lois (sans tracé)
+# -----------------------------
+# Chaque loi est une fonction f(x, *paramètres) qui renvoie la PMF (lois
+# discrètes) ou la PDF (lois continues) sur le support x. Les paramètres
+# sont dans le même ordre que dans les fonctions de main.py.
+
+LAWS = {
+    "dirac": lambda x, a: (x == a).astype(float),
+    "uniform_discrete": lambda x, n: np.where((x >= 0) & (x < n), 1 / n, 0.0),
+    "binomial": lambda x, n, p: binom.pmf(x, n, p),
+    "poisson": lambda x, lam: poisson.pmf(x, lam),
+    "zipf": lambda x, a: zipf.pmf(x, a),
+    "normal": lambda x, mu, sigma: norm.pdf(x, mu, sigma),
+    "lognormal": lambda x, mean, sigma: lognorm.pdf(x, sigma, scale=np.exp(mean)),
+    "uniform_continuous": lambda x, a, b: uniform.pdf(x, a, b - a),
+    "chi2": lambda x, df: chi2.pdf(x, df),
+    "pareto": lambda x, alpha: pareto.pdf(x, alpha),
+}
+
+DISCRETE_LAWS = ("dirac", "uniform_discrete", "binomial", "poisson", "zipf")
+
+# Lois SciPy « figées » correspondantes (support, médiane, quantiles, tirages…)
+FROZEN_LAWS = {
+    "dirac": lambda a: randint(a, a + 1),
+    "uniform_discrete": lambda n: randint(0, n),
+    "binomial": lambda n, p: binom(n, p),
+    "poisson": lambda lam: poisson(lam),
+    "zipf": lambda a: zipf(a),
+    "normal": lambda mu, sigma: norm(mu, sigma),
+    "lognormal": lambda mean, sigma: lognorm(sigma, scale=np.exp(mean)),
+    "uniform_continuous": lambda a, b: uniform(a, b - a),
+    "chi2": lambda df: chi2(df),
+    "pareto": lambda alpha: pareto(alpha),
+}
+
+# -----------------------------
+# Cache des évaluations
+# -----------------------------
+# Clé : (loi, paramètres, grille du support), hachée en SHA-256 avec la
+# version de SciPy. Premier niveau en mémoire avec éviction LRU (nombre
+# d'entrées et taille totale bornés), second niveau facultatif sur disque
+# (fichiers .npy relus par projection mémoire). Les tableaux renvoyés sont
+# en lecture seule : ils sont partagés entre tous les appelants.
+
+CACHE_VERSION = 1
+
+def evaluation_key(law, params, support):
+    h = hashlib.sha256()
+    h.update(f"{CACHE_VERSION}|{scipy.__version__}|{law}".encode())
+    for value in (support,) + tuple(params):
+        value = np.asarray(value)
+        h.update(str(value.dtype).encode())
+        h.update(str(value.shape).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    return h.hexdigest()
+
+
+class DistributionCache:
+
+    def __init__(self, max_entries=256, max_bytes=64 << 20, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key, compute):
+        """
+        Renvoie le tableau associé à `key`, calculé par `compute()` au besoin.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+
+        values = self._load(key)
+        if values is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            values = np.array(compute(), dtype=float)
+            values.setflags(write=False)
+            self._save(key, values)
+
+        with self.lock:
+            self._insert(key, values)
+        return values
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def _insert(self, key, values):
+        if key in self.entries:
+            return
+        self.entries[key] = values
+        self.size += values.nbytes
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.nbytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def _load(self, key):
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            # mmap_mode="r" : tableau en lecture seule, pages lues à la demande
+            return np.load(self._path(key), mmap_mode="r")
+        except (OSError, ValueError):
+            return None  # fichier abîmé : la loi est réévaluée
+
+    def _save(self, key, values):
+        if not self.directory:
+            return
+        temporary = self._path(key) + ".tmp"
+        try:
+            with open(temporary, "wb") as f:
+                np.save(f, values)
+            os.replace(temporary, self._path(key))
+        except OSError as error:
+            print(f"Cache des lois non écrit : {error}")
+
+
+# Cache partagé par défaut ; CACHE_LOIS_DOSSIER active le niveau disque
+DEFAULT_CACHE = DistributionCache(
+    max_entries=int(os.environ.get("CACHE_LOIS_TAILLE", 256)),
+    directory=os.environ.get("CACHE_LOIS_DOSSIER") or None,
+)
+
+def evaluate(law, params, support, cache=DEFAULT_CACHE):
+    """
+    PMF/PDF de `law` avec les paramètres `params` sur `support`, en lecture seule.
+    `cache=None` désactive le cache.
+    """
+    if law not in LAWS:
+        raise ValueError(f"Loi inconnue : {law}")
+    support = np.asarray(support)
+    compute = lambda: LAWS[law](support, *params)
+    if cache is None:
+        values = np.array(compute(), dtype=float)
+        values.setflags(write=False)
+        return values
+    return cache.get(evaluation_key(law, params, support), compute)
+
+# -----------------------------
+# Balayage de paramètres
+# -----------------------------
+# Toutes les courbes d'un balayage sont évaluées en un seul appel diffusé
+# (broadcasting) : paramètres en colonne (k, 1), support en ligne (1, m).
+
+def law_parameters(law):
+    """
+    Noms des paramètres d'une loi, dans l'ordre de LAWS.
+    """
+    return list(inspect.signature(LAWS[law]).parameters)[1:]
+
+def sweep(law, support, grid=True, cache=DEFAULT_CACHE, **params):
+    """
+    PMF/PDF de `law` pour de nombreux jeux de paramètres, par exemple
+    sweep("binomial", np.arange(21), n=[10, 20], p=np.linspace(0.1, 0.9, 9)).
+    grid=True : toutes les combinaisons (produit cartésien) ; grid=False : les
+    tableaux sont diffusés ensemble, élément par élément.
+    Renvoie un DataFrame (une ligne par jeu de paramètres, une colonne par
+    valeur du support), indexé par les paramètres.
+    """
+    names = law_parameters(law)
+    if sorted(params) != sorted(names):
+        raise ValueError(f"Paramètres attendus pour {law} : {', '.join(names)}")
+
+    values = [np.asarray(params[name]).ravel() for name in names]
+    if grid:
+        values = [v.ravel() for v in np.meshgrid(*values, indexing="ij")]
+    else:
+        values = [v.ravel() for v in np.broadcast_arrays(*values)]
+
+    support = np.asarray(support)
+    curves = evaluate(law, [v[:, None] for v in values], support[None, :], cache=cache)
+    return pd.DataFrame(
+        curves,
+        index=pd.MultiIndex.from_arrays(values, names=names),
+        columns=pd.Index(support, name="x"),
+    )
@@ -1,7 +1,10 @@
 import os
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import uniform, binom, poisson, zipf, norm, lognorm, chi2, pareto
+
+from distributions import evaluate, sweep, FROZEN_LAWS
+from moments import moments_table, ANALYTIC_MOMENTS
+from sampling import streaming_histogram
 
 # -----------------------------
 # Création du dossier images
@@ -10,6 +13,9 @@ from scipy.stats import uniform, binom, poisson, zipf, norm, lognorm, chi2, pare
 IMAGE_DIR = "images"
 os.makedirs(IMAGE_DIR, exist_ok=True)
 
+# Processus pour les simulations (les tirages ne dépendent pas de ce nombre)
+NB_PROCESSUS = int(os.environ.get("NB_PROCESSUS", 1))
+
 # -----------------------------
 # Fonctions de tracé
 # -----------------------------
@@ -39,126 +45,167 @@ def plot_continuous_distribution(x, pdf, title, filename):
 # -----------------------------
 # Lois discrètes
 # -----------------------------
-
-def dirac_distribution(a=0, x_range=np.arange(-5, 6)):
-    pmf = np.zeros_like(x_range, dtype=float)
-    pmf[x_range == a] = 1.0
-    plot_discrete_distribution(
-        x_range, pmf,
-        f"Loi dégénérée (Dirac discret) en {a}",
-        "dirac.png"
-    )
+# Les valeurs viennent du cache de distributions.py (tableaux en lecture
+# seule) ; plot=False évite le tracé, pour les appels répétés.
+
+def dirac_distribution(a=0, x_range=np.arange(-5, 6), plot=True):
+    pmf = evaluate("dirac", (a,), x_range)
+    if plot:
+        plot_discrete_distribution(
+            x_range, pmf,
+            f"Loi dégénérée (Dirac discret) en {a}",
+            "dirac.png"
+        )
     return x_range, pmf
 
-def uniform_discrete(n=10):
+def uniform_discrete(n=10, plot=True):
     x = np.arange(n)
-    pmf = np.ones(n) / n
-    plot_discrete_distribution(
-        x, pmf,
-        "Loi uniforme discrète",
-        "uniforme_discrete.png"
-    )
+    pmf = evaluate("uniform_discrete", (n,), x)
+    if plot:
+        plot_discrete_distribution(
+            x, pmf,
+            "Loi uniforme discrète",
+            "uniforme_discrete.png"
+        )
     return x, pmf
 
-def binomial_distribution(n=20, p=0.4):
+def binomial_distribution(n=20, p=0.4, plot=True):
     x = np.arange(n + 1)
-    pmf = binom.pmf(x, n, p)
-    plot_discrete_distribution(
-        x, pmf,
-        "Loi binomiale",
-        "binomiale.png"
-    )
+    pmf = evaluate("binomial", (n, p), x)
+    if plot:
+        plot_discrete_distribution(
+            x, pmf,
+            "Loi binomiale",
+            "binomiale.png"
+        )
     return x, pmf
 
-def poisson_distribution(lam=5):
+def poisson_distribution(lam=5, plot=True):
     x = np.arange(0, 20)
-    pmf = poisson.pmf(x, lam)
-    plot_discrete_distribution(
-        x, pmf,
-        "Loi de Poisson",
-        "poisson.png"
-    )
+    pmf = evaluate("poisson", (lam,), x)
+    if plot:
+        plot_discrete_distribution(
+            x, pmf,
+            "Loi de Poisson",
+            "poisson.png"
+        )
     return x, pmf
 
-def zipf_distribution(a=2.0, size=20):
+def zipf_distribution(a=2.0, size=20, plot=True):
     x = np.arange(1, size + 1)
-    pmf = zipf.pmf(x, a)
-    plot_discrete_distribution(
-        x, pmf,
-        "Loi de Zipf",
-        "zipf.png"
-    )
+    pmf = evaluate("zipf", (a,), x)
+    if plot:
+        plot_discrete_distribution(
+            x, pmf,
+            "Loi de Zipf",
+            "zipf.png"
+        )
     return x, pmf
 
 # -----------------------------
 # Lois continues
 # -----------------------------
 
-def normal_distribution(mu=0, sigma=1):
+def normal_distribution(mu=0, sigma=1, plot=True):
     x = np.linspace(mu - 4*sigma, mu + 4*sigma, 400)
-    pdf = norm.pdf(x, mu, sigma)
-    plot_continuous_distribution(
-        x, pdf,
-        "Loi normale",
-        "normale.png"
-    )
+    pdf = evaluate("normal", (mu, sigma), x)
+    if plot:
+        plot_continuous_distribution(
+            x, pdf,
+            "Loi normale",
+            "normale.png"
+        )
     return x, pdf
 
-def lognormal_distribution(mean=0, sigma=1):
+def lognormal_distribution(mean=0, sigma=1, plot=True):
     x = np.linspace(0.001, 10, 400)
-    pdf = lognorm.pdf(x, sigma, scale=np.exp(mean))
-    plot_continuous_distribution(
-        x, pdf,
-        "Loi log-normale",
-        "lognormale.png"
-    )
+    pdf = evaluate("lognormal", (mean, sigma), x)
+    if plot:
+        plot_continuous_distribution(
+            x, pdf,
+            "Loi log-normale",
+            "lognormale.png"
+        )
     return x, pdf
 
-def uniform_continuous(a=0, b=1):
+def uniform_continuous(a=0, b=1, plot=True):
     x = np.linspace(a, b, 400)
-    pdf = uniform.pdf(x, a, b - a)
-    plot_continuous_distribution(
-        x, pdf,
-        "Loi uniforme continue",
-        "uniforme_continue.png"
-    )
+    pdf = evaluate("uniform_continuous", (a, b), x)
+    if plot:
+        plot_continuous_distribution(
+            x, pdf,
+            "Loi uniforme continue",
+            "uniforme_continue.png"
+        )
     return x, pdf
 
-def chi2_distribution(df=3):
+def chi2_distribution(df=3, plot=True):
     x = np.linspace(0, 20, 400)
-    pdf = chi2.pdf(x, df)
-    plot_continuous_distribution(
-        x, pdf,
-        "Loi du Chi²",
-        "chi2.png"
-    )
+    pdf = evaluate("chi2", (df,), x)
+    if plot:
+        plot_continuous_distribution(
+            x, pdf,
+            "Loi du Chi²",
+            "chi2.png"
+        )
     return x, pdf
 
-def pareto_distribution(alpha=3):
+def pareto_distribution(alpha=3, plot=True):
     x = np.linspace(1, 10, 400)
-    pdf = pareto.pdf(x, alpha)
-    plot_continuous_distribution(
-        x, pdf,
-        "Loi de Pareto",
-        "pareto.png"
-    )
+    pdf = evaluate("pareto", (alpha,), x)
+    if plot:
+        plot_continuous_distribution(
+            x, pdf,
+            "Loi de Pareto",
+            "pareto.png"
+        )
     return x, pdf
 
 # -----------------------------
 # Moyenne et écart-type (discret)
 # -----------------------------
 
+# p peut être un tableau (nombre de jeux de paramètres, taille du support),
+# par exemple le résultat de sweep() : un résultat par ligne.
+
 def compute_mean(x, p):
-    return np.sum(x * p)
+    return np.sum(np.asarray(x) * np.asarray(p), axis=-1)
 
 def compute_std(x, p):
+    x, p = np.asarray(x), np.asarray(p)
     mean = compute_mean(x, p)
-    return np.sqrt(np.sum(p * (x - mean) ** 2))
+    return np.sqrt(np.sum(p * (x - np.expand_dims(mean, -1)) ** 2, axis=-1))
+
+# -----------------------------
+# Paramètres par défaut des dix lois (ceux des fonctions ci-dessus)
+# -----------------------------
+
+DEFAULT_PARAMETERS = {
+    "dirac": (0,),
+    "uniform_discrete": (10,),
+    "binomial": (20, 0.4),
+    "poisson": (5,),
+    "zipf": (2.0,),
+    "normal": (0, 1),
+    "lognormal": (0, 1),
+    "uniform_continuous": (0, 1),
+    "chi2": (3,),
+    "pareto": (3,),
+}
 
 # -----------------------------
 # Exécution
 # -----------------------------
 
+def compare_moment(empirical, analytic):
+    """
+    « empirique / théorique » ; un moment théorique infini ou non défini
+    n'a pas de valeur empirique limite : il est signalé comme non défini.
+    """
+    if not np.isfinite(analytic):
+        return "non défini (moment infini)" if np.isinf(analytic) else "non défini"
+    return f"{empirical:.4f} / {analytic:.4f}"
+
 if __name__ == "__main__":
     dirac_distribution()
     uniform_discrete()
@@ -174,3 +221,22 @@ if __name__ == "__main__":
     print("Moyenne binomiale :", compute_mean(x, p))
     print("Écart-type binomial :", compute_std(x, p))
 
+    # Sensibilité de la loi binomiale à p (n = 20) : un seul appel pour toutes les courbes
+    curves = sweep("binomial", x, n=[20], p=np.linspace(0.1, 0.9, 9))
+    print("Moyennes binomiales selon p :", np.round(compute_mean(x, curves), 6).tolist())
+    print("Écarts-types binomiaux selon p :", np.round(compute_std(x, curves), 6).tolist())
+
+    # Moments des dix lois : formes closes et calcul numérique (voir moments.py)
+    for law, params in DEFAULT_PARAMETERS.items():
+        print(f"\nMoments de la loi {law} {params} :")
+        print(moments_table(law, *params))
+
+    # Simulations : 10⁶ tirages par loi, classés en flux (voir sampling.py)
+    print("\nSimulations (10⁶ tirages) : moyenne et variance empiriques / théoriques")
+    for law, params in DEFAULT_PARAMETERS.items():
+        low, high = FROZEN_LAWS[law](*params).ppf([0.001, 0.999])
+        histogram = streaming_histogram(
+            law, params, 10 ** 6, np.linspace(low, high, 51), seed=2024, workers=NB_PROCESSUS
+        )
+        mean, var = ANALYTIC_MOMENTS[law](*params)[:2]
+        print(f"{law} : {compare_moment(histogram.mean, mean)}, {compare_moment(histogram.var(), var)}")
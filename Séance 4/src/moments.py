@@ -0,0 +1,218 @@
+import math
+import numpy as np
+import pandas as pd
+from scipy.integrate import quad_vec
+from scipy.special import comb, zeta
+
+from distributions import DISCRETE_LAWS, FROZEN_LAWS
+
+# -----------------------------
+# Moments théoriques (formes closes)
+# -----------------------------
+# Moyenne, variance, asymétrie et aplatissement (excès de kurtosis, 0 pour la
+# loi normale). Un moment infini vaut np.inf, un moment non défini np.nan.
+
+def _from_raw(raw):
+    """
+    Moyenne, variance, asymétrie, aplatissement à partir des moments bruts
+    E[X], E[X²], E[X³], E[X⁴] (infinis au-delà de l'ordre fini le plus élevé).
+    """
+    m1, m2, m3, m4 = raw
+    mean = m1
+    var = m2 - m1 ** 2 if np.isfinite(m2) else np.inf
+    if not np.isfinite(m3):
+        return mean, var, np.inf, np.inf
+    mu3 = m3 - 3 * m1 * m2 + 2 * m1 ** 3
+    skew = mu3 / var ** 1.5
+    if not np.isfinite(m4):
+        return mean, var, skew, np.inf
+    mu4 = m4 - 4 * m1 * m3 + 6 * m1 ** 2 * m2 - 3 * m1 ** 4
+    return mean, var, skew, mu4 / var ** 2 - 3
+
+def _uniform_discrete(n):
+    # n = 1 : loi de Dirac en 0, asymétrie et aplatissement non définis
+    if n == 1:
+        return 0.0, 0.0, np.nan, np.nan
+    return (n - 1) / 2, (n ** 2 - 1) / 12, 0.0, -6 * (n ** 2 + 1) / (5 * (n ** 2 - 1))
+
+def _zipf(a):
+    raw = [zeta(a - k) / zeta(a) if a > k + 1 else np.inf for k in range(1, 5)]
+    return _from_raw(raw)
+
+def _pareto(alpha):
+    raw = [alpha / (alpha - k) if alpha > k else np.inf for k in range(1, 5)]
+    return _from_raw(raw)
+
+def _lognormal(mean, sigma):
+    e = np.exp(sigma ** 2)
+    return (
+        np.exp(mean + sigma ** 2 / 2),
+        (e - 1) * np.exp(2 * mean + sigma ** 2),
+        (e + 2) * np.sqrt(e - 1),
+        e ** 4 + 2 * e ** 3 + 3 * e ** 2 - 6,
+    )
+
+ANALYTIC_MOMENTS = {
+    "dirac": lambda a: (a, 0.0, np.nan, np.nan),
+    "uniform_discrete": _uniform_discrete,
+    "binomial": lambda n, p: (
+        n * p, n * p * (1 - p), (1 - 2 * p) / np.sqrt(n * p * (1 - p)), (1 - 6 * p * (1 - p)) / (n * p * (1 - p))
+    ),
+    "poisson": lambda lam: (lam, lam, lam ** -0.5, 1 / lam),
+    "zipf": _zipf,
+    "normal": lambda mu, sigma: (mu, sigma ** 2, 0.0, 0.0),
+    "lognormal": _lognormal,
+    "uniform_continuous": lambda a, b: ((a + b) / 2, (b - a) ** 2 / 12, 0.0, -6 / 5),
+    "chi2": lambda df: (df, 2 * df, np.sqrt(8 / df), 12 / df),
+    "pareto": _pareto,
+}
+
+def finite_order(law, params):
+    """
+    Ordre maximal (jusqu'à 4) des moments finis de la loi.
+    """
+    if law == "zipf":
+        return min(4, int(math.ceil(params[0] - 1)) - 1)
+    if law == "pareto":
+        return min(4, int(math.ceil(params[0])) - 1)
+    return 4
+
+# -----------------------------
+# Moments numériques
+# -----------------------------
+# Les moments de X − c (c : médiane) sont calculés en un seul passage sur le
+# support : sommes compensées (math.fsum) pour les lois discrètes, quadrature
+# adaptative vectorisée (les quatre moments ensemble) pour les lois continues.
+# Le décalage c évite les pertes de précision par compensation quand la
+# moyenne est grande devant l'écart-type. Pour les supports infinis à queue
+# lourde, la troncature est choisie pour que sa borne d'erreur reste sous
+# `tol` (dans la limite de `max_terms` termes pour les lois discrètes).
+
+# Nombre maximal de sous-intervalles de la quadrature : au-delà, le bruit
+# d'arrondi domine et l'erreur estimée est renvoyée telle quelle
+QUADRATURE_LIMIT = 500
+
+def _poisson_tail(lam, last, orders):
+    # Pour x > last > lam, les termes x^k p(x) décroissent au moins
+    # géométriquement, de raison (lam / (last + 2)) · ((last + 2) / (last + 1))^k
+    x = float(last + 1)
+    term = x ** orders * FROZEN_LAWS["poisson"](lam).pmf(x)
+    ratio = lam / (last + 2) * ((last + 2) / (last + 1)) ** orders
+    return term / (1 - ratio)
+
+def _zipf_tail(a, last, orders):
+    # Σ_{x>last} x^(k−a) ≤ ∫_last^∞ x^(k−a) dx (fonction décroissante)
+    return float(last) ** (orders - a + 1) / (a - orders - 1) / zeta(a)
+
+def _zipf_correction(a, last, c, orders):
+    # Estimation de la queue par ∫_{last+1/2}^∞ (x − c)^k x^(−a) dx / ζ(a)
+    # (règle du point milieu), développée par la formule du binôme ; elle est
+    # comprise entre 0 et la borne, qui reste donc valable après correction
+    start = last + 0.5
+    correction = np.zeros(len(orders))
+    for k in orders:
+        for j in range(k + 1):
+            correction[k] += comb(k, j, exact=True) * (-c) ** (k - j) * start ** (j - a + 1) / (a - j - 1)
+    return correction / zeta(a)
+
+def _discrete_sums(law, params, c, tol, max_terms, orders):
+    dist = FROZEN_LAWS[law](*params)
+    low, high = dist.support()
+    if np.isfinite(high):
+        last, bounds = int(high), np.zeros(len(orders))
+    elif law == "poisson":
+        lam = params[0]
+        last = int(lam + 20 * math.sqrt(lam) + 30)
+        bounds = _poisson_tail(lam, last, orders)
+    else:
+        a, k = params[0], orders[-1]
+        last = (tol * (a - k - 1) * zeta(a)) ** (1 / (k - a + 1))
+        last = int(min(max(last, 100), max_terms))
+        bounds = _zipf_tail(a, last, orders)
+
+    x = np.arange(int(low), last + 1, dtype=float)
+    p = dist.pmf(x)
+    d = x - c
+    sums, power = [], p
+    for _ in orders:
+        sums.append(math.fsum(power))
+        power = power * d
+    sums = np.array(sums)
+    if law == "zipf":
+        sums += _zipf_correction(params[0], last, c, orders)
+    return sums, bounds
+
+def _continuous_sums(law, params, c, tol, orders):
+    dist = FROZEN_LAWS[law](*params)
+    low, high = dist.support()
+    if law != "pareto":
+        # Variable réduite t = (x − c) / s (s : écart interquartile) : la
+        # quadrature ne dépend ni de la position ni de l'échelle de la loi
+        s = float(dist.ppf(0.75) - dist.ppf(0.25))
+        integrand = lambda t: dist.pdf(c + s * t) * s * (s * t) ** orders
+        if not np.isfinite(low):
+            sums, error = quad_vec(integrand, (low - c) / s, (high - c) / s, epsabs=tol, epsrel=tol, limit=QUADRATURE_LIMIT)
+            return sums, np.full(len(orders), error)
+        # Bord inférieur fini, où la densité peut être infinie (χ² à moins de
+        # 2 degrés de liberté) : le morceau [low, c] est intégré en w, avec
+        # x = low + s·w², ce qui atténue la singularité en low ; x est calculé
+        # à partir de low (et non de t) pour ne pas retomber sur low par arrondi
+        edge = lambda w: dist.pdf(low + s * w ** 2) * 2 * s * w * (low + s * w ** 2 - c) ** orders
+        sums, error = quad_vec(edge, 0, np.sqrt((c - low) / s), epsabs=tol, epsrel=tol, limit=QUADRATURE_LIMIT)
+        rest, rest_error = quad_vec(integrand, 0, (high - c) / s, epsabs=tol, epsrel=tol, limit=QUADRATURE_LIMIT)
+        return sums + rest, np.full(len(orders), error + rest_error)
+
+    # Pareto : troncature en T, intégration en u = ln x ; la queue
+    # ∫_T^∞ (x − c)^k α x^(−α−1) dx est ajoutée sous forme exacte (binôme)
+    alpha, k = params[0], orders[-1]
+    top = min((tol * (alpha - k) / alpha) ** (1 / (k - alpha)), 1e15)
+    integrand = lambda u: dist.pdf(np.exp(u)) * np.exp(u) * (np.exp(u) - c) ** orders
+    sums, error = quad_vec(integrand, 0, np.log(top), epsabs=tol, epsrel=tol, limit=QUADRATURE_LIMIT)
+    for k in orders:
+        for j in range(k + 1):
+            sums[k] += alpha * comb(k, j, exact=True) * (-c) ** (k - j) * top ** (j - alpha) / (alpha - j)
+    return sums, np.full(len(orders), error)
+
+def numerical_moments(law, params, tol=1e-12, max_terms=10 ** 6):
+    """
+    Moyenne, variance, asymétrie, aplatissement calculés numériquement, et
+    bornes d'erreur sur les moments décalés E[(X − c)^k], k = 1…4.
+    """
+    c = float(FROZEN_LAWS[law](*params).median())
+    # Seuls les moments finis sont calculés ; les autres valent np.inf
+    orders = np.arange(finite_order(law, params) + 1)
+    if law in DISCRETE_LAWS:
+        sums, bounds = _discrete_sums(law, params, c, tol, max_terms, orders)
+    else:
+        sums, bounds = _continuous_sums(law, params, c, tol, orders)
+
+    # Moments de X − c normalisés par la masse calculée (troncature)
+    e = np.full(5, np.inf)
+    e[orders] = sums / sums[0]
+    bounds = np.concatenate((bounds, np.full(5 - len(orders), np.inf)))
+
+    order = orders[-1]
+    d1 = e[1]
+    mean = c + d1 if order >= 1 else np.inf
+    var = e[2] - d1 ** 2 if order >= 2 else np.inf
+    with np.errstate(invalid="ignore", divide="ignore"):
+        skew = (e[3] - 3 * d1 * e[2] + 2 * d1 ** 3) / var ** 1.5 if order >= 3 else np.inf
+        kurt = (e[4] - 4 * d1 * e[3] + 6 * d1 ** 2 * e[2] - 3 * d1 ** 4) / var ** 2 - 3 if order >= 4 else np.inf
+    return (mean, var, skew, kurt), bounds[1:]
+
+def moments_table(law, *params, tol=1e-12):
+    """
+    Valeurs analytiques et numériques des quatre moments d'une loi, leur
+    écart et la borne d'erreur numérique du moment d'ordre correspondant.
+    """
+    analytic = np.array(ANALYTIC_MOMENTS[law](*params), dtype=float)
+    numerical, bounds = numerical_moments(law, params, tol)
+    numerical = np.array(numerical, dtype=float)
+    with np.errstate(invalid="ignore"):
+        gap = np.where(analytic == numerical, 0.0, np.abs(analytic - numerical))
+    return pd.DataFrame({
+        "Analytique": analytic,
+        "Numérique": numerical,
+        "Écart": gap,
+        "Borne (ordre k)": bounds,
+    }, index=["Moyenne", "Variance", "Asymétrie", "Aplatissement"])
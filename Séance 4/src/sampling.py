@@ -0,0 +1,156 @@
+import os
+import multiprocessing as mp
+
+import numpy as np
+
+from distributions import DISCRETE_LAWS
+
+# -----------------------------
+# Tirages aléatoires des dix lois
+# -----------------------------
+# Mêmes paramètres que LAWS (distributions.py). La loi de Pareto de SciPy
+# (support x ≥ 1) est la loi de Lomax de NumPy décalée de 1.
+
+SAMPLERS = {
+    "dirac": lambda rng, size, a: np.full(size, a, dtype=np.int64),
+    "uniform_discrete": lambda rng, size, n: rng.integers(0, n, size),
+    "binomial": lambda rng, size, n, p: rng.binomial(n, p, size),
+    "poisson": lambda rng, size, lam: rng.poisson(lam, size),
+    "zipf": lambda rng, size, a: rng.zipf(a, size),
+    "normal": lambda rng, size, mu, sigma: rng.normal(mu, sigma, size),
+    "lognormal": lambda rng, size, mean, sigma: rng.lognormal(mean, sigma, size),
+    "uniform_continuous": lambda rng, size, a, b: rng.uniform(a, b, size),
+    "chi2": lambda rng, size, df: rng.chisquare(df, size),
+    "pareto": lambda rng, size, alpha: rng.pareto(alpha, size) + 1,
+}
+
+# -----------------------------
+# Découpage reproductible
+# -----------------------------
+# Les N tirages sont découpés en blocs de taille fixe et chaque bloc reçoit
+# son propre flux, engendré par SeedSequence(seed).spawn(...). Le résultat
+# dépend donc de la graine et de la taille des blocs, jamais du nombre de
+# processus ni de l'ordre dans lequel ils traitent les blocs.
+
+BLOCK_SIZE = 1 << 20
+
+def blocks(n, block_size=BLOCK_SIZE, seed=0):
+    """
+    Liste des (début, fin, SeedSequence) de chaque bloc.
+    """
+    starts = list(range(0, n, block_size))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    return [(start, min(start + block_size, n), s) for start, s in zip(starts, seeds)]
+
+def draw_block(law, params, start, stop, seed_sequence):
+    rng = np.random.default_rng(seed_sequence)
+    return SAMPLERS[law](rng, stop - start, *params)
+
+def _pool(workers, initializer=None, initargs=()):
+    return mp.Pool(workers or os.cpu_count() or 1, initializer=initializer, initargs=initargs)
+
+# -----------------------------
+# Échantillon complet en mémoire partagée
+# -----------------------------
+# Le tableau résultat est alloué une fois (multiprocessing.RawArray, sans
+# verrou) ; chaque processus écrit ses blocs directement à leur place.
+
+_shared = {}
+
+def _attach(buffer, dtype):
+    _shared["out"] = np.frombuffer(buffer, dtype=dtype)
+
+def _fill_block(task):
+    law, params, start, stop, seed_sequence = task
+    _shared["out"][start:stop] = draw_block(law, params, start, stop, seed_sequence)
+
+def sample(law, params, n, seed=0, workers=None, block_size=BLOCK_SIZE):
+    """
+    N tirages de `law` (entiers pour les lois discrètes, réels sinon),
+    identiques quel que soit `workers` (1 : sans processus).
+    """
+    if law not in SAMPLERS:
+        raise ValueError(f"Loi inconnue : {law}")
+    dtype = np.int64 if law in DISCRETE_LAWS else np.float64
+    buffer = mp.RawArray("q" if dtype is np.int64 else "d", n)
+    tasks = [(law, params) + block for block in blocks(n, block_size, seed)]
+
+    if workers == 1 or len(tasks) <= 1:
+        _attach(buffer, dtype)
+        for task in tasks:
+            _fill_block(task)
+        _shared.clear()
+    else:
+        with _pool(workers, _attach, (buffer, dtype)) as pool:
+            pool.map(_fill_block, tasks, chunksize=1)
+    return np.frombuffer(buffer, dtype=dtype)
+
+# -----------------------------
+# Histogramme en flux
+# -----------------------------
+# Chaque bloc est tiré, classé puis oublié : la mémoire ne dépend que de la
+# taille des blocs. Mêmes flux que sample() : pour une même graine,
+# l'histogramme est celui de l'échantillon complet.
+
+def _histogram_block(task):
+    law, params, edges, start, stop, seed_sequence = task
+    values = draw_block(law, params, start, stop, seed_sequence)
+    counts, _ = np.histogram(values, edges)
+    below = np.count_nonzero(values < edges[0])
+    above = np.count_nonzero(values > edges[-1])
+    mean = values.mean(dtype=float)
+    return counts, below, above, values.size, mean, np.square(values - mean).sum()
+
+class StreamingHistogram:
+    """
+    Effectifs par classe (bornes `edges`, comme np.histogram), tirages hors
+    bornes, moyenne et variance (fusion des blocs par la méthode de Chan).
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, counts, below, above, n, mean, m2):
+        self.counts += counts
+        self.below += below
+        self.above += above
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+
+    def var(self):
+        return self.m2 / (self.n - 1)
+
+    def density(self):
+        """
+        Densité empirique par classe, comparable à la PDF.
+        """
+        return self.counts / (self.n * np.diff(self.edges))
+
+def streaming_histogram(law, params, n, edges, seed=0, workers=None, block_size=BLOCK_SIZE):
+    """
+    Histogramme de N tirages de `law` sans jamais les garder en mémoire.
+    """
+    if law not in SAMPLERS:
+        raise ValueError(f"Loi inconnue : {law}")
+    histogram = StreamingHistogram(edges)
+    tasks = [(law, params, histogram.edges) + block for block in blocks(n, block_size, seed)]
+
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            histogram.add(*_histogram_block(task))
+    else:
+        # Résultats fusionnés dans l'ordre des blocs : moyenne et variance
+        # sont identiques au bit près quel que soit le nombre de processus
+        with _pool(workers) as pool:
+            for result in pool.imap(_histogram_block, tasks):
+                histogram.add(*result)
+    return histogram
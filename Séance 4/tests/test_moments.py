@@ -0,0 +1,16 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from moments import ANALYTIC_MOMENTS, numerical_moments
+
+# Densité infinie au bord du support (x = 0) pour moins de 2 degrés de liberté
+@pytest.mark.parametrize("df", [1, 0.5, 1.5, 3])
+def test_chi2_densite_infinie_au_bord(df):
+    numerical, bounds = numerical_moments("chi2", (df,))
+    np.testing.assert_allclose(numerical, ANALYTIC_MOMENTS["chi2"](df), rtol=1e-9)
+    assert np.isfinite(bounds).all()
@@ -0,0 +1,140 @@
+#coding:utf8
+
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+#Bootstrap des fréquences (à partir des effectifs observés) et des moyennes
+#(à partir des observations brutes) : B répliques tirées par lots vectorisés,
+#répartis sur des processus. Chaque lot a son propre flux aléatoire, engendré
+#par SeedSequence(graine).spawn(...) : pour une graine et un budget mémoire
+#donnés, les répliques ne dépendent pas du nombre de processus.
+#Intervalles percentile et BCa (biais corrigé et accéléré, Efron 1987).
+
+NB_REPLIQUES = 100000
+BUDGET_MEMOIRE = 64 << 20  #octets de tirages temporaires par lot et par processus
+
+#Tirage d'un lot de répliques
+#Fréquences : les n observations rééchantillonnées se répartissent selon une
+#loi multinomiale de paramètres (n, fréquences observées), sans les développer.
+#Moyennes : indices des observations tirés avec remise, ligne par ligne.
+def tirerFrequences(effectifs, taille, rng):
+    n = effectifs.sum()
+    return rng.multinomial(n, effectifs / n, size=taille) / n
+
+def tirerMoyennes(observations, taille, rng):
+    indices = rng.integers(0, len(observations), size=(taille, len(observations)))
+    return observations[indices].mean(axis=1)
+
+TIRAGES = {
+    "frequences": tirerFrequences,
+    "moyennes": tirerMoyennes,
+}
+
+def octetsParReplique(mode, donnees):
+    if mode == "frequences":
+        return 2 * donnees.size * 8
+    #Indices (int64) et observations recopiées
+    return len(donnees) * 8 * (1 + donnees.shape[1])
+
+def decouperLots(B, taille_lot, graine):
+    debuts = list(range(0, B, taille_lot))
+    graines = np.random.SeedSequence(graine).spawn(len(debuts))
+    return [(debut, min(debut + taille_lot, B), g) for debut, g in zip(debuts, graines)]
+
+#Les données sont transmises une seule fois à chaque processus (initialiseur)
+_partage = {}
+
+def _partager(mode, donnees):
+    _partage["mode"] = mode
+    _partage["donnees"] = donnees
+
+def _tirerLot(lot):
+    debut, fin, graine = lot
+    rng = np.random.default_rng(graine)
+    return TIRAGES[_partage["mode"]](_partage["donnees"], fin - debut, rng)
+
+def repliquer(mode, donnees, B=NB_REPLIQUES, graine=0, nb_processus=1, budget=BUDGET_MEMOIRE):
+    #Tableau (B, nombre de statistiques) des répliques bootstrap
+    taille_lot = int(max(1, min(B, budget // octetsParReplique(mode, donnees))))
+    lots = decouperLots(B, taille_lot, graine)
+    repliques = np.empty((B, donnees.shape[-1]))
+
+    if nb_processus == 1 or len(lots) <= 1:
+        _partager(mode, donnees)
+        for lot in lots:
+            repliques[lot[0]:lot[1]] = _tirerLot(lot)
+        _partage.clear()
+    else:
+        #Au plus un lot en cours par processus et des résultats rangés dans l'ordre des lots
+        with mp.Pool(nb_processus or os.cpu_count() or 1, initializer=_partager, initargs=(mode, donnees)) as pool:
+            for lot, resultat in zip(lots, pool.imap(_tirerLot, lots)):
+                repliques[lot[0]:lot[1]] = resultat
+    return repliques
+
+#Jackknife (pour l'accélération du BCa) : valeurs de la statistique quand on
+#retire une observation, avec le nombre d'observations qui donnent chaque valeur.
+#Pour une fréquence ou une moyenne, elles s'obtiennent sans recalcul.
+def jackknifeFrequences(effectifs):
+    n = effectifs.sum()
+    valeurs = (effectifs - np.eye(len(effectifs))) / (n - 1)
+    return valeurs, effectifs
+
+def jackknifeMoyennes(observations):
+    n = len(observations)
+    valeurs = (observations.sum(axis=0) - observations) / (n - 1)
+    return valeurs, np.ones(n)
+
+def acceleration(valeurs, poids):
+    poids = np.asarray(poids, dtype=float)[:, None]
+    moyenne = (poids * valeurs).sum(axis=0) / poids.sum()
+    ecarts = moyenne - valeurs
+    numerateur = (poids * ecarts ** 3).sum(axis=0)
+    denominateur = 6 * (poids * ecarts ** 2).sum(axis=0) ** 1.5
+    return np.divide(numerateur, denominateur, out=np.zeros_like(numerateur), where=denominateur > 0)
+
+def intervallesBootstrap(estimation, repliques, jackknife, niveau=0.95, noms=None):
+    alpha = 1 - niveau
+    niveaux = np.array([alpha / 2, 1 - alpha / 2])
+    percentile = np.quantile(repliques, niveaux, axis=0)
+
+    #Correction du biais : les répliques égales à l'estimation (fréquences,
+    #valeurs discrètes) comptent pour moitié de chaque côté
+    proportion = (repliques < estimation).mean(axis=0) + (repliques == estimation).mean(axis=0) / 2
+    z0 = scipy.stats.norm.ppf(proportion)
+    a = acceleration(*jackknife)
+    z = scipy.stats.norm.ppf(niveaux)[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        niveaux_bca = scipy.stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    bca = np.full_like(percentile, np.nan)
+    for j in range(repliques.shape[1]):
+        if np.all(np.isfinite(niveaux_bca[:, j])):
+            bca[:, j] = np.quantile(repliques[:, j], niveaux_bca[:, j])
+
+    return pd.DataFrame({
+        "Estimation": estimation,
+        "Erreur type": repliques.std(axis=0, ddof=1),
+        "Percentile inf": percentile[0],
+        "Percentile sup": percentile[1],
+        "BCa inf": bca[0],
+        "BCa sup": bca[1],
+    }, index=noms)
+
+def bootstrapFrequences(effectifs, B=NB_REPLIQUES, niveau=0.95, graine=0, nb_processus=1, budget=BUDGET_MEMOIRE, categories=None):
+    #effectifs : effectif observé de chaque catégorie dans un échantillon
+    effectifs = np.asarray(effectifs, dtype=np.int64)
+    repliques = repliquer("frequences", effectifs, B, graine, nb_processus, budget)
+    return intervallesBootstrap(effectifs / effectifs.sum(), repliques, jackknifeFrequences(effectifs), niveau, categories)
+
+def bootstrapMoyennes(observations, B=NB_REPLIQUES, niveau=0.95, graine=0, nb_processus=1, budget=BUDGET_MEMOIRE, colonnes=None):
+    #observations : une série ou un tableau (observations, variables) ; une moyenne par variable
+    if isinstance(observations, pd.DataFrame) and colonnes is None:
+        colonnes = list(observations.columns)
+    observations = np.asarray(observations, dtype=float)
+    if observations.ndim == 1:
+        observations = observations[:, None]
+    repliques = repliquer("moyennes", observations, B, graine, nb_processus, budget)
+    return intervallesBootstrap(observations.mean(axis=0), repliques, jackknifeMoyennes(observations), niveau, colonnes)
@@ -0,0 +1,94 @@
+#coding:utf8
+
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+
+from intervalles import METHODES, bornesWald, calculerIntervalles, quantileNormal
+from bootstrap import BUDGET_MEMOIRE, decouperLots
+
+#Couverture réelle des intervalles, mesurée par simulation : N échantillons de
+#taille n sont tirés dans la population mère (loi multinomiale) et, pour
+#chaque méthode, on compte les intervalles qui contiennent la fréquence réelle.
+#"fluctuation" : intervalle centré sur la fréquence réelle (étapes 1.4 et 1.5),
+#qui doit contenir la fréquence observée.
+#Les N tirages sont traités par lots (mémoire bornée) répartis sur des
+#processus ; comme pour le bootstrap, chaque lot a son propre flux aléatoire
+#et les lots sont cumulés dans leur ordre, quel que soit le nombre de processus.
+
+NB_SIMULATIONS = 10 ** 6
+METHODES_SIMULEES = ("fluctuation",) + METHODES
+
+def octetsParSimulation(nb_categories):
+    #Effectifs, fréquences, bornes et tableaux intermédiaires des calculs
+    return 16 * nb_categories * 8
+
+def _simulerLot(tache):
+    frequences, n, niveaux, methodes, debut, fin, graine = tache
+    rng = np.random.default_rng(graine)
+    effectifs = rng.multinomial(n, frequences, size=fin - debut)
+    observees = effectifs / n
+    dedans = np.zeros((len(niveaux), len(methodes), len(frequences)), dtype=np.int64)
+    largeurs = np.zeros(dedans.shape)
+    for i, niveau in enumerate(niveaux):
+        for j, methode in enumerate(methodes):
+            if methode == "fluctuation":
+                inf, sup = bornesWald(frequences, n, quantileNormal(niveau))
+                dedans[i, j] = ((inf <= observees) & (observees <= sup)).sum(axis=0)
+                largeurs[i, j] = (sup - inf) * (fin - debut)
+            else:
+                inf, sup = calculerIntervalles(effectifs, niveau, methode)
+                dedans[i, j] = ((inf <= frequences) & (frequences <= sup)).sum(axis=0)
+                largeurs[i, j] = (sup - inf).sum(axis=0)
+    return dedans, largeurs
+
+def simulerCouverture(effectifs_population, tailles, niveaux=(0.95,), methodes=METHODES_SIMULEES, N=NB_SIMULATIONS,
+                      graine=0, nb_processus=1, budget=BUDGET_MEMOIRE, categories=None):
+    #Couverture empirique et nominale par taille d'échantillon, niveau, méthode et catégorie
+    for methode in methodes:
+        if methode != "fluctuation" and methode not in METHODES:
+            raise ValueError(f"Méthode d'intervalle inconnue : {methode} (au choix : {', '.join(METHODES_SIMULEES)})")
+    effectifs_population = np.asarray(effectifs_population, dtype=float)
+    frequences = effectifs_population / effectifs_population.sum()
+    taille_lot = int(max(1, min(N, budget // octetsParSimulation(len(frequences)))))
+
+    taches = []
+    for n in tailles:
+        #Flux aléatoires propres à chaque taille : ajouter une taille ne change pas les autres
+        taches.extend((frequences, n, tuple(niveaux), tuple(methodes)) + lot for lot in decouperLots(N, taille_lot, [graine, n]))
+
+    dedans = {n: 0 for n in tailles}
+    largeurs = {n: 0.0 for n in tailles}
+    def cumuler(resultats):
+        for tache, (d, l) in zip(taches, resultats):
+            dedans[tache[1]] = dedans[tache[1]] + d
+            largeurs[tache[1]] = largeurs[tache[1]] + l
+
+    if nb_processus == 1 or len(taches) <= 1:
+        cumuler(map(_simulerLot, taches))
+    else:
+        with mp.Pool(nb_processus or os.cpu_count() or 1) as pool:
+            cumuler(pool.imap(_simulerLot, taches))
+
+    if categories is None:
+        categories = list(range(len(frequences)))
+    lignes = []
+    for n in tailles:
+        for i, niveau in enumerate(niveaux):
+            for j, methode in enumerate(methodes):
+                for k, categorie in enumerate(categories):
+                    couverture = dedans[n][i, j, k] / N
+                    lignes.append({
+                        "Taille": n,
+                        "Niveau": niveau,
+                        "Méthode": methode,
+                        "Catégorie": categorie,
+                        "Couverture": couverture,
+                        "Écart au niveau": couverture - niveau,
+                        #Erreur type de Monte-Carlo de la couverture estimée
+                        "Erreur type": np.sqrt(couverture * (1 - couverture) / N),
+                        "Largeur moyenne": largeurs[n][i, j, k] / N,
+                    })
+    return pd.DataFrame(lignes)
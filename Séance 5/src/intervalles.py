@@ -0,0 +1,81 @@
+#coding:utf8
+
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+#Intervalles de fluctuation et de confiance d'une proportion, calculés pour
+#toutes les lignes (échantillons) et toutes les catégories d'un tableau
+#d'effectifs en une seule opération NumPy (diffusion sur les deux axes).
+#Trois méthodes : Wald (approximation normale, celle du cours), Wilson
+#(score) et Clopper-Pearson (exacte, par les quantiles de la loi bêta).
+
+def quantileNormal(niveau):
+    #Quantile zC de la loi normale centrée réduite pour un niveau de confiance (1.96 pour 0.95)
+    return scipy.stats.norm.ppf(1 - (1 - np.asarray(niveau)) / 2)
+
+def bornesWald(p, n, z):
+    marge = z * np.sqrt(p * (1 - p) / n)
+    return np.clip(p - marge, 0, 1), np.clip(p + marge, 0, 1)
+
+def bornesWilson(p, n, z):
+    z2 = z ** 2
+    centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+    marge = z / (1 + z2 / n) * np.sqrt(p * (1 - p) / n + z2 / (4 * n ** 2))
+    return np.clip(centre - marge, 0, 1), np.clip(centre + marge, 0, 1)
+
+def bornesClopperPearson(effectifs, n, niveau):
+    alpha = 1 - niveau
+    #Les couples (effectif, n) distincts sont peu nombreux (au plus n + 1 par
+    #taille d'échantillon) : les quantiles bêta ne sont calculés qu'une fois chacun
+    effectifs, n = np.broadcast_arrays(effectifs, n)
+    base = effectifs.max() + 1
+    cles, inverse = np.unique(n.ravel() * base + effectifs.ravel(), return_inverse=True)
+    total, k = np.divmod(cles, base)
+    #Aux extrémités (0 ou n succès) la borne correspondante vaut exactement 0 ou 1
+    with np.errstate(invalid="ignore"):
+        inf = np.where(k > 0, scipy.stats.beta.ppf(alpha / 2, k, total - k + 1), 0.0)
+        sup = np.where(k < total, scipy.stats.beta.ppf(1 - alpha / 2, k + 1, total - k), 1.0)
+    inverse = inverse.ravel()
+    return inf[inverse].reshape(effectifs.shape), sup[inverse].reshape(effectifs.shape)
+
+METHODES = ("wald", "wilson", "clopper-pearson")
+
+def calculerIntervalles(effectifs, niveau=0.95, methode="wald", z=None):
+    #effectifs : tableau (échantillons, catégories) ; n = total de chaque ligne.
+    #z remplace le quantile calculé à partir du niveau (ex. zC = 1.96 arrondi).
+    #Renvoie les bornes inférieures et supérieures, de même forme que effectifs.
+    effectifs = np.asarray(effectifs, dtype=float)
+    n = effectifs.sum(axis=-1, keepdims=True)
+    p = effectifs / n
+    if z is None:
+        z = quantileNormal(niveau)
+    if methode == "wald":
+        return bornesWald(p, n, z)
+    if methode == "wilson":
+        return bornesWilson(p, n, z)
+    if methode == "clopper-pearson":
+        return bornesClopperPearson(effectifs, n, niveau)
+    raise ValueError(f"Méthode d'intervalle inconnue : {methode} (au choix : {', '.join(METHODES)})")
+
+def resumerCouverture(bornes_inf, bornes_sup, frequences_reelles, categories=None):
+    #Par catégorie : part des échantillons dont l'intervalle contient la
+    #fréquence réelle, et largeur moyenne des intervalles
+    frequences_reelles = np.asarray(frequences_reelles, dtype=float)
+    dedans = (bornes_inf <= frequences_reelles) & (frequences_reelles <= bornes_sup)
+    return pd.DataFrame({
+        "Couverture": dedans.mean(axis=0),
+        "Largeur moyenne": (bornes_sup - bornes_inf).mean(axis=0),
+    }, index=categories)
+
+def comparerMethodes(effectifs, frequences_reelles, niveaux=(0.95,), methodes=METHODES, categories=None):
+    #Tableau de couverture pour chaque niveau et chaque méthode
+    resultats = []
+    for niveau in niveaux:
+        for methode in methodes:
+            inf, sup = calculerIntervalles(effectifs, niveau, methode)
+            resume = resumerCouverture(inf, sup, frequences_reelles, categories)
+            resume.insert(0, "Méthode", methode)
+            resume.insert(0, "Niveau", niveau)
+            resultats.append(resume)
+    return pd.concat(resultats)
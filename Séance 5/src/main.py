@@ -1,195 +1,234 @@
 #coding:utf8
 
+import os
+
 import pandas as pd
-import math
 import scipy
 import scipy.stats
 
+from cache_colonnes import charger_en_cache
+from intervalles import bornesWald, calculerIntervalles, comparerMethodes
+from bootstrap import bootstrapFrequences, bootstrapMoyennes
+from normalite import testerNormalite
+from couverture import simulerCouverture
+
+#Bootstrap : nombre de répliques, processus (1 : sans processus) et budget mémoire des tirages par lot (en Mio)
+NB_REPLIQUES = int(os.environ.get("NB_REPLIQUES", 100000))
+NB_PROCESSUS = int(os.environ.get("NB_PROCESSUS", 1))
+BUDGET_MEMOIRE = int(os.environ.get("BUDGET_MEMOIRE", 64)) << 20
+#Couverture simulée des intervalles : nombre d'échantillons et tailles d'échantillon
+NB_SIMULATIONS = int(os.environ.get("NB_SIMULATIONS", 10 ** 6))
+TAILLES_SIMULATION = [int(n) for n in os.environ.get("TAILLES_SIMULATION", "100,1000").split(",")]
+#Tests de normalité : dossier, motif glob ou motifs séparés par des virgules
+SERIES_NORMALITE = os.environ.get("SERIES_NORMALITE", "./data/Loi-normale-Test-*.csv").split(",")
+
+NOMS_TESTS = {"shapiro": "Shapiro-Wilk", "dagostino": "D'Agostino-Pearson", "anderson": "Anderson-Darling", "ks": "Kolmogorov-Smirnov"}
+SYMBOLES_TESTS = {"shapiro": "W", "dagostino": "K²", "anderson": "A²", "ks": "D"}
+
+#Fonctions pour ouvrir les fichiers (relus depuis le cache colonnaire tant qu'ils ne changent pas)
 def ouvrirUnFichier(nom):
+    return charger_en_cache(nom, lireUnFichier)
+
+def lireUnFichier(nom):
     with open(nom, "r") as fichier:
         contenu = pd.read_csv(fichier)
     return contenu
 
-#Théorie de l'échantillonnage (intervalles de fluctuation)
-#L'échantillonnage se base sur la répétitivité.
-print("Résultat sur le calcul d'un intervalle de fluctuation")
-
-donnees = pd.DataFrame(ouvrirUnFichier("./data/Echantillonnage-100-Echantillons.csv"))
-
-#Théorie de l'estimation (intervalles de confiance)
-#L'estimation se base sur l'effectif.
-print("Résultat sur le calcul d'un intervalle de confiance")
-
-#Théorie de la décision (tests d'hypothèse)
-#La décision se base sur la notion de risques alpha et bêta.
-#Comme à la séance précédente, l'ensemble des tests se trouve au lien : https://docs.scipy.org/doc/scipy/reference/stats.html
-print("Théorie de la décision")
-
-#----------------------------------------------------------------------------------------------------
-print("Résultat sur le calcul d'un intervalle de fluctuation")
-donnees = pd.DataFrame(ouvrirUnFichier("./data/Echantillonnage-100-Echantillons.csv"))
-
-#Etape 1.0 - Théorie de l'échantillonnage
-print("\n" + "-"*60)
-print("Partie 1 — Théorie de l'échantillonnage (intervalles de fluctuation)")
-print("-"*60 + "\n")
-
-#Etape 1.1 - Calcul des moyennes par colonnes
-moyennes = donnees.mean().round(0) 
-print("\nMoyennes observées sur 100 échantillons :\n", moyennes)
-
-#Etape 1.2 - Calcul des fréquences observées dans échantillons
-somme_moyennes = moyennes.sum()
-frequences_echant = (moyennes / somme_moyennes).round(2)
-print("\nFréquences observées dans les échantillons :\n", frequences_echant)
-
-#Etape 1.3 - Fréquences réelle population mère
-pop_totale = 2185
-pop_pour, pop_contre, pop_sans = 852, 911, 422
-frequences_reelles = pd.Series({
-    "Pour": round(pop_pour / pop_totale, 2),
-    "Contre": round(pop_contre / pop_totale, 2),
-    "Sans opinion": round(pop_sans / pop_totale, 2)
-})
-print("\nFréquences réelles de la population mère :\n", frequences_reelles)
-
-#Etape 1.4 - Calcul intervalles fluctuation 
-zC = 1.96
-n = len(donnees)
-
-intervalle_fluctuation = {}
-
-for cat, p_obs in frequences_echant.items():
-    marge = zC * math.sqrt((p_obs * (1 - p_obs)) / n)
-    borne_inf = round(p_obs - marge, 3)
-    borne_sup = round(p_obs + marge, 3)
-    intervalle_fluctuation[cat] = (borne_inf, borne_sup)
-
-print("\nIntervalles de fluctuation à 95 % :\n")
-for cat, (inf, sup) in intervalle_fluctuation.items():
-    print(f"{cat} : [{inf}, {sup}]")
-
-#Etape 1.5 - Comparaison fréquences observée et réelles 
-print("\nComparaison avec les valeurs réelles :\n")
-for cat in frequences_reelles.index:
-    fr_real = frequences_reelles[cat]
-    inf, sup = intervalle_fluctuation[cat]
-    if inf <= fr_real <= sup:
-        conclusion = "La fréquence réelle est comprise dans l’intervalle"
-    else:
-        conclusion = "La fréquence réelle est en dehors de l’intervalle"
-    print(f"{cat} : fréquence réelle = {fr_real} → {conclusion}")
-
-#---------------------------------------------------------------------------------
-#Etape 2.0 - Théorie de l'estimation 
-print("\n" + "-"*60)
-print("Partie 2 — Théorie de l'estimation (intervalles de confiance)")
-print("-"*60 + "\n")
-
-#Etape 2.1 - Sélection 1er échantillon
-premier_ech = donnees.iloc[0]
-ligne = list(premier_ech.astype(int))
-colonnes = list(donnees.columns)
-print("Premier échantillon (ligne 0) :")
-for nom, val in zip(colonnes, ligne):
-    print(f"{nom} : {val}")
-
-#Etape 2.2 - Calcul taille échantillon et fréquences 
-n = sum(ligne)
-print(f"\nEffectif total de l’échantillon : n = {n}")
-
-frequences = {nom: round(val / n, 2) for nom, val in zip(colonnes, ligne)}
-print("\nFréquences observées sur cet échantillon :")
-for nom, freq in frequences.items():
-    print(f"{nom} : {freq}")
-
-#Etape 2.3 - Calcul intervalle de confiance 
-zC = 1.96
-ic_95 = {}
-
-for nom, val in zip(colonnes, ligne):
-    p = val / n
-    marge = zC * math.sqrt((p * (1 - p)) / n)
-    borne_inf = max(0.0, round(p - marge, 3))
-    borne_sup = min(1.0, round(p + marge, 3))
-    ic_95[nom] = (borne_inf, borne_sup)
-
-print("\nIntervalles de confiance à 95 % :")
-for nom, (inf, sup) in ic_95.items():
-    print(f"{nom} : [{inf}, {sup}]")
-
-#Etape 2.4 - Comparaison fréquences réelles et intervalles 
-print("\nComparaison avec les fréquences réelles et les intervalles de fluctuation :\n")
-
-for nom in colonnes:
-    fr_real = frequences_reelles.get(nom, None)
-    inf_ic, sup_ic = ic_95[nom]
-    inf_fluct, sup_fluct = intervalle_fluctuation[nom]
-
-    if inf_ic <= fr_real <= sup_ic:
-        conclusion_ic = "fréquence réelle DANS l’IC"
-    else:
-        conclusion_ic = "fréquence réelle HORS de l’IC"
-
-    if inf_fluct <= fr_real <= sup_fluct:
-        conclusion_fluct = "fréquence réelle DANS l’intervalle de fluctuation"
-    else:
-        conclusion_fluct = "fréquence réelle HORS de l’intervalle de fluctuation"
-
-    print(f"{nom} : réelle={fr_real} → {conclusion_ic} ; {conclusion_fluct}")
-
-#Etape 2.5 - Verification plusieurs lignes 
-print("\nAnalyse rapide sur les 5 premiers échantillons (IC 95 %) :")
-
-for i in range(min(5, len(donnees))):
-    ligne_i = list(donnees.iloc[i].astype(int))
-    n_i = sum(ligne_i)
-    print(f"\nÉchantillon {i} — taille n = {n_i}")
-    for nom, val in zip(colonnes, ligne_i):
-        p_i = val / n_i
-        marge_i = zC * math.sqrt((p_i * (1 - p_i)) / n_i)
-        borne_inf_i = max(0.0, round(p_i - marge_i, 3))
-        borne_sup_i = min(1.0, round(p_i + marge_i, 3))
-        print(f"  {nom} : p = {round(p_i,3)} → IC95% [{borne_inf_i}, {borne_sup_i}]")
-
-
-#----------------------------------------------------------------------------
-#Etape 3.0 - Théorie de la décision 
-print("\n" + "-"*60)
-print("Partie 3 — Théorie de la décision (test de Shapiro-Wilk)")
-print("-"*60 + "\n")
-
-import scipy.stats as stats
-
-#Etape 3.1 - changement fichier CSV
-fichiers = ["./data/Loi-normale-Test-1.csv", "./data/Loi-normale-Test-2.csv"]
-donnees_tests = {}
-
-for f in fichiers:
-    try:
-        df = pd.read_csv(f, header=None)
-        valeurs = pd.to_numeric(df[0], errors='coerce').dropna().tolist()
-        donnees_tests[f] = valeurs
-        print(f"{f} chargé avec succès, {len(valeurs)} valeurs numériques.")
-    except Exception as e:
-        print(f"Erreur lors du chargement de {f} : {e}")
-
-#Etape 3.2 - Test de Shapiro-Wilks
-print("\nRésultats du test de Shapiro-Wilk :")
-for nom_fichier, valeurs in donnees_tests.items():
-    stat, p_value = stats.shapiro(valeurs)
-    print(f"\nFichier : {nom_fichier}")
-    print(f"  Statistique W = {stat:.4f}")
-    print(f"  p-value = {p_value:.4f}")
-    
-    if p_value > 0.05:
-        print("Distribution NORMALE (hypothèse de normalité non rejetée)")
-    else:
-        print("Distribution NON NORMALE (hypothèse de normalité rejetée)")
-
-#Etape 3.3 - Interprétation 
-print("\nInterprétation :")
-print("Le test de Shapiro-Wilk vérifie si l'échantillon suit une loi normale.")
-print("- Si p-value > 0.05 : la distribution peut être considérée comme normale.")
-print("- Si p-value ≤ 0.05 : la distribution ne suit pas la loi normale.")
-print("Ces résultats permettront de décider quel test statistique utiliser pour l’analyse ultérieure.\n")
\ No newline at end of file
+if __name__ == "__main__":
+    #Théorie de l'échantillonnage (intervalles de fluctuation)
+    #L'échantillonnage se base sur la répétitivité.
+    print("Résultat sur le calcul d'un intervalle de fluctuation")
+
+    donnees = pd.DataFrame(ouvrirUnFichier("./data/Echantillonnage-100-Echantillons.csv"))
+
+    #Théorie de l'estimation (intervalles de confiance)
+    #L'estimation se base sur l'effectif.
+    print("Résultat sur le calcul d'un intervalle de confiance")
+
+    #Théorie de la décision (tests d'hypothèse)
+    #La décision se base sur la notion de risques alpha et bêta.
+    #Comme à la séance précédente, l'ensemble des tests se trouve au lien : https://docs.scipy.org/doc/scipy/reference/stats.html
+    print("Théorie de la décision")
+
+    #----------------------------------------------------------------------------------------------------
+    print("Résultat sur le calcul d'un intervalle de fluctuation")
+    donnees = pd.DataFrame(ouvrirUnFichier("./data/Echantillonnage-100-Echantillons.csv"))
+
+    #Etape 1.0 - Théorie de l'échantillonnage
+    print("\n" + "-"*60)
+    print("Partie 1 — Théorie de l'échantillonnage (intervalles de fluctuation)")
+    print("-"*60 + "\n")
+
+    #Etape 1.1 - Calcul des moyennes par colonnes
+    moyennes = donnees.mean().round(0) 
+    print("\nMoyennes observées sur 100 échantillons :\n", moyennes)
+
+    #Etape 1.2 - Calcul des fréquences observées dans échantillons
+    somme_moyennes = moyennes.sum()
+    frequences_echant = (moyennes / somme_moyennes).round(2)
+    print("\nFréquences observées dans les échantillons :\n", frequences_echant)
+
+    #Etape 1.3 - Fréquences réelle population mère
+    pop_totale = 2185
+    pop_pour, pop_contre, pop_sans = 852, 911, 422
+    frequences_reelles = pd.Series({
+        "Pour": round(pop_pour / pop_totale, 2),
+        "Contre": round(pop_contre / pop_totale, 2),
+        "Sans opinion": round(pop_sans / pop_totale, 2)
+    })
+    print("\nFréquences réelles de la population mère :\n", frequences_reelles)
+
+    #Etape 1.4 - Calcul intervalles fluctuation 
+    zC = 1.96
+    n = len(donnees)
+
+    #Toutes les catégories en une seule opération (voir intervalles.py)
+    bornes_inf, bornes_sup = bornesWald(frequences_echant.to_numpy(), n, zC)
+    intervalle_fluctuation = {
+        cat: (round(float(inf), 3), round(float(sup), 3))
+        for cat, inf, sup in zip(frequences_echant.index, bornes_inf, bornes_sup)
+    }
+
+    print("\nIntervalles de fluctuation à 95 % :\n")
+    for cat, (inf, sup) in intervalle_fluctuation.items():
+        print(f"{cat} : [{inf}, {sup}]")
+
+    #Etape 1.5 - Comparaison fréquences observée et réelles 
+    print("\nComparaison avec les valeurs réelles :\n")
+    for cat in frequences_reelles.index:
+        fr_real = frequences_reelles[cat]
+        inf, sup = intervalle_fluctuation[cat]
+        if inf <= fr_real <= sup:
+            conclusion = "La fréquence réelle est comprise dans l’intervalle"
+        else:
+            conclusion = "La fréquence réelle est en dehors de l’intervalle"
+        print(f"{cat} : fréquence réelle = {fr_real} → {conclusion}")
+
+    #Etape 1.6 - Bootstrap des moyennes sur les 100 échantillons
+    print(f"\nBootstrap des moyennes ({NB_REPLIQUES} répliques, IC 95 % percentile et BCa) :")
+    print(bootstrapMoyennes(donnees, NB_REPLIQUES, graine=2024, nb_processus=NB_PROCESSUS, budget=BUDGET_MEMOIRE).round(3).to_string())
+
+    #Etape 1.7 - Couverture réelle des intervalles à 95 %, simulée dans la population mère
+    print(f"\nCouverture simulée des intervalles à 95 % ({NB_SIMULATIONS} échantillons par taille) :")
+    couverture = simulerCouverture([pop_pour, pop_contre, pop_sans], TAILLES_SIMULATION, N=NB_SIMULATIONS, graine=2024,
+                                   nb_processus=NB_PROCESSUS, budget=BUDGET_MEMOIRE, categories=list(frequences_reelles.index))
+    tableau_couverture = couverture.set_index(["Taille", "Méthode", "Catégorie"])["Couverture"].unstack()
+    lignes_couverture = couverture.set_index(["Taille", "Méthode"]).index.unique()
+    print(tableau_couverture.reindex(index=lignes_couverture, columns=frequences_reelles.index).round(4).to_string())
+
+    #---------------------------------------------------------------------------------
+    #Etape 2.0 - Théorie de l'estimation 
+    print("\n" + "-"*60)
+    print("Partie 2 — Théorie de l'estimation (intervalles de confiance)")
+    print("-"*60 + "\n")
+
+    #Etape 2.1 - Sélection 1er échantillon
+    premier_ech = donnees.iloc[0]
+    ligne = list(premier_ech.astype(int))
+    colonnes = list(donnees.columns)
+    print("Premier échantillon (ligne 0) :")
+    for nom, val in zip(colonnes, ligne):
+        print(f"{nom} : {val}")
+
+    #Etape 2.2 - Calcul taille échantillon et fréquences 
+    n = sum(ligne)
+    print(f"\nEffectif total de l’échantillon : n = {n}")
+
+    frequences = {nom: round(val / n, 2) for nom, val in zip(colonnes, ligne)}
+    print("\nFréquences observées sur cet échantillon :")
+    for nom, freq in frequences.items():
+        print(f"{nom} : {freq}")
+
+    #Etape 2.3 - Calcul intervalle de confiance 
+    zC = 1.96
+    #Intervalles de Wald de tous les échantillons (lignes) et de toutes les catégories à la fois
+    effectifs = donnees[colonnes].to_numpy()
+    ic_inf, ic_sup = calculerIntervalles(effectifs, methode="wald", z=zC)
+    ic_95 = {nom: (round(float(inf), 3), round(float(sup), 3)) for nom, inf, sup in zip(colonnes, ic_inf[0], ic_sup[0])}
+
+    print("\nIntervalles de confiance à 95 % :")
+    for nom, (inf, sup) in ic_95.items():
+        print(f"{nom} : [{inf}, {sup}]")
+
+    #Etape 2.4 - Comparaison fréquences réelles et intervalles 
+    print("\nComparaison avec les fréquences réelles et les intervalles de fluctuation :\n")
+
+    for nom in colonnes:
+        fr_real = frequences_reelles.get(nom, None)
+        inf_ic, sup_ic = ic_95[nom]
+        inf_fluct, sup_fluct = intervalle_fluctuation[nom]
+
+        if inf_ic <= fr_real <= sup_ic:
+            conclusion_ic = "fréquence réelle DANS l’IC"
+        else:
+            conclusion_ic = "fréquence réelle HORS de l’IC"
+
+        if inf_fluct <= fr_real <= sup_fluct:
+            conclusion_fluct = "fréquence réelle DANS l’intervalle de fluctuation"
+        else:
+            conclusion_fluct = "fréquence réelle HORS de l’intervalle de fluctuation"
+
+        print(f"{nom} : réelle={fr_real} → {conclusion_ic} ; {conclusion_fluct}")
+
+    #Etape 2.5 - Verification plusieurs lignes 
+    print("\nAnalyse rapide sur les 5 premiers échantillons (IC 95 %) :")
+
+    for i in range(min(5, len(donnees))):
+        ligne_i = list(donnees.iloc[i].astype(int))
+        n_i = sum(ligne_i)
+        print(f"\nÉchantillon {i} — taille n = {n_i}")
+        for j, (nom, val) in enumerate(zip(colonnes, ligne_i)):
+            p_i = val / n_i
+            print(f"  {nom} : p = {round(p_i,3)} → IC95% [{round(float(ic_inf[i, j]), 3)}, {round(float(ic_sup[i, j]), 3)}]")
+
+    #Etape 2.6 - Couverture sur tous les échantillons, plusieurs niveaux et méthodes
+    #Part des échantillons dont l'intervalle contient la fréquence réelle (non arrondie)
+    print(f"\nCouverture des intervalles de confiance sur les {len(donnees)} échantillons :")
+    frequences_population = [pop_pour / pop_totale, pop_contre / pop_totale, pop_sans / pop_totale]
+    print(comparerMethodes(effectifs, frequences_population, niveaux=(0.90, 0.95, 0.99), categories=colonnes).round(3))
+
+    #Etape 2.7 - Bootstrap des fréquences du premier échantillon (à comparer aux intervalles de l'étape 2.3)
+    print(f"\nBootstrap des fréquences du premier échantillon ({NB_REPLIQUES} répliques) :")
+    print(bootstrapFrequences(premier_ech.to_numpy(), NB_REPLIQUES, graine=2024, nb_processus=NB_PROCESSUS, budget=BUDGET_MEMOIRE, categories=colonnes).round(3).to_string())
+
+
+    #----------------------------------------------------------------------------
+    #Etape 3.0 - Théorie de la décision 
+    print("\n" + "-"*60)
+    print("Partie 3 — Théorie de la décision (tests de normalité)")
+    print("-"*60 + "\n")
+
+    #Etape 3.1 - Séries à tester (dossier ou motif glob, voir normalite.py)
+    #Etape 3.2 - Tests de normalité (Shapiro-Wilk jusqu'à 5000 valeurs, D'Agostino-Pearson au-delà)
+    resultats_normalite = testerNormalite(SERIES_NORMALITE, nb_processus=NB_PROCESSUS)
+    for _, resultat in resultats_normalite.iterrows():
+        if pd.isna(resultat["Erreur"]):
+            print(f"{resultat['Fichier']} chargé avec succès, {resultat['n']} valeurs numériques.")
+        else:
+            print(f"Erreur lors du chargement de {resultat['Fichier']} : {resultat['Erreur']}")
+
+    print("\nRésultats des tests de normalité :")
+    for _, resultat in resultats_normalite[resultats_normalite["Erreur"].isna()].iterrows():
+        print(f"\nFichier : {resultat['Fichier']}")
+        print(f"  Test : {NOMS_TESTS[resultat['Test']]}")
+        print(f"  Statistique {SYMBOLES_TESTS[resultat['Test']]} = {resultat['Statistique']:.4f}")
+        if pd.isna(resultat["p-value"]):
+            print("  p-value non disponible (statistique comparée à la valeur critique)")
+        else:
+            print(f"  p-value = {resultat['p-value']:.4f}")
+
+        if resultat["Normale"]:
+            print("Distribution NORMALE (hypothèse de normalité non rejetée)")
+        else:
+            print("Distribution NON NORMALE (hypothèse de normalité rejetée)")
+
+    print("\nTableau récapitulatif :")
+    print(resultats_normalite.drop(columns="Erreur").to_string(index=False))
+
+    #Etape 3.3 - Interprétation 
+    print("\nInterprétation :")
+    tests_utilises = [NOMS_TESTS[test] for test in resultats_normalite["Test"].dropna().unique()]
+    print(f"Test(s) utilisé(s) : {', '.join(tests_utilises)}. Chacun vérifie si l'échantillon suit une loi normale.")
+    print("- Si p-value > 0.05 : la distribution peut être considérée comme normale.")
+    print("- Si p-value ≤ 0.05 : la distribution ne suit pas la loi normale.")
+    print("Ces résultats permettront de décider quel test statistique utiliser pour l’analyse ultérieure.\n")
\ No newline at end of file
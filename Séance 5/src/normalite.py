@@ -0,0 +1,160 @@
+#coding:utf8
+
+import os
+import glob
+import json
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+from cache_colonnes import charger_en_cache, empreinte_fichier
+
+#Tests de normalité d'un lot de séries numériques (un fichier CSV par série).
+#Le test est choisi selon l'effectif : Shapiro-Wilk jusqu'à 5000 valeurs
+#(au-delà, SciPy prévient que sa p-value n'est plus fiable), D'Agostino-Pearson
+#au-delà. Anderson-Darling et Kolmogorov-Smirnov peuvent être imposés.
+#Les fichiers sont testés en parallèle et les résultats sont mis en cache
+#selon l'empreinte SHA-256 du contenu : un fichier inchangé n'est pas retesté.
+
+VERSION_NORMALITE = 2
+SEUIL_SHAPIRO = 5000
+SEUILS_ANDERSON = (0.15, 0.10, 0.05, 0.025, 0.01)
+FICHIER_CACHE = os.path.join(".cache", "normalite.json")
+
+def lireUneSerie(nom):
+    #Valeurs numériques de la première colonne (l'en-tête et les cellules non numériques sont ignorés)
+    df = pd.read_csv(nom, header=None)
+    return pd.DataFrame({"valeurs": pd.to_numeric(df[0], errors='coerce').dropna()})
+
+def verifierSeuilAnderson(alpha):
+    if not np.isclose(alpha, SEUILS_ANDERSON).any():
+        raise ValueError(f"Seuil non tabulé pour Anderson-Darling : {alpha} (au choix : {', '.join(str(s) for s in SEUILS_ANDERSON)})")
+
+#Chaque test renvoie (statistique, p-value, normale) au seuil alpha
+def testShapiro(valeurs, alpha):
+    stat, p_value = scipy.stats.shapiro(valeurs)
+    return stat, p_value, p_value > alpha
+
+def testDagostino(valeurs, alpha):
+    stat, p_value = scipy.stats.normaltest(valeurs)
+    return stat, p_value, p_value > alpha
+
+def testAnderson(valeurs, alpha):
+    #Pas de p-value : la statistique est comparée à la valeur critique du seuil,
+    #qui doit être l'un des seuils tabulés (15, 10, 5, 2.5 ou 1 %)
+    verifierSeuilAnderson(alpha)
+    resultat = scipy.stats.anderson(valeurs, dist="norm")
+    i = np.flatnonzero(np.isclose(resultat.significance_level, 100 * alpha))[0]
+    return resultat.statistic, np.nan, resultat.statistic < resultat.critical_values[i]
+
+def testKolmogorov(valeurs, alpha):
+    #Loi normale de moyenne et d'écart-type estimés : la p-value est prudente (trop grande)
+    stat, p_value = scipy.stats.kstest(valeurs, "norm", args=(np.mean(valeurs), np.std(valeurs, ddof=1)))
+    return stat, p_value, p_value > alpha
+
+TESTS_NORMALITE = {
+    "shapiro": testShapiro,
+    "dagostino": testDagostino,
+    "anderson": testAnderson,
+    "ks": testKolmogorov,
+}
+
+def choisirTest(n, test="auto"):
+    if test != "auto":
+        return test
+    #normaltest demande au moins 8 valeurs
+    return "shapiro" if n <= SEUIL_SHAPIRO or n < 8 else "dagostino"
+
+def listerSeries(source):
+    #Dossier (tous ses fichiers CSV), motif glob ou liste de l'un ou de l'autre
+    sources = [source] if isinstance(source, str) else list(source)
+    fichiers = []
+    for s in sources:
+        motif = os.path.join(s, "*.csv") if os.path.isdir(s) else s
+        fichiers.extend(sorted(glob.glob(motif)))
+    return fichiers
+
+def testerFichier(tache):
+    chemin, test, alpha = tache
+    resultat = {"Fichier": chemin, "n": 0, "Test": None, "Statistique": np.nan, "p-value": np.nan,
+                "Normale": None, "Erreur": None}
+    try:
+        valeurs = charger_en_cache(chemin, lireUneSerie, "serie")["valeurs"].to_numpy(dtype=float)
+        resultat["n"] = len(valeurs)
+        if len(valeurs) < 3:
+            raise ValueError("au moins 3 valeurs sont nécessaires")
+        resultat["Test"] = choisirTest(len(valeurs), test)
+        stat, p_value, normale = TESTS_NORMALITE[resultat["Test"]](valeurs, alpha)
+        resultat.update({"Statistique": float(stat), "p-value": float(p_value), "Normale": bool(normale)})
+    except Exception as e:
+        resultat["Erreur"] = str(e)
+    return resultat
+
+def lireCache(chemin):
+    try:
+        with open(chemin, "r", encoding="utf-8") as fichier:
+            cache = json.load(fichier)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == VERSION_NORMALITE else {}
+
+def ecrireCache(chemin, cache):
+    try:
+        if os.path.dirname(chemin):
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "w", encoding="utf-8") as fichier:
+            json.dump(cache, fichier)
+        os.replace(temporaire, chemin)
+    except OSError as erreur:
+        print(f"Cache des tests de normalité non écrit : {erreur}")
+
+def testerNormalite(source, test="auto", alpha=0.05, nb_processus=1, cache=FICHIER_CACHE):
+    #Un résultat par fichier, dans l'ordre des fichiers ; cache=None désactive le cache
+    if test != "auto" and test not in TESTS_NORMALITE:
+        raise ValueError(f"Test de normalité inconnu : {test} (au choix : auto, {', '.join(TESTS_NORMALITE)})")
+    if test == "anderson":
+        verifierSeuilAnderson(alpha)
+    fichiers = listerSeries(source)
+    contenu = lireCache(cache) if cache else {}
+    fichiers_connus = contenu.get("fichiers", {})
+    resultats_connus = contenu.get("resultats", {})
+
+    #Empreinte du contenu, recalculée seulement si la taille ou la date a changé
+    cles, a_tester = {}, []
+    for chemin in fichiers:
+        etat = os.stat(chemin)
+        connu = fichiers_connus.get(chemin)
+        if connu is None or connu["taille"] != etat.st_size or connu["mtime"] != etat.st_mtime_ns:
+            connu = {"taille": etat.st_size, "mtime": etat.st_mtime_ns, "sha256": empreinte_fichier(chemin)}
+            fichiers_connus[chemin] = connu
+        cles[chemin] = f"{connu['sha256']}|{test}|{alpha}"
+        if cles[chemin] not in resultats_connus:
+            a_tester.append(chemin)
+
+    taches = [(chemin, test, alpha) for chemin in a_tester]
+    if nb_processus == 1 or len(taches) <= 1:
+        nouveaux = [testerFichier(tache) for tache in taches]
+    else:
+        nb_processus = nb_processus or os.cpu_count() or 1
+        with mp.Pool(nb_processus) as pool:
+            nouveaux = pool.map(testerFichier, taches, chunksize=max(1, len(taches) // (4 * nb_processus)))
+
+    for chemin, resultat in zip(a_tester, nouveaux):
+        #Les erreurs (fichier illisible…) ne sont pas mises en cache
+        if resultat["Erreur"] is None:
+            resultats_connus[cles[chemin]] = {k: v for k, v in resultat.items() if k != "Fichier"}
+    if cache:
+        ecrireCache(cache, {"version": VERSION_NORMALITE, "fichiers": fichiers_connus, "resultats": resultats_connus})
+
+    nouveaux = dict(zip(a_tester, nouveaux))
+    lignes = []
+    for chemin in fichiers:
+        if chemin in nouveaux:
+            lignes.append(dict(nouveaux[chemin], **{"Depuis le cache": False}))
+        else:
+            lignes.append(dict(resultats_connus[cles[chemin]], Fichier=chemin, **{"Depuis le cache": True}))
+    colonnes = ["Fichier", "n", "Test", "Statistique", "p-value", "Normale", "Erreur", "Depuis le cache"]
+    return pd.DataFrame(lignes, columns=colonnes)
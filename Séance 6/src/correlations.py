@@ -0,0 +1,176 @@
+#coding:utf8
+
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+from rangs import matriceRangs
+
+#Matrices de corrélation de rang entre toutes les colonnes d'un tableau
+#(années, populations et densités…). Les valeurs manquantes sont écartées
+#paire par paire, comme le ferait spearmanr ou kendalltau sur chaque paire.
+#Spearman : corrélation de Pearson des rangs moyens, obtenue pour toutes les
+#paires par un produit matriciel. Les colonnes sont regroupées selon leurs
+#valeurs manquantes : un produit par couple de groupes, sur les lignes
+#complètes pour les deux groupes, au lieu d'un calcul par paire.
+#Kendall (tau-b) : algorithme de Knight (1966), en O(n log n) par paire
+#grâce au tri fusion ; les paires sont réparties sur des processus.
+
+#Fonction pour regrouper les colonnes qui ont les mêmes valeurs manquantes
+def groupesMasques(presentes):
+    groupes = {}
+    for j in range(presentes.shape[1]):
+        groupes.setdefault(presentes[:, j].tobytes(), []).append(j)
+    return list(groupes.values())
+
+#Fonction pour calculer la p-value bilatérale du coefficient de Spearman (loi de Student à n - 2 degrés de liberté)
+def pValeurSpearman(coefficients, effectifs):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = coefficients * np.sqrt((effectifs - 2) / ((1 - coefficients) * (1 + coefficients)))
+    return 2 * scipy.stats.t.sf(np.abs(t), effectifs - 2)
+
+def correlationsSpearman(valeurs):
+    valeurs = np.asarray(valeurs, dtype=float)
+    presentes = ~np.isnan(valeurs)
+    m = valeurs.shape[1]
+    coefficients = np.full((m, m), np.nan)
+    effectifs = np.zeros((m, m), dtype=np.int64)
+
+    groupes = groupesMasques(presentes)
+    for a, groupe_a in enumerate(groupes):
+        for groupe_b in groupes[a:]:
+            meme_groupe = groupe_b is groupe_a
+            colonnes = groupe_a if meme_groupe else groupe_a + groupe_b
+            lignes = presentes[:, groupe_a[0]] & presentes[:, groupe_b[0]]
+            rangs = matriceRangs(valeurs[np.ix_(lignes, colonnes)], "average")
+            rangs -= rangs.mean(axis=0)
+            normes = np.sqrt((rangs ** 2).sum(axis=0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rangs /= normes
+            #Seules les paires (groupe a, groupe b) sont calculées sur ces lignes :
+            #les paires internes à un groupe l'ont été sur ses propres lignes
+            bloc = rangs.T @ rangs if meme_groupe else rangs[:, :len(groupe_a)].T @ rangs[:, len(groupe_a):]
+            coefficients[np.ix_(groupe_a, groupe_b)] = bloc
+            coefficients[np.ix_(groupe_b, groupe_a)] = bloc.T
+            effectifs[np.ix_(groupe_a, groupe_b)] = lignes.sum()
+            effectifs[np.ix_(groupe_b, groupe_a)] = lignes.sum()
+
+    coefficients = np.clip(coefficients, -1, 1)
+    return coefficients, pValeurSpearman(coefficients, effectifs), effectifs
+
+#Fonction pour compter les paires discordantes : inversions de y par tri fusion (ascendant)
+def compterInversions(y):
+    y = list(y)
+    n = len(y)
+    tampon = [None] * n
+    inversions = 0
+    largeur = 1
+    while largeur < n:
+        for debut in range(0, n - largeur, 2 * largeur):
+            milieu, fin = debut + largeur, min(debut + 2 * largeur, n)
+            i, j, k = debut, milieu, debut
+            while i < milieu and j < fin:
+                if y[j] < y[i]:
+                    #y[j] passe devant tous les éléments restants de la moitié gauche
+                    inversions += milieu - i
+                    tampon[k] = y[j]
+                    j += 1
+                else:
+                    tampon[k] = y[i]
+                    i += 1
+                k += 1
+            tampon[k:fin] = y[i:milieu] if i < milieu else y[j:fin]
+            y[debut:fin] = tampon[debut:fin]
+        largeur *= 2
+    return inversions
+
+#Fonction pour compter les ex aequo d'une suite triée : sommes de t(t-1), t(t-1)(t-2) et t(t-1)(2t+5)
+def compterExAequo(triees):
+    debut = np.ones(len(triees), dtype=bool)
+    debut[1:] = triees[1:] != triees[:-1]
+    t = np.diff(np.append(np.flatnonzero(debut), len(triees))).astype(float)
+    return (t * (t - 1)).sum(), (t * (t - 1) * (t - 2)).sum(), (t * (t - 1) * (2 * t + 5)).sum()
+
+def kendallKnight(x, y):
+    #Tau-b et p-value asymptotique (variance corrigée des ex aequo), comme kendalltau(method="asymptotic")
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n < 2:
+        return np.nan, np.nan
+    ordre = np.lexsort((y, x))
+    x, y = x[ordre], y[ordre]
+
+    #Paires ex aequo en x, et à la fois en x et en y
+    x_ex, x_ex2, x_var = compterExAequo(x)
+    debut = np.ones(n, dtype=bool)
+    debut[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+    t = np.diff(np.append(np.flatnonzero(debut), n)).astype(float)
+    xy_ex = (t * (t - 1)).sum()
+
+    #Les paires discordantes sont les inversions de y une fois les lignes triées selon x
+    discordantes = compterInversions(y)
+    y_ex, y_ex2, y_var = compterExAequo(np.sort(y))
+
+    total = n * (n - 1) / 2
+    s = total - x_ex / 2 - y_ex / 2 + xy_ex / 2 - 2 * discordantes
+    denominateur = np.sqrt((total - x_ex / 2) * (total - y_ex / 2))
+    if denominateur == 0:
+        return np.nan, np.nan
+    tau = min(1.0, max(-1.0, s / denominateur))
+
+    variance = (n * (n - 1) * (2 * n + 5) - x_var - y_var) / 18
+    variance += x_ex * y_ex / (2 * n * (n - 1))
+    if n > 2:
+        variance += x_ex2 * y_ex2 / (9 * n * (n - 1) * (n - 2))
+    p_value = 2 * scipy.stats.norm.sf(abs(s) / np.sqrt(variance)) if variance > 0 else np.nan
+    return tau, p_value
+
+#Les données sont transmises une seule fois à chaque processus (initialiseur)
+_partage = {}
+
+def _partager(valeurs):
+    _partage["valeurs"] = valeurs
+
+def _kendallPaire(paire):
+    i, j = paire
+    x, y = _partage["valeurs"][:, i], _partage["valeurs"][:, j]
+    lignes = ~(np.isnan(x) | np.isnan(y))
+    return kendallKnight(x[lignes], y[lignes]) + (int(lignes.sum()),)
+
+def correlationsKendall(valeurs, nb_processus=1):
+    valeurs = np.asarray(valeurs, dtype=float)
+    m = valeurs.shape[1]
+    paires = [(i, j) for i in range(m) for j in range(i + 1, m)]
+
+    if nb_processus == 1 or len(paires) <= 1:
+        _partager(valeurs)
+        resultats = [_kendallPaire(paire) for paire in paires]
+        _partage.clear()
+    else:
+        nb_processus = nb_processus or os.cpu_count() or 1
+        with mp.Pool(nb_processus, initializer=_partager, initargs=(valeurs,)) as pool:
+            resultats = pool.map(_kendallPaire, paires, chunksize=max(1, len(paires) // (4 * nb_processus)))
+
+    coefficients = np.eye(m)
+    p_values = np.zeros((m, m))
+    effectifs = np.diag((~np.isnan(valeurs)).sum(axis=0))
+    for (i, j), (tau, p_value, n) in zip(paires, resultats):
+        coefficients[i, j] = coefficients[j, i] = tau
+        p_values[i, j] = p_values[j, i] = p_value
+        effectifs[i, j] = effectifs[j, i] = n
+    return coefficients, p_values, effectifs
+
+METHODES_CORRELATION = {
+    "spearman": lambda valeurs, nb_processus: correlationsSpearman(valeurs),
+    "kendall": correlationsKendall,
+}
+
+#Fonction pour obtenir les matrices (coefficients, p-values, effectifs) entre des colonnes d'un DataFrame
+def matricesCorrelation(tableau, colonnes, methode="spearman", nb_processus=1):
+    if methode not in METHODES_CORRELATION:
+        raise ValueError(f"Méthode de corrélation inconnue : {methode} (au choix : {', '.join(METHODES_CORRELATION)})")
+    resultats = METHODES_CORRELATION[methode](tableau[colonnes].to_numpy(dtype=float), nb_processus)
+    return tuple(pd.DataFrame(matrice, index=colonnes, columns=colonnes) for matrice in resultats)
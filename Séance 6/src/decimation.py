@@ -0,0 +1,44 @@
+#coding:utf8
+
+import numpy as np
+
+#Réduction du nombre de points d'une courbe avant son tracé : au-delà de
+#quelques milliers de points, la plupart se superposent sur le même pixel.
+#La zone de tracé est découpée en cellules de `tolerance` pixels de côté ;
+#pour chaque suite de points consécutifs dans une même cellule, seuls le
+#premier et le dernier sont gardés, ainsi que les deux extrémités de la
+#série. Les points écartés restent à moins de tolerance × √2 pixels de la
+#ligne tracée, et le nombre de points gardés dépend de la taille de l'image,
+#pas de n. Sur les axes logarithmiques, les cellules sont régulières en
+#log(rang) : les points gardés sont espacés géométriquement le long des rangs.
+
+TOLERANCE_PIXELS = 0.5
+
+#Fonction pour convertir des coordonnées en pixels (échelle linéaire entre le minimum et le maximum)
+def versPixels(valeurs, taille_px):
+    minimum, maximum = valeurs.min(), valeurs.max()
+    if maximum == minimum:
+        return np.zeros(len(valeurs))
+    return (valeurs - minimum) / (maximum - minimum) * taille_px
+
+#Fonction pour obtenir les positions des points à garder
+def pointsGardes(x, y, largeur_px, hauteur_px, tolerance=TOLERANCE_PIXELS):
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    cellule_x = np.floor(versPixels(x, largeur_px) / tolerance)
+    cellule_y = np.floor(versPixels(y, hauteur_px) / tolerance)
+    change = (np.diff(cellule_x) != 0) | (np.diff(cellule_y) != 0)
+    garder = np.zeros(n, dtype=bool)
+    garder[0] = garder[-1] = True
+    #Premier point de chaque nouvelle cellule et dernier point de la précédente
+    garder[1:] |= change
+    garder[:-1] |= change
+    return np.flatnonzero(garder)
+
+#Fonction pour réduire une série (x, y) avant plt.plot, l'image faisant largeur_px × hauteur_px pixels
+def decimerSerie(x, y, largeur_px, hauteur_px, tolerance=TOLERANCE_PIXELS):
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    gardes = pointsGardes(x, y, largeur_px, hauteur_px, tolerance)
+    return x[gardes], y[gardes]
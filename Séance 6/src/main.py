@@ -1,5 +1,7 @@
 #coding:utf8
 
+import os
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -7,8 +9,28 @@ import scipy
 import scipy.stats
 import math
 
-#Fonction pour ouvrir les fichiers
+from cache_colonnes import charger_en_cache
+from rangs import joindreClassements, classerColonnes
+from correlations import matricesCorrelation
+from rangtaille import ajusterMCO, ajusterLoiPuissance, testerAdequation
+from decimation import decimerSerie
+
+#Nombre de processus pour les corrélations de Kendall (par défaut un par cœur, 1 : sans processus)
+NB_PROCESSUS = int(os.environ.get("NB_PROCESSUS", 0)) or os.cpu_count() or 1
+#Nombre d'échantillons synthétiques du test d'adéquation de la loi rang-taille
+NB_REPLIQUES = int(os.environ.get("NB_REPLIQUES", 100))
+
+#Images de la loi rang-taille : taille en pouces et résolution (les courbes sont réduites à cette résolution)
+TAILLE_FIGURE = (8, 5)
+RESOLUTION = 200
+PIXELS_FIGURE = (TAILLE_FIGURE[0] * RESOLUTION, TAILLE_FIGURE[1] * RESOLUTION)
+
+#Fonction pour ouvrir les fichiers (relus depuis le cache colonnaire tant qu'ils ne changent pas)
 def ouvrirUnFichier(nom):
+    return charger_en_cache(nom, lireUnFichier)
+
+#Fonction pour lire un fichier CSV
+def lireUnFichier(nom):
     with open(nom, "r") as fichier:
         contenu = pd.read_csv(fichier)
     return contenu
@@ -37,207 +59,270 @@ def ordrePopulation(pop, etat):
     return ordrepop
 
 #Fonction pour obtenir l'ordre défini entre deux classements (listes spécifiques aux populations)
+#Les pays présents dans un seul des deux classements sont écartés et renvoyés à part (voir joindreClassements)
 def classementPays(ordre1, ordre2):
-    classement = []
-    if len(ordre1) <= len(ordre2):
-        for element1 in range(0, len(ordre2) - 1):
-            for element2 in range(0, len(ordre1) - 1):
-                if ordre2[element1][1] == ordre1[element2][1]:
-                    classement.append([ordre1[element2][0], ordre2[element1][0], ordre1[element2][1]])
-    else:
-        for element1 in range(0, len(ordre1) - 1):
-            for element2 in range(0, len(ordre2) - 1):
-                if ordre2[element2][1] == ordre1[element1][1]:
-                    classement.append([ordre1[element1][0], ordre2[element2][0], ordre1[element][1]])
-    return classement
-
-#Partie sur les îles
-iles = pd.DataFrame(ouvrirUnFichier("./data/island-index.csv"))
+    pays, rangs, manquantes = joindreClassements(ordre1, ordre2)
+    return [[int(rang1), int(rang2), cle] for cle, rang1, rang2 in zip(pays, rangs[0], rangs[1])], manquantes
+
+if __name__ == "__main__":
+    #Partie sur les îles
+    iles = pd.DataFrame(ouvrirUnFichier("./data/island-index.csv"))
+
+    #Attention ! Il va falloir utiliser des fonctions natives de Python dans les fonctions locales que je vous propose pour faire l'exercice. Vous devez caster l'objet Pandas en list().
+
+
+
+    #Partie sur les populations des États du monde
+    #Source. Depuis 2007, tous les ans jusque 2025, M. Forriez a relevé l'intégralité du nombre d'habitants dans chaque États du monde proposé par un numéro hors-série du monde intitulé États du monde. Vous avez l'évolution de la population et de la densité par année.
+    monde = pd.DataFrame(ouvrirUnFichier("./data/Le-Monde-HS-Etats-du-monde-2007-2025.csv"))
+
+
+    print("\n" + "="*80)
+    print("                 Partie 1 — ANALYSE LOI RANG–TAILLE (ISLAND INDEX)")
+    print("="*80 + "\n")
+
+    #Etape 1.0 - Chargement du fichier island-index.csv
+    print("\n" + "-"*60)
+    print("Étape 1.0 — Importation du fichier island-index.csv")
+    print("-"*60)
 
-#Attention ! Il va falloir utiliser des fonctions natives de Python dans les fonctions locales que je vous propose pour faire l'exercice. Vous devez caster l'objet Pandas en list().
+    iles = pd.DataFrame(ouvrirUnFichier("./data/island-index.csv"))
+    print("\nFichier chargé avec succès :")
+    print(iles.head())
 
+    #Etape 1.1 - Extraction colonne surfaces et ajout continents 
+    print("\n" + "-"*60)
+    print("Étape 1.1 — Extraction des surfaces des îles")
+    print("-"*60)
 
+    surfaces = list(iles["Surface (km²)"])
+    surfaces = [float(x) for x in surfaces]   # typage forcé en float
 
-#Partie sur les populations des États du monde
-#Source. Depuis 2007, tous les ans jusque 2025, M. Forriez a relevé l'intégralité du nombre d'habitants dans chaque États du monde proposé par un numéro hors-série du monde intitulé États du monde. Vous avez l'évolution de la population et de la densité par année.
-monde = pd.DataFrame(ouvrirUnFichier("./data/Le-Monde-HS-Etats-du-monde-2007-2025.csv"))
-
+    print("Nombre de surfaces initiales :", len(surfaces))
 
-print("\n" + "="*80)
-print("                 Partie 1 — ANALYSE LOI RANG–TAILLE (ISLAND INDEX)")
-print("="*80 + "\n")
+    continents = [
+        85545323,   # Asie / Afrique / Europe combinés
+        37856841,   # Amérique
+        7768030,    # Antarctique
+        7605049     # Australie
+    ]
 
-#Etape 1.0 - Chargement du fichier island-index.csv
-print("\n" + "-"*60)
-print("Étape 1.0 — Importation du fichier island-index.csv")
-print("-"*60)
+    surfaces.extend([float(v) for v in continents])
 
-iles = pd.DataFrame(ouvrirUnFichier("./data/island-index.csv"))
-print("\nFichier chargé avec succès :")
-print(iles.head())
+    print("Nouveau nombre de surfaces :", len(surfaces))
 
-#Etape 1.1 - Extraction colonne surfaces et ajout continents 
-print("\n" + "-"*60)
-print("Étape 1.1 — Extraction des surfaces des îles")
-print("-"*60)
+    #Etape 1.2 - Ordre décroissant 
+    print("\n" + "-"*60)
+    print("Étape 1.2 — Tri décroissant des surfaces")
+    print("-"*60)
 
-surfaces = list(iles["Surface (km²)"])
-surfaces = [float(x) for x in surfaces]   # typage forcé en float
+    surfaces_triees = ordreDecroissant(surfaces)
+    print("Extrait des surfaces triées (10 premières valeurs) :")
+    print(surfaces_triees[:10])
 
-print("Nombre de surfaces initiales :", len(surfaces))
-
-continents = [
-    85545323,   # Asie / Afrique / Europe combinés
-    37856841,   # Amérique
-    7768030,    # Antarctique
-    7605049     # Australie
-]
+    #Etape 1.3 - Visualisation loi rang-taille
+    print("\n" + "-"*60)
+    print("Étape 1.3 — Visualisation loi rang–taille")
+    print("-"*60)
 
-surfaces.extend([float(v) for v in continents])
-
-print("Nouveau nombre de surfaces :", len(surfaces))
+    rangs = list(range(1, len(surfaces_triees) + 1))
 
-#Etape 1.2 - Ordre décroissant 
-print("\n" + "-"*60)
-print("Étape 1.2 — Tri décroissant des surfaces")
-print("-"*60)
-
-surfaces_triees = ordreDecroissant(surfaces)
-print("Extrait des surfaces triées (10 premières valeurs) :")
-print(surfaces_triees[:10])
-
-#Etape 1.3 - Visualisation loi rang-taille
-print("\n" + "-"*60)
-print("Étape 1.3 — Visualisation loi rang–taille")
-print("-"*60)
-
-rangs = list(range(1, len(surfaces_triees) + 1))
+    #Seuls les points visibles à la résolution de l'image sont tracés (voir decimation.py)
+    rangs_trace, surfaces_trace = decimerSerie(rangs, surfaces_triees, *PIXELS_FIGURE)
+    print(f"Points tracés : {len(rangs_trace)} sur {len(rangs)}")
 
-plt.figure(figsize=(8,5))
-plt.plot(rangs, surfaces_triees)
-plt.title("Loi rang–taille (échelle classique)")
-plt.xlabel("Rang")
-plt.ylabel("Surface (km²)")
-plt.tight_layout()
-plt.savefig("rang_taille_classique.png", dpi=200)
-plt.close()
-
-print("Image générée : rang_taille_classique.png")
+    plt.figure(figsize=TAILLE_FIGURE)
+    plt.plot(rangs_trace, surfaces_trace)
+    plt.title("Loi rang–taille (échelle classique)")
+    plt.xlabel("Rang")
+    plt.ylabel("Surface (km²)")
+    plt.tight_layout()
+    plt.savefig("rang_taille_classique.png", dpi=RESOLUTION)
+    plt.close()
 
-#Etape 1.4 - Conversion logarithmique données
-print("\n" + "-"*60)
-print("Étape 1.4 — Conversion logarithmique des axes")
-print("-"*60)
+    print("Image générée : rang_taille_classique.png")
 
-log_rangs = conversionLog(rangs)
-log_surfaces = conversionLog(surfaces_triees)
+    #Etape 1.4 - Conversion logarithmique données
+    print("\n" + "-"*60)
+    print("Étape 1.4 — Conversion logarithmique des axes")
+    print("-"*60)
 
-plt.figure(figsize=(8,5))
-plt.plot(log_rangs, log_surfaces)
-plt.title("Loi rang–taille (axe logarithmique)")
-plt.xlabel("log(rang)")
-plt.ylabel("log(surface)")
-plt.tight_layout()
-plt.savefig("rang_taille_log.png", dpi=200)
-plt.close()
+    log_rangs = conversionLog(rangs)
+    log_surfaces = conversionLog(surfaces_triees)
 
-print("Image générée : rang_taille_log.png")
+    log_rangs_trace, log_surfaces_trace = decimerSerie(log_rangs, log_surfaces, *PIXELS_FIGURE)
+    print(f"Points tracés : {len(log_rangs_trace)} sur {len(log_rangs)}")
 
-#Etape 1.5 Test statistique possible ? 
-# Non. Les rangs ne sont pas des variables aléatoires : ce sont des valeurs
-# déterministes obtenues après un tri. Ils ne suivent donc pas une distribution
-# probabiliste permettant d’appliquer un test statistique (normalité, KS, etc.)
-# On ne peut tester que les valeurs (surfaces), jamais les rangs eux-mêmes.
+    plt.figure(figsize=TAILLE_FIGURE)
+    plt.plot(log_rangs_trace, log_surfaces_trace)
+    plt.title("Loi rang–taille (axe logarithmique)")
+    plt.xlabel("log(rang)")
+    plt.ylabel("log(surface)")
+    plt.tight_layout()
+    plt.savefig("rang_taille_log.png", dpi=RESOLUTION)
+    plt.close()
 
-print("\n" + "-"*60)
-print("Fin de la partie 1 — Les images ont été générées et la conclusion est en commentaire.")
-print("-"*60 + "\n")
+    print("Image générée : rang_taille_log.png")
 
+    #Etape 1.5 Test statistique possible ? 
+    # Non. Les rangs ne sont pas des variables aléatoires : ce sont des valeurs
+    # déterministes obtenues après un tri. Ils ne suivent donc pas une distribution
+    # probabiliste permettant d’appliquer un test statistique (normalité, KS, etc.)
+    # On ne peut tester que les valeurs (surfaces), jamais les rangs eux-mêmes.
 
-print("\n" + "="*80)
-print("                 Partie 2 — POPULATIONS DU MONDE (RANGS ET CORRÉLATIONS)")
-print("="*80 + "\n")
+    #Etape 1.6 - Ajustement de la loi rang-taille (voir rangtaille.py)
+    print("\n" + "-"*60)
+    print("Étape 1.6 — Ajustement de la loi rang–taille")
+    print("-"*60)
 
-# Étape 2.0 — Chargement du fichier populations
-print("\n" + "-"*60)
-print("Étape 2.0 — Importation du fichier Le-Monde-HS-Etats-du-monde-2007-2025.csv")
-print("-"*60)
+    surfaces_np = np.asarray(surfaces_triees)
+    mco = ajusterMCO(surfaces_np)
+    print(f"Moindres carrés sur les logarithmes : pente b = {mco['pente']:.4f} (R² = {mco['r2']:.4f}), soit alpha = {mco['alpha']:.4f}")
 
-monde = pd.DataFrame(ouvrirUnFichier("./data/Le-Monde-HS-Etats-du-monde-2007-2025.csv"))
-print("\nFichier chargé avec succès :")
-print(monde.head())
+    loi_puissance = ajusterLoiPuissance(surfaces_np)
+    print(f"Maximum de vraisemblance (loi continue) : alpha = {loi_puissance['alpha']:.4f} ± {loi_puissance['erreur_type']:.4f}"
+          f" pour x ≥ xmin = {loi_puissance['xmin']:.2f} km² ({loi_puissance['n_queue']} îles sur {loi_puissance['n']}, D = {loi_puissance['ks']:.4f})")
 
-#Etape 2.1 - Isolation colonnes pertinentes 
-print("\n" + "-"*60)
-print("Étape 2.1 — Colonnes à analyser : État, Pop 2007, Pop 2025, Densité 2007, Densité 2025")
-print("-"*60)
+    loi_discrete = ajusterLoiPuissance(surfaces_np, discret=True)
+    print(f"Maximum de vraisemblance (loi discrète, surfaces arrondies au km²) : alpha = {loi_discrete['alpha']:.4f}"
+          f" pour x ≥ xmin = {loi_discrete['xmin']:.0f} km² ({loi_discrete['n_queue']} îles)")
 
-colonnes_analyse = ["État", "Pop 2007", "Pop 2025", "Densité 2007", "Densité 2025"]
-donnees = monde[colonnes_analyse]
+    adequation = testerAdequation(surfaces_np, loi_puissance, NB_REPLIQUES, graine=2024)
+    print(f"Test d'adéquation par bootstrap ({NB_REPLIQUES} échantillons) : p-value = {adequation['p_value']:.2f}")
+    print("# p-value > 0.1 : la loi puissance est plausible au-delà de xmin ; sinon, elle est rejetée.")
 
-etats = list(donnees["État"])
-pop2007 = [float(x) for x in donnees["Pop 2007"]]
-pop2025 = [float(x) for x in donnees["Pop 2025"]]
-dens2007 = [float(x) for x in donnees["Densité 2007"]]
-dens2025 = [float(x) for x in donnees["Densité 2025"]]
+    print("\n" + "-"*60)
+    print("Fin de la partie 1 — Les images ont été générées et la conclusion est en commentaire.")
+    print("-"*60 + "\n")
 
-print(f"Nombre d'États : {len(etats)}")
 
-#Etape 2.2 - Classement décroissant populations et densités 
-print("\n" + "-"*60)
-print("Étape 2.2 — Classement décroissant des populations et densités")
-print("-"*60)
+    print("\n" + "="*80)
+    print("                 Partie 2 — POPULATIONS DU MONDE (RANGS ET CORRÉLATIONS)")
+    print("="*80 + "\n")
 
-ordre_pop2007 = ordrePopulation(pop2007, etats)
-ordre_pop2025 = ordrePopulation(pop2025, etats)
-ordre_dens2007 = ordrePopulation(dens2007, etats)
-ordre_dens2025 = ordrePopulation(dens2025, etats)
+    # Étape 2.0 — Chargement du fichier populations
+    print("\n" + "-"*60)
+    print("Étape 2.0 — Importation du fichier Le-Monde-HS-Etats-du-monde-2007-2025.csv")
+    print("-"*60)
 
-print("Extrait classement Pop 2007 (5 premiers) :", ordre_pop2007[:5])
-print("Extrait classement Densité 2007 (5 premiers) :", ordre_dens2007[:5])
+    monde = pd.DataFrame(ouvrirUnFichier("./data/Le-Monde-HS-Etats-du-monde-2007-2025.csv"))
+    print("\nFichier chargé avec succès :")
+    print(monde.head())
 
-#Etape 2.3 - Préparation comparaison classement pays
-print("\n" + "-"*60)
-print("Étape 2.3 — Préparation de la comparaison des classements")
-print("-"*60)
+    #Etape 2.1 - Isolation colonnes pertinentes 
+    print("\n" + "-"*60)
+    print("Étape 2.1 — Colonnes à analyser : État, Pop 2007, Pop 2025, Densité 2007, Densité 2025")
+    print("-"*60)
+
+    colonnes_analyse = ["État", "Pop 2007", "Pop 2025", "Densité 2007", "Densité 2025"]
+    donnees = monde[colonnes_analyse]
+
+    etats = list(donnees["État"])
+    pop2007 = [float(x) for x in donnees["Pop 2007"]]
+    pop2025 = [float(x) for x in donnees["Pop 2025"]]
+    dens2007 = [float(x) for x in donnees["Densité 2007"]]
+    dens2025 = [float(x) for x in donnees["Densité 2025"]]
+
+    print(f"Nombre d'États : {len(etats)}")
+
+    #Etape 2.2 - Classement décroissant populations et densités 
+    print("\n" + "-"*60)
+    print("Étape 2.2 — Classement décroissant des populations et densités")
+    print("-"*60)
+
+    ordre_pop2007 = ordrePopulation(pop2007, etats)
+    ordre_pop2025 = ordrePopulation(pop2025, etats)
+    ordre_dens2007 = ordrePopulation(dens2007, etats)
+    ordre_dens2025 = ordrePopulation(dens2025, etats)
+
+    print("Extrait classement Pop 2007 (5 premiers) :", ordre_pop2007[:5])
+    print("Extrait classement Densité 2007 (5 premiers) :", ordre_dens2007[:5])
+
+    #Etape 2.3 - Préparation comparaison classement pays
+    print("\n" + "-"*60)
+    print("Étape 2.3 — Préparation de la comparaison des classements")
+    print("-"*60)
+
+    comparaison_pop_dens, (absents_pop, absents_dens) = classementPays(ordre_pop2007, ordre_dens2007)
+    comparaison_pop_dens.sort()  # tri par rapport au classement de 2007
+
+    print(f"États classés dans les deux cas : {len(comparaison_pop_dens)}")
+    print("États sans population 2007 :", absents_pop)
+    print("États sans densité 2007 :", absents_dens)
+
+    #Etape 2.4 - Isolation deux colonnes pour corrélation 
+    print("\n" + "-"*60)
+    print("Étape 2.4 — Isolation des rangs Pop 2007 et Densité 2007")
+    print("-"*60)
+
+    rangs_pop = []
+    rangs_dens = []
+
+    for element in comparaison_pop_dens:
+        rangs_pop.append(element[0])
+        rangs_dens.append(element[1])
 
-comparaison_pop_dens = classementPays(ordre_pop2007, ordre_dens2007)
-comparaison_pop_dens.sort()  # tri par rapport au classement de 2007
+    print("Extrait rangs Pop 2007 :", rangs_pop[:10])
+    print("Extrait rangs Densité 2007 :", rangs_dens[:10])
+
+    #Etape 2.5 - Calcul corrélations rang
+    print("\n" + "-"*60)
+    print("Étape 2.5 — Corrélation de rang (Spearman) et concordance (Kendall)")
+    print("-"*60)
 
-#Etape 2.4 - Isolation deux colonnes pour corrélation 
-print("\n" + "-"*60)
-print("Étape 2.4 — Isolation des rangs Pop 2007 et Densité 2007")
-print("-"*60)
+    from scipy.stats import spearmanr, kendalltau
 
-rangs_pop = []
-rangs_dens = []
+    spearman_coef, spearman_p = spearmanr(rangs_pop, rangs_dens)
+    kendall_coef, kendall_p = kendalltau(rangs_pop, rangs_dens)
 
-for element in comparaison_pop_dens:
-    rangs_pop.append(element[0])
-    rangs_dens.append(element[1])
+    print(f"Coefficient de corrélation de rang Spearman : {spearman_coef:.4f} (p-value = {spearman_p:.4f})")
+    print(f"Coefficient de concordance de rang Kendall : {kendall_coef:.4f} (p-value = {kendall_p:.4f})")
 
-print("Extrait rangs Pop 2007 :", rangs_pop[:10])
-print("Extrait rangs Densité 2007 :", rangs_dens[:10])
+    print("\n# Commentaire :")
+    print("# Ces coefficients indiquent le degré de similarité entre le classement par population et le classement par densité.")
+    print("# Valeurs proches de 1 => forte concordance ; proches de 0 => classement indépendant ; valeurs négatives => classement inverse.")
 
-#Etape 2.5 - Calcul corrélations rang
-print("\n" + "-"*60)
-print("Étape 2.5 — Corrélation de rang (Spearman) et concordance (Kendall)")
-print("-"*60)
 
-from scipy.stats import spearmanr, kendalltau
+    #Etape 2.6 - Classement de toutes les années (populations et densités)
+    print("\n" + "-"*60)
+    print("Étape 2.6 — Classement de toutes les colonnes Pop et Densité (ex aequo : rang minimal)")
+    print("-"*60)
 
-spearman_coef, spearman_p = spearmanr(rangs_pop, rangs_dens)
-kendall_coef, kendall_p = kendalltau(rangs_pop, rangs_dens)
+    colonnes_pop = [colonne for colonne in monde.columns if colonne.startswith("Pop ")]
+    colonnes_dens = [colonne for colonne in monde.columns if colonne.startswith("Densité ")]
+    rangs_annees = classerColonnes(monde, colonnes_pop + colonnes_dens, methode="min")
+    print(f"Matrice des rangs : {rangs_annees.shape[0]} États × {rangs_annees.shape[1]} colonnes ({rangs_annees.values.dtype})")
+    print("Nombre maximal d'États non classés (valeur manquante) dans une colonne :", int((rangs_annees == 0).sum().max()))
+    print(rangs_annees[["Pop 2007", "Pop 2025", "Densité 2007", "Densité 2025"]].head(10))
 
-print(f"Coefficient de corrélation de rang Spearman : {spearman_coef:.4f} (p-value = {spearman_p:.4f})")
-print(f"Coefficient de concordance de rang Kendall : {kendall_coef:.4f} (p-value = {kendall_p:.4f})")
 
-print("\n# Commentaire :")
-print("# Ces coefficients indiquent le degré de similarité entre le classement par population et le classement par densité.")
-print("# Valeurs proches de 1 => forte concordance ; proches de 0 => classement indépendant ; valeurs négatives => classement inverse.")
+    #Etape 2.7 - Matrices de corrélation de rang entre toutes les colonnes
+    print("\n" + "-"*60)
+    print("Étape 2.7 — Corrélations de rang entre toutes les années (Spearman et Kendall)")
+    print("-"*60)
+
+    colonnes_rangs = colonnes_pop + colonnes_dens
+    spearman_coefs, spearman_p, effectifs_paires = matricesCorrelation(monde, colonnes_rangs, "spearman")
+    kendall_coefs, kendall_p, _ = matricesCorrelation(monde, colonnes_rangs, "kendall", NB_PROCESSUS)
+    print(f"{len(colonnes_rangs)} séries, {len(colonnes_rangs) * (len(colonnes_rangs) - 1) // 2} paires")
+
+    #Population et densité d'une même année
+    annees = [colonne.split(" ")[1] for colonne in colonnes_pop]
+    meme_annee = pd.DataFrame({
+        "Spearman": [spearman_coefs.loc[f"Pop {a}", f"Densité {a}"] for a in annees],
+        "p-value (Spearman)": [spearman_p.loc[f"Pop {a}", f"Densité {a}"] for a in annees],
+        "Kendall": [kendall_coefs.loc[f"Pop {a}", f"Densité {a}"] for a in annees],
+        "p-value (Kendall)": [kendall_p.loc[f"Pop {a}", f"Densité {a}"] for a in annees],
+        "Effectif": [effectifs_paires.loc[f"Pop {a}", f"Densité {a}"] for a in annees],
+    }, index=annees)
+    print("\nPopulation et densité de la même année :")
+    print(meme_annee.round(4))
+
+    print("\nSpearman entre années (populations, extrait) :")
+    print(spearman_coefs.loc[colonnes_pop[:5], colonnes_pop[:5]].round(4))
 
 
-print("\n" + "="*80)
-print("                                 BONUS — ANALYSE DES RANGS")
-print("="*80 + "\n")
+    print("\n" + "="*80)
+    print("                                 BONUS — ANALYSE DES RANGS")
+    print("="*80 + "\n")
 
@@ -0,0 +1,90 @@
+#coding:utf8
+
+import numpy as np
+import pandas as pd
+
+#Jointure de classements par clé (pays, unité territoriale…) : chaque
+#classement est indexé une seule fois dans un dictionnaire, puis les clés
+#sont alignées par simple consultation. Le coût est linéaire en nombre
+#d'entrées, au lieu de comparer toutes les paires d'entrées.
+
+#Fonction pour indexer un classement : liste de [rang, clé] (voir ordrePopulation) ou dictionnaire {clé: rang}
+def indexerClassement(ordre):
+    if hasattr(ordre, "items"):
+        return dict(ordre.items())
+    index = {}
+    for rang, cle in ordre:
+        if cle in index:
+            raise ValueError(f"Clé présente deux fois dans un classement : {cle}")
+        index[cle] = rang
+    return index
+
+#Fonction pour aligner plusieurs classements sur leurs clés communes
+#Renvoie les clés communes (dans l'ordre du premier classement), un tableau
+#des rangs (une ligne par classement, une colonne par clé) et, pour chaque
+#classement, la liste des clés présentes ailleurs mais absentes de celui-ci.
+def joindreClassements(*ordres):
+    if not ordres:
+        raise ValueError("Au moins un classement est nécessaire")
+    index = [indexerClassement(ordre) for ordre in ordres]
+
+    #Union des clés dans l'ordre de première apparition
+    toutes = {}
+    for classement in index:
+        for cle in classement:
+            toutes.setdefault(cle, None)
+
+    communes = [cle for cle in toutes if all(cle in classement for classement in index)]
+    rangs = np.array([[classement[cle] for cle in communes] for classement in index])
+    if rangs.size == 0:
+        rangs = rangs.reshape(len(index), 0)
+    manquantes = [[cle for cle in toutes if cle not in classement] for classement in index]
+    return communes, rangs, manquantes
+
+#Classement de toutes les colonnes d'un tableau à la fois : un seul tri
+#(argsort stable par colonne), puis les groupes d'ex aequo sont repérés sur
+#les valeurs triées. Rang 1 = plus grande valeur, comme ordrePopulation.
+#Ex aequo : "min" (rang le plus petit du groupe, 1, 2, 2, 4), "dense" (1, 2, 2, 3),
+#"ordinal" (ordre des lignes, 1, 2, 3, 4) ou "average" (moyenne des rangs, 1, 2.5, 2.5, 4).
+#Les valeurs manquantes ne sont pas classées : rang 0 (entiers int32) ou NaN ("average").
+
+METHODES_RANGS = ("min", "dense", "ordinal", "average")
+
+#Fonction pour classer chaque colonne d'un tableau NumPy (lignes : individus, colonnes : variables)
+def matriceRangs(valeurs, methode="min", decroissant=True):
+    if methode not in METHODES_RANGS:
+        raise ValueError(f"Méthode de classement inconnue : {methode} (au choix : {', '.join(METHODES_RANGS)})")
+    valeurs = np.asarray(valeurs, dtype=float)
+    if valeurs.ndim == 1:
+        return matriceRangs(valeurs[:, None], methode, decroissant)[:, 0]
+    manquantes = np.isnan(valeurs)
+    cles = -valeurs if decroissant else valeurs
+    #Les NaN sont placés en fin de tri
+    ordre = np.argsort(cles, axis=0, kind="stable")
+    triees = np.take_along_axis(cles, ordre, axis=0)
+
+    n = len(valeurs)
+    positions = np.broadcast_to(np.arange(1, n + 1, dtype=np.int32)[:, None], valeurs.shape)
+    debut = np.ones(valeurs.shape, dtype=bool)
+    debut[1:] = triees[1:] != triees[:-1]
+    if methode == "ordinal":
+        tries = positions
+    elif methode == "dense":
+        tries = np.cumsum(debut, axis=0, dtype=np.int32)
+    else:
+        tries = np.maximum.accumulate(np.where(debut, positions, 0), axis=0)
+        if methode == "average":
+            fin = np.ones(valeurs.shape, dtype=bool)
+            fin[:-1] = debut[1:]
+            dernier = np.minimum.accumulate(np.where(fin, positions, n + 1)[::-1], axis=0)[::-1]
+            tries = (tries + dernier) / 2
+
+    rangs = np.empty(valeurs.shape, dtype=np.float64 if methode == "average" else np.int32)
+    np.put_along_axis(rangs, ordre, tries, axis=0)
+    rangs[manquantes] = np.nan if methode == "average" else 0
+    return rangs
+
+#Fonction pour classer des colonnes d'un DataFrame, le résultat étant indexé par une colonne clé
+def classerColonnes(tableau, colonnes, methode="min", cle="Code ISO_3", decroissant=True):
+    rangs = matriceRangs(tableau[colonnes].to_numpy(dtype=float), methode, decroissant)
+    return pd.DataFrame(rangs, index=pd.Index(tableau[cle], name=cle), columns=colonnes)
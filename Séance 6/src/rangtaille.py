@@ -0,0 +1,133 @@
+#coding:utf8
+
+import numpy as np
+import scipy.optimize
+import scipy.special
+
+#Ajustement de la loi rang-taille (loi de Zipf / loi puissance), entièrement
+#sur des tableaux NumPy :
+#- moindres carrés ordinaires sur log(taille) = a - b log(rang), comme sur le
+#  graphique rang_taille_log.png (simple, mais biaisé : à titre indicatif) ;
+#- maximum de vraisemblance d'une loi puissance p(x) ∝ x^(-alpha) pour x ≥ xmin,
+#  continue ou discrète, xmin étant choisi pour minimiser la distance de
+#  Kolmogorov-Smirnov entre la queue observée et la loi ajustée ;
+#- test d'adéquation par bootstrap paramétrique (p-value de la distance KS).
+#Méthode de Clauset, Shalizi et Newman, « Power-law distributions in
+#empirical data », SIAM Review, 2009. Une loi rang-taille de pente b
+#correspond à une loi puissance d'exposant alpha = 1 + 1 / b.
+
+NB_CANDIDATS = 100  #valeurs de xmin essayées
+QUEUE_MIN = 10      #nombre minimal d'observations au-delà de xmin
+
+#Fonction pour préparer les valeurs : strictement positives, finies, triées par ordre croissant
+def valeursPositives(valeurs):
+    valeurs = np.asarray(valeurs, dtype=float)
+    return np.sort(valeurs[np.isfinite(valeurs) & (valeurs > 0)])
+
+#Fonction pour arrondir des valeurs (triées) à l'entier, pour une loi discrète de support 1, 2, 3…
+def entiersPositifs(x):
+    x = np.round(x)
+    return x[x >= 1]
+
+#Fonction pour ajuster log(taille) = a - b log(rang) par les moindres carrés
+def ajusterMCO(valeurs):
+    tailles = valeursPositives(valeurs)[::-1]
+    x = np.log(np.arange(1, len(tailles) + 1))
+    y = np.log(tailles)
+    pente, ordonnee = np.polyfit(x, y, 1)
+    residus = y - (ordonnee + pente * x)
+    r2 = 1 - (residus ** 2).sum() / ((y - y.mean()) ** 2).sum()
+    return {"pente": -pente, "ordonnee": ordonnee, "r2": r2, "alpha": 1 - 1 / pente, "n": len(tailles)}
+
+#Fonction pour choisir les xmin candidats : effectifs de queue en progression géométrique,
+#de n à QUEUE_MIN, chaque candidat étant la première position de sa valeur (ex aequo inclus)
+def candidatsXmin(x, nb_candidats=NB_CANDIDATS, queue_min=QUEUE_MIN):
+    n = len(x)
+    if n < queue_min:
+        raise ValueError(f"Au moins {queue_min} valeurs positives sont nécessaires")
+    queues = np.geomspace(n, queue_min, nb_candidats).astype(np.int64)
+    debuts = np.searchsorted(x, x[n - queues], side="left")
+    return np.unique(debuts)
+
+#Fonction pour estimer alpha pour tous les candidats à la fois (sommes cumulées des log depuis la fin)
+def alphasCandidats(x, debuts, discret=False):
+    sommes = np.cumsum(np.log(x)[::-1])[::-1][debuts]
+    effectifs = len(x) - debuts
+    xmin = x[debuts] - 0.5 if discret else x[debuts]
+    #Loi discrète : approximation de Clauset et al. (éq. 3.7), précise dès xmin ≥ 6
+    return 1 + effectifs / (sommes - effectifs * np.log(xmin))
+
+#Fonction pour calculer la distance de Kolmogorov-Smirnov entre une queue (triée) et la loi ajustée
+def distanceKS(queue, xmin, alpha, discret=False):
+    n = len(queue)
+    if discret:
+        valeurs, effectifs = np.unique(queue, return_counts=True)
+        empirique = np.cumsum(effectifs) / n
+        modele = 1 - scipy.special.zeta(alpha, valeurs + 1) / scipy.special.zeta(alpha, xmin)
+        return np.abs(empirique - modele).max()
+    modele = 1 - (queue / xmin) ** (1 - alpha)
+    rangs = np.arange(1, n + 1)
+    return max((rangs / n - modele).max(), (modele - (rangs - 1) / n).max())
+
+#Fonction pour obtenir l'exposant exact du maximum de vraisemblance d'une loi puissance discrète (zêta de Hurwitz)
+def alphaDiscretExact(queue, xmin, depart):
+    somme_log = np.log(queue).sum()
+    n = len(queue)
+    oppose_vraisemblance = lambda a: n * np.log(scipy.special.zeta(a, xmin)) + a * somme_log
+    resultat = scipy.optimize.minimize_scalar(oppose_vraisemblance, bounds=(1 + 1e-6, max(2 * depart, 10)), method="bounded")
+    return resultat.x
+
+#Fonction pour ajuster une loi puissance au-delà de xmin (xmin=None : choisi par la distance KS)
+def ajusterLoiPuissance(valeurs, discret=False, xmin=None, nb_candidats=NB_CANDIDATS, queue_min=QUEUE_MIN, triees=False):
+    x = valeurs if triees else valeursPositives(valeurs)
+    if discret and not triees:
+        x = entiersPositifs(x)
+    if xmin is None:
+        debuts = candidatsXmin(x, nb_candidats, queue_min)
+    else:
+        debuts = np.array([np.searchsorted(x, xmin, side="left")])
+    alphas = alphasCandidats(x, debuts, discret)
+    #Les queues sont de tailles géométriquement décroissantes : le parcours coûte quelques fois n
+    distances = np.array([distanceKS(x[d:], x[d], a, discret) for d, a in zip(debuts, alphas)])
+
+    meilleur = int(np.argmin(distances))
+    debut, alpha, distance = debuts[meilleur], alphas[meilleur], distances[meilleur]
+    queue = x[debut:]
+    if discret:
+        alpha = alphaDiscretExact(queue, x[debut], alpha)
+        distance = distanceKS(queue, x[debut], alpha, discret)
+    return {
+        "xmin": x[debut],
+        "alpha": alpha,
+        "erreur_type": (alpha - 1) / np.sqrt(len(queue)),
+        "n_queue": len(queue),
+        "n": len(x),
+        "ks": distance,
+        "discret": discret,
+    }
+
+#Fonction pour tirer un échantillon synthétique : corps rééchantillonné dans les valeurs
+#sous xmin, queue tirée dans la loi puissance ajustée (inversion de la fonction de répartition)
+def tirerSynthetique(x, ajustement, rng):
+    corps = x[x < ajustement["xmin"]]
+    n_queue = rng.binomial(len(x), ajustement["n_queue"] / len(x)) if len(corps) else len(x)
+    u = rng.random(n_queue)
+    if ajustement["discret"]:
+        #Approximation de Clauset et al. (éq. D.6)
+        queue = np.floor((ajustement["xmin"] - 0.5) * (1 - u) ** (-1 / (ajustement["alpha"] - 1)) + 0.5)
+    else:
+        queue = ajustement["xmin"] * (1 - u) ** (-1 / (ajustement["alpha"] - 1))
+    return np.sort(np.concatenate((rng.choice(corps, len(x) - n_queue), queue)))
+
+#Fonction pour tester l'adéquation par bootstrap : part des échantillons synthétiques
+#dont la distance KS (après un nouvel ajustement complet, xmin compris) dépasse celle des données
+def testerAdequation(valeurs, ajustement, nb_repliques=100, graine=0, nb_candidats=NB_CANDIDATS, queue_min=QUEUE_MIN):
+    x = valeursPositives(valeurs)
+    if ajustement["discret"]:
+        x = entiersPositifs(x)
+    rng = np.random.default_rng(graine)
+    distances = np.empty(nb_repliques)
+    for b in range(nb_repliques):
+        synthetique = tirerSynthetique(x, ajustement, rng)
+        distances[b] = ajusterLoiPuissance(synthetique, ajustement["discret"], None, nb_candidats, queue_min, triees=True)["ks"]
+    return {"p_value": (distances >= ajustement["ks"]).mean(), "distances": distances}
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import scipy.stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from correlations import correlationsKendall, correlationsSpearman
+
+# Masques non emboîtés : la colonne 1 manque sur les lignes 0 à 9,
+# la colonne 2 sur les lignes 30 à 39, les colonnes 0 et 3 sont complètes
+def valeurs_masques_non_emboites():
+    rng = np.random.default_rng(0)
+    valeurs = rng.normal(size=(40, 4))
+    valeurs[:10, 1] = np.nan
+    valeurs[30:, 2] = np.nan
+    return valeurs
+
+def spearman_par_paire(valeurs):
+    m = valeurs.shape[1]
+    coefficients = np.eye(m)
+    effectifs = np.zeros((m, m), dtype=np.int64)
+    for i in range(m):
+        for j in range(m):
+            lignes = ~(np.isnan(valeurs[:, i]) | np.isnan(valeurs[:, j]))
+            effectifs[i, j] = lignes.sum()
+            if i != j:
+                coefficients[i, j] = scipy.stats.spearmanr(valeurs[lignes, i], valeurs[lignes, j])[0]
+    return coefficients, effectifs
+
+def test_spearman_masques_non_emboites():
+    valeurs = valeurs_masques_non_emboites()
+    attendus, effectifs_attendus = spearman_par_paire(valeurs)
+    coefficients, p_values, effectifs = correlationsSpearman(valeurs)
+    np.testing.assert_allclose(coefficients, attendus, atol=1e-12)
+    np.testing.assert_array_equal(effectifs, effectifs_attendus)
+    # La paire (0, 3) porte sur les 40 lignes
+    assert effectifs[0, 3] == 40
+
+def test_kendall_masques_non_emboites():
+    valeurs = valeurs_masques_non_emboites()
+    coefficients, p_values, effectifs = correlationsKendall(valeurs)
+    for i in range(4):
+        for j in range(i + 1, 4):
+            lignes = ~(np.isnan(valeurs[:, i]) | np.isnan(valeurs[:, j]))
+            tau, p_value = scipy.stats.kendalltau(valeurs[lignes, i], valeurs[lignes, j], method="asymptotic")
+            assert np.isclose(coefficients[i, j], tau)
+            assert np.isclose(p_values[i, j], p_value)
+            assert effectifs[i, j] == lignes.sum()
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from decimation import TOLERANCE_PIXELS, decimerSerie, pointsGardes, versPixels
+
+LARGEUR, HAUTEUR = 640, 480
+
+# Courbe rang-taille en échelle logarithmique, avec un bruit multiplicatif
+def courbe_rang_taille(n):
+    rng = np.random.default_rng(0)
+    rangs = np.arange(1, n + 1)
+    tailles = np.sort(1e6 * rangs ** -0.8 * rng.lognormal(0, 0.1, n))[::-1]
+    return np.log(rangs), np.log(tailles)
+
+def test_nombre_de_points_borne():
+    # Le nombre de points gardés dépend de la taille de l'image, pas de n
+    petit = len(pointsGardes(*courbe_rang_taille(10 ** 4), LARGEUR, HAUTEUR))
+    grand = len(pointsGardes(*courbe_rang_taille(10 ** 6), LARGEUR, HAUTEUR))
+    borne = 2 * (LARGEUR + HAUTEUR) / TOLERANCE_PIXELS + 2
+    assert petit <= borne
+    assert grand <= borne
+
+def test_extremites_et_ordre():
+    x, y = courbe_rang_taille(10 ** 4)
+    gardes = pointsGardes(x, y, LARGEUR, HAUTEUR)
+    assert gardes[0] == 0
+    assert gardes[-1] == len(x) - 1
+    assert np.all(np.diff(gardes) > 0)
+
+def test_points_ecartes_dans_la_cellule_du_point_garde_precedent():
+    x, y = courbe_rang_taille(10 ** 5)
+    gardes = pointsGardes(x, y, LARGEUR, HAUTEUR)
+    cellule_x = np.floor(versPixels(x, LARGEUR) / TOLERANCE_PIXELS)
+    cellule_y = np.floor(versPixels(y, HAUTEUR) / TOLERANCE_PIXELS)
+    # Chaque point écarté est dans la même cellule que le dernier point gardé avant lui
+    precedents = gardes[np.searchsorted(gardes, np.arange(len(x)), side="right") - 1]
+    np.testing.assert_array_equal(cellule_x, cellule_x[precedents])
+    np.testing.assert_array_equal(cellule_y, cellule_y[precedents])
+
+def test_series_courtes_inchangees():
+    for n in range(3):
+        x, y = np.arange(n, dtype=float), np.arange(n, dtype=float) ** 2
+        x_garde, y_garde = decimerSerie(x, y, LARGEUR, HAUTEUR)
+        np.testing.assert_array_equal(x_garde, x)
+        np.testing.assert_array_equal(y_garde, y)
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from rangs import METHODES_RANGS, classerColonnes, joindreClassements, matriceRangs
+
+# Colonnes avec ex aequo et valeurs manquantes
+def valeurs_ex_aequo():
+    rng = np.random.default_rng(0)
+    valeurs = rng.integers(0, 8, size=(50, 3)).astype(float)
+    valeurs[rng.random(valeurs.shape) < 0.1] = np.nan
+    return valeurs
+
+@pytest.mark.parametrize("methode", METHODES_RANGS)
+@pytest.mark.parametrize("decroissant", [True, False])
+def test_matrice_rangs_comme_rankdata(methode, decroissant):
+    valeurs = valeurs_ex_aequo()
+    rangs = matriceRangs(valeurs, methode, decroissant)
+    for j in range(valeurs.shape[1]):
+        presentes = ~np.isnan(valeurs[:, j])
+        cles = -valeurs[presentes, j] if decroissant else valeurs[presentes, j]
+        attendus = scipy.stats.rankdata(cles, method=methode)
+        np.testing.assert_array_equal(rangs[presentes, j], attendus)
+        # Valeurs manquantes non classées
+        manquants = rangs[~presentes, j]
+        assert np.isnan(manquants).all() if methode == "average" else (manquants == 0).all()
+
+def test_classer_colonnes_indexe_par_cle():
+    tableau = pd.DataFrame({"Code ISO_3": ["FRA", "DEU", "ITA"], "Pop": [67.0, 83.0, 59.0]})
+    rangs = classerColonnes(tableau, ["Pop"])
+    assert rangs["Pop"].to_dict() == {"FRA": 2, "DEU": 1, "ITA": 3}
+
+def test_joindre_classements_cles_manquantes():
+    communes, rangs, manquantes = joindreClassements([[1, "A"], [2, "B"], [3, "C"]], {"C": 1, "A": 2, "D": 3})
+    assert communes == ["A", "C"]
+    np.testing.assert_array_equal(rangs, [[1, 3], [2, 1]])
+    assert manquantes == [["D"], ["B"]]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import rangtaille
+from rangtaille import ajusterLoiPuissance, ajusterMCO
+
+ALPHA = 2.5
+
+# Queue en loi puissance d'exposant ALPHA au-delà de xmin, et corps uniforme en dessous
+def echantillon_pareto(rng, n=5000, xmin=3.0):
+    queue = xmin * (1 - rng.random(n)) ** (-1 / (ALPHA - 1))
+    return np.concatenate((queue, rng.uniform(0.5, xmin, n // 5)))
+
+def test_mco_loi_rang_taille_exacte():
+    rangs = np.arange(1, 201)
+    ajustement = ajusterMCO(1e6 * rangs ** -0.8)
+    assert ajustement["pente"] == pytest.approx(0.8)
+    assert ajustement["r2"] == pytest.approx(1.0)
+    assert ajustement["alpha"] == pytest.approx(1 + 1 / 0.8)
+
+def test_loi_puissance_continue():
+    ajustement = ajusterLoiPuissance(echantillon_pareto(np.random.default_rng(1)))
+    assert abs(ajustement["alpha"] - ALPHA) < 3 * ajustement["erreur_type"]
+    assert ajustement["xmin"] == pytest.approx(3.0, rel=0.2)
+
+def test_loi_puissance_discrete():
+    rng = np.random.default_rng(1)
+    valeurs = np.floor((5 - 0.5) * (1 - rng.random(5000)) ** (-1 / (ALPHA - 1)) + 0.5)
+    ajustement = ajusterLoiPuissance(valeurs, discret=True)
+    assert ajustement["discret"]
+    assert abs(ajustement["alpha"] - ALPHA) < 3 * ajustement["erreur_type"]
+
+def test_adequation_reproductible():
+    valeurs = echantillon_pareto(np.random.default_rng(2), n=2000)
+    ajustement = ajusterLoiPuissance(valeurs)
+    premier = rangtaille.testerAdequation(valeurs, ajustement, nb_repliques=20, graine=3)
+    second = rangtaille.testerAdequation(valeurs, ajustement, nb_repliques=20, graine=3)
+    np.testing.assert_array_equal(premier["distances"], second["distances"])
+    # Données tirées dans la loi ajustée : la loi puissance n'est pas rejetée
+    assert premier["p_value"] > 0.1
+
+def test_trop_peu_de_valeurs():
+    with pytest.raises(ValueError):
+        ajusterLoiPuissance([1.0, 2.0, 3.0])